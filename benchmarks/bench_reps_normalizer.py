@@ -0,0 +1,55 @@
+"""
+Benchmark ExtractData.reps() over pathological, OCR-like lines: long runs of repeated special characters, many short
+runs and long trailing junk. The time per line should grow linearly with the length of the junk.
+
+Run from the repository root:
+
+    python benchmarks/bench_reps_normalizer.py
+
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from extract_data import ExtractData  # noqa: E402
+
+
+def pathological_lines(junk_length: int) -> dict[str, str]:
+    return {
+        # one long run of the same special character
+        "long_run": "Squat: 70x5" + "+" * junk_length + "5+8",
+        # many distinct runs, each of them used to cost a full re-scan of the string
+        "many_runs": "Squat: 70x5" + "++,,.." * (junk_length // 6) + "5",
+        # junk at the end of the string, used to be sliced off one character at a time
+        "trailing_junk": "Squat: 70x5+5+8" + "+ ," * (junk_length // 3)
+    }
+
+
+def time_reps(line: str, *, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        ExtractData(line).reps()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    results = []
+    for junk_length in [10, 100, 1_000, 10_000, 100_000]:
+        repeat = max(1, 100_000 // junk_length)
+        for case, line in pathological_lines(junk_length).items():
+            seconds = time_reps(line, repeat=repeat)
+            results.append({
+                "case": case,
+                "junk_length": junk_length,
+                "seconds_per_line": seconds,
+                "chars_per_second": len(line) / seconds
+            })
+    json.dump({"benchmark": "reps_normalizer", "results": results}, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark the workout codec against the generic json path on seeded synthetic workout dictionaries: saving with
+dumps_workout() vs json.dumps(..., default=json_default), and loading back into typed workouts (datetime.date, SetArray)
+with loads_workout() vs json.loads() followed by converting the date and the sets by hand. Both outputs are checked to
+be the same before anything is timed.
+
+Run from the repository root:
+
+    python benchmarks/bench_workout_codec.py --workouts 100000
+
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_notebook import EXERCISE_NAMES  # noqa: E402
+from set_array import SetArray  # noqa: E402
+from workout_codec import dumps_workout, json_default, loads_workout  # noqa: E402
+
+SECTIONS = ["main", "warm up", "accessories"]
+
+
+def generate_workouts(no_of_workouts: int, *, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    exercise_names = [*EXERCISE_NAMES.keys()]
+    workouts = []
+    for i in range(no_of_workouts):
+        exercises = {}
+        for section_name in rng.sample(SECTIONS, rng.randint(1, 2)):
+            exercises[section_name] = {
+                exercise_name: SetArray((rng.choice([1, 3, 5, 8, 10]), rng.randrange(40, 3000) / 20)
+                                        for _ in range(rng.randint(0, 6)))
+                for exercise_name in rng.sample(exercise_names, rng.randint(1, 4))
+            }
+        workouts.append({"date": date(2000, 1, 1) + timedelta(days=i // 2), "exercises": exercises})
+    return workouts
+
+
+def generic_loads(s: str) -> dict:
+    # what reading a saved workout back into the typed form takes without the codec
+    workout_dict = json.loads(s)
+    if workout_dict["date"] is not None:
+        workout_dict["date"] = date.fromisoformat(workout_dict["date"])
+    for section in workout_dict["exercises"].values():
+        for exercise_name, sets in section.items():
+            section[exercise_name] = SetArray((reps, weight) for reps, weight in sets)
+    return workout_dict
+
+
+def time_all(function, items: list, *, repeat: int = 3) -> tuple[float, list]:
+    # best of repeat runs; the garbage collector is off while timing (the same as in timeit), otherwise its passes over
+    # the results kept so far take most of the time
+    best = float('inf')
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = [function(item) for item in items]
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workouts', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    workouts = generate_workouts(args.workouts, seed=args.seed)
+    generic_dump_seconds, generic_strings = time_all(lambda w: json.dumps(w, default=json_default), workouts)
+    codec_dump_seconds, codec_strings = time_all(dumps_workout, workouts)
+    assert generic_strings == codec_strings
+    generic_load_seconds, generic_workouts = time_all(generic_loads, generic_strings)
+    codec_load_seconds, codec_workouts = time_all(loads_workout, codec_strings)
+    assert generic_workouts == codec_workouts == workouts
+
+    results = []
+    for stage, generic_seconds, codec_seconds in [("dump", generic_dump_seconds, codec_dump_seconds),
+                                                  ("load", generic_load_seconds, codec_load_seconds)]:
+        results.append({
+            "stage": stage,
+            "generic_seconds": generic_seconds,
+            "codec_seconds": codec_seconds,
+            "speedup": generic_seconds / codec_seconds
+        })
+    json.dump({"benchmark": "workout_codec", "workouts": args.workouts,
+               "bytes": sum(map(len, codec_strings)), "results": results}, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Seeded generator of synthetic workout notebooks in the style of input/initial_21102022.txt: workouts separated by empty
+lines, each starting with a date, exercise lines in all the notations handled by SplitSets (var_reps, var_weight,
+var_both, body-weight and product weights), sections, jogging and junk lines between workouts. The alias file matching
+the generated exercise names is written alongside, so the notebook can be imported without any user input.
+
+Run from the repository root:
+
+    python benchmarks/generate_notebook.py --workouts 10000 --seed 0 --output /tmp/notebook.txt
+
+"""
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Union
+
+# canonical exercise name -> aliases used in the notebook
+EXERCISE_NAMES = {
+    "bench press": ["Bench press", "Bench", "bench press"],
+    "sitting low row": ["Sitting low row", "Sitting row (cables, two separate handles)", "Low row"],
+    "squat": ["Squat", "Barbell squat"],
+    "lat pulldown": ["Lat pulldown", "Lat pull down"],
+    "deadlift": ["Deadlift", "Dead lift"],
+    "overhead press": ["Overhead press", "OHP"],
+    "triceps pushdown (rope)": ["Triceps (cables)", "Triceps pushdown"],
+    "biceps curl (curly bar)": ["Biceps curly bar", "Biceps"],
+    "calves (leg press machine)": ["Calves (leg press machine)"],
+    "kettlebell front raise": ["Kettle bell not-swing swings"]
+}
+
+JUNK_LINES = [
+    "Workout",
+    "Day A: deadlift, overhead press, lat pulldown/chinups",
+    "Day B: squat, barbell row, bench press",
+    "New plan from next week"
+]
+
+NOTES = ["", "", "", " (stick to 70)", " (dump it)", " (felt heavy)"]
+
+
+def _weight(rng: random.Random) -> str:
+    if rng.random() < 0.2:
+        return f"{rng.uniform(10, 120):.1f}"
+    return f"{rng.randrange(4, 48) * 2.5:g}"
+
+
+def _reps(rng: random.Random) -> int:
+    return rng.randint(1, 15)
+
+
+def var_reps(rng: random.Random) -> str:
+    # e.g. "72x5+5+12" or "10+20x5+5+8"
+    reps = '+'.join(str(_reps(rng)) for _ in range(rng.randint(1, 4)))
+    if rng.random() < 0.3:
+        return f"{_weight(rng)}+{_weight(rng)}x{reps}"
+    return f"{_weight(rng)}x{reps}"
+
+
+def var_weight(rng: random.Random) -> str:
+    # e.g. "5x40,60,70,80" or "5x7+10,7+20"
+    if rng.random() < 0.3:
+        bar = _weight(rng)
+        weights = ','.join(f"{bar}+{_weight(rng)}" for _ in range(rng.randint(2, 4)))
+    else:
+        weights = ','.join(_weight(rng) for _ in range(rng.randint(2, 5)))
+    return f"{_reps(rng)}x{weights}"
+
+
+def var_both(rng: random.Random) -> str:
+    # e.g. "8x60kg, 8x70kg, 6x70kg" or "5x40,60,70,80 + 2x90"
+    if rng.random() < 0.5:
+        return ', '.join(f"{_reps(rng)}x{_weight(rng)}kg" for _ in range(rng.randint(2, 4)))
+    weights = ','.join(_weight(rng) for _ in range(rng.randint(2, 4)))
+    return f"{_reps(rng)}x{weights} + {_reps(rng)}x{_weight(rng)}"
+
+
+def body_weight(rng: random.Random) -> str:
+    # e.g. "5+5+8"
+    return '+'.join(str(_reps(rng)) for _ in range(rng.randint(2, 4)))
+
+
+def product_weight(rng: random.Random) -> str:
+    # e.g. "2x20x5+5+8" - two dumbbells of 20kg each
+    reps = '+'.join(str(_reps(rng)) for _ in range(rng.randint(2, 4)))
+    return f"2x{rng.randrange(2, 20) * 2}x{reps}"
+
+
+NOTATIONS = [var_reps, var_weight, var_both, body_weight, product_weight]
+NOTATION_WEIGHTS = [40, 30, 20, 5, 5]
+
+
+def _exercise_line(rng: random.Random) -> str:
+    alias = rng.choice(EXERCISE_NAMES[rng.choice([*EXERCISE_NAMES.keys()])])
+    notation = rng.choices(NOTATIONS, NOTATION_WEIGHTS)[0]
+    separator = ": " if rng.random() < 0.8 else " "
+    return alias + separator + notation(rng) + rng.choice(NOTES)
+
+
+def generate_workout(rng: random.Random) -> list[str]:
+    lines = [f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(0, 25):02d} {rng.choice('AB')}"]
+    lines += [_exercise_line(rng) for _ in range(rng.randint(2, 5))]
+    if rng.random() < 0.3:
+        lines.append(rng.choice(["Extra:", "Extras:", "Alternative:"]))
+        lines += [_exercise_line(rng) for _ in range(rng.randint(1, 3))]
+    if rng.random() < 0.1:
+        lines.insert(rng.randint(1, len(lines)), f"Jog {rng.randint(2, 10)}km")
+    return lines
+
+
+def generate_notebook(path: Union[str, Path], no_of_workouts: int, *, seed: int = 0) -> int:
+    """
+    Write a synthetic notebook with no_of_workouts workouts to path.
+    :return: number of lines written
+    """
+    rng = random.Random(seed)
+    no_of_lines = 0
+    with open(path, 'w') as f:
+        for i in range(no_of_workouts):
+            lines = []
+            if i % 100 == 0:
+                # redundant content, skipped by ReadFile
+                lines += rng.sample(JUNK_LINES, 2) + [""]
+            lines += generate_workout(rng) + [""]
+            f.write('\n'.join(lines) + '\n')
+            no_of_lines += len(lines)
+    return no_of_lines
+
+
+def write_exercise_names(path: Union[str, Path]) -> None:
+    """
+    Write the alias file matching the exercise names used by generate_notebook().
+    """
+    exercise_names_dict = {key: [alias.lower() for alias in aliases] for key, aliases in EXERCISE_NAMES.items()}
+    with open(path, 'w') as f:
+        json.dump(exercise_names_dict, f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-w', '--workouts', type=int, default=10_000)
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default="notebook.txt")
+    parser.add_argument('-e', '--exercise-names', default="exercise_names.json")
+    args = parser.parse_args()
+
+    generate_notebook(args.output, args.workouts, seed=args.seed)
+    write_exercise_names(args.exercise_names)
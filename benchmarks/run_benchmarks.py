@@ -0,0 +1,158 @@
+"""
+Time each stage of the parsing pipeline on a synthetic notebook and report the results as JSON, so regressions can be
+caught by comparing two runs. Every stage runs in its own process, so the reported peak RSS belongs to that stage
+(including the preparation of its input) and not to the stages before it.
+
+Stages:
+    read_file       ReadFile.split_content() over the whole notebook
+    read_file_parallel  ReadFile.split_content(jobs) with a process per CPU
+    extract_data    ExtractData.exercise_name() and ExtractData.reps() of every exercise line
+    split_sets      SplitSets.get_list() of every reps string
+    get_alias       GroupExerciseNames.get_alias() of every exercise name
+    read            end-to-end read() into a temporary output directory
+
+Run from the repository root:
+
+    python benchmarks/run_benchmarks.py --workouts 10000 --output bench_output.json
+
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_notebook import generate_notebook, write_exercise_names  # noqa: E402
+from read_file import ReadFile  # noqa: E402
+from extract_data import ExtractData  # noqa: E402
+from line_classifier import classify_line, LineType  # noqa: E402
+from split_sets import SplitSets  # noqa: E402
+from group_exercise_names import GroupExerciseNames  # noqa: E402
+from read import read  # noqa: E402
+
+
+def _exercise_lines(notebook_path: str) -> list[str]:
+    return [line for workout in ReadFile(notebook_path).iter_workouts() for line in workout[1:]
+            if classify_line(line).line_type is LineType.EXERCISE]
+
+
+def _count_lines(notebook_path: str) -> int:
+    with open(notebook_path, 'r') as f:
+        return sum(1 for _ in f)
+
+
+def bench_read_file(notebook_path: str, exercise_names_path: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    ReadFile(notebook_path).split_content()
+    return time.perf_counter() - start, _count_lines(notebook_path)
+
+
+def bench_read_file_parallel(notebook_path: str, exercise_names_path: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    ReadFile(notebook_path).split_content(jobs=max(os.cpu_count() or 1, 2))
+    return time.perf_counter() - start, _count_lines(notebook_path)
+
+
+def bench_extract_data(notebook_path: str, exercise_names_path: str) -> tuple[float, int]:
+    lines = _exercise_lines(notebook_path)
+    start = time.perf_counter()
+    for line in lines:
+        ExtractData(line).exercise_name()
+        ExtractData(line).reps()
+    return time.perf_counter() - start, len(lines)
+
+
+def bench_split_sets(notebook_path: str, exercise_names_path: str) -> tuple[float, int]:
+    reps_list = [ExtractData(line).reps() for line in _exercise_lines(notebook_path)]
+    start = time.perf_counter()
+    for reps in reps_list:
+        SplitSets(reps).get_list()
+    return time.perf_counter() - start, len(reps_list)
+
+
+def bench_get_alias(notebook_path: str, exercise_names_path: str) -> tuple[float, int]:
+    names = [ExtractData(line).exercise_name() for line in _exercise_lines(notebook_path)]
+    with GroupExerciseNames(filename=exercise_names_path) as workout_name_tracker:
+        start = time.perf_counter()
+        for name in names:
+            workout_name_tracker.get_alias(name)
+        seconds = time.perf_counter() - start
+    return seconds, len(names)
+
+
+def bench_read(notebook_path: str, exercise_names_path: str) -> tuple[float, int]:
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        read(notebook_path, exercise_names_filename=exercise_names_path, output_path=output_dir)
+        seconds = time.perf_counter() - start
+    return seconds, _count_lines(notebook_path)
+
+
+STAGES = {
+    "read_file": bench_read_file,
+    "read_file_parallel": bench_read_file_parallel,
+    "extract_data": bench_extract_data,
+    "split_sets": bench_split_sets,
+    "get_alias": bench_get_alias,
+    "read": bench_read
+}
+
+
+def _run_stage(stage: str, notebook_path: str, exercise_names_path: str) -> dict:
+    seconds, no_of_lines = STAGES[stage](notebook_path, exercise_names_path)
+    return {
+        "seconds": seconds,
+        "lines": no_of_lines,
+        "lines_per_second": no_of_lines / seconds if seconds else None,
+        # kilobytes on Linux
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    }
+
+
+def run_benchmarks(no_of_workouts: int, *, seed: int = 0, stages: list[str] = None) -> dict:
+    stages = stages or [*STAGES.keys()]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        notebook_path = str(Path(tmp_dir) / "notebook.txt")
+        exercise_names_path = str(Path(tmp_dir) / "exercise_names.json")
+        no_of_lines = generate_notebook(notebook_path, no_of_workouts, seed=seed)
+        write_exercise_names(exercise_names_path)
+
+        results = {}
+        for stage in stages:
+            # fresh process for every stage, so caches and peak memory don't carry over
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                results[stage] = executor.submit(_run_stage, stage, notebook_path, exercise_names_path).result()
+
+    return {
+        "workouts": no_of_workouts,
+        "lines": no_of_lines,
+        "seed": seed,
+        "python": platform.python_version(),
+        "stages": results
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-w', '--workouts', type=int, default=10_000)  # 10k - 1M
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    parser.add_argument('--stages', nargs='+', choices=[*STAGES.keys()])
+    parser.add_argument('-o', '--output')  # print to stdout if not given
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.workouts, seed=args.seed, stages=args.stages)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
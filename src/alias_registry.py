@@ -0,0 +1,126 @@
+import threading
+from multiprocessing.managers import BaseManager
+from pathlib import Path
+from typing import Union
+from alias_store import AliasStore, add_alias
+
+
+class AliasRegistry:
+    """
+    The exercise names dictionary shared by processes importing notebooks at the same time. It lives in a single
+    coordinator process (see AliasRegistryManager), the only one writing the alias file, so processes never overwrite
+    each other's aliases. Every alias added is also kept in a list of changes, so the processes catch up on the aliases
+    learned by the others by fetching only the changes they haven't seen yet (see SharedAliasStore).
+
+    Example use:
+
+        with AliasRegistryManager() as manager:
+            registry = manager.AliasRegistry("input/exercise_names.json")
+            ...  # pass the registry to the worker processes
+            registry.close()
+
+    """
+
+    def __init__(self, filename: Union[str, Path]) -> None:
+        self.store = AliasStore(filename)
+        self.exercise_names_dict = self.store.load()
+        # alias -> key, the first key an alias was saved under wins (the same as GroupExerciseNames does)
+        self.alias_index = {}
+        for key, alias_list in self.exercise_names_dict.items():
+            self.alias_index.setdefault(key, key)
+            for alias in alias_list:
+                self.alias_index.setdefault(alias, key)
+        self.changes = []  # (key, alias) pairs in the order they were added
+        # the manager serves each process in its own thread
+        self.lock = threading.Lock()
+
+    def snapshot(self) -> tuple[dict[str, list[str]], int]:
+        """
+        :return: copy of the dictionary and the number of changes it includes
+        """
+        with self.lock:
+            return {key: list(alias_list) for key, alias_list in self.exercise_names_dict.items()}, len(self.changes)
+
+    def changes_since(self, version: int) -> tuple[list[tuple[str, str]], int]:
+        """
+        :param version: number of changes seen so far
+        :return: the changes not seen yet and the new number of changes seen
+        """
+        with self.lock:
+            return self.changes[version:], len(self.changes)
+
+    def record(self, key: str, alias: str) -> str:
+        """
+        Save the alias under the key, unless another process saved it under a different key first.
+        :return: key the alias is saved under
+        """
+        with self.lock:
+            if alias in self.alias_index:
+                return self.alias_index[alias]
+            self.alias_index.setdefault(key, key)
+            self.alias_index[alias] = key
+            self.store.record(key, alias)
+            self.changes.append((key, alias))
+            return key
+
+    def close(self) -> None:
+        with self.lock:
+            self.store.close()
+
+
+class AliasRegistryManager(BaseManager):
+    """
+    Start the process holding the AliasRegistry; proxies to it can be passed to worker processes.
+    """
+
+
+AliasRegistryManager.register("AliasRegistry", AliasRegistry)
+
+
+class SharedAliasStore:
+    """
+    AliasStore-like client of the AliasRegistry, to be given to GroupExerciseNames in a worker process. The dictionary
+    is fetched once; after that only new aliases travel between the processes: the ones this process learns are sent to
+    the registry straight away and the ones learned by others are fetched when a name isn't found (changes()).
+
+    Example use:
+
+        workout_name_tracker = GroupExerciseNames(store=SharedAliasStore(registry), interactive=False)
+
+    """
+
+    def __init__(self, registry) -> None:
+        """
+        :param registry: proxy to the AliasRegistry
+        """
+        self.registry = registry
+        self.exercise_names_dict = {}
+        self.version = 0  # number of the registry's changes already in self.exercise_names_dict
+
+    def __enter__(self) -> "SharedAliasStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def load(self) -> dict[str, list[str]]:
+        self.exercise_names_dict, self.version = self.registry.snapshot()
+        return self.exercise_names_dict
+
+    def record(self, key: str, alias: str) -> str:
+        key = self.registry.record(key, alias)
+        add_alias(self.exercise_names_dict, key, alias)
+        return key
+
+    def changes(self) -> list[tuple[str, str]]:
+        changes, self.version = self.registry.changes_since(self.version)
+        for key, alias in changes:
+            add_alias(self.exercise_names_dict, key, alias)
+        return changes
+
+    def flush(self) -> None:
+        # the registry saves the file
+        pass
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,167 @@
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+# number of changes kept in the log before they are compacted into the json file
+COMPACT_EVERY = 1000
+# seconds after which pending changes are compacted into the json file on the next change
+FLUSH_INTERVAL = 60.0
+
+
+def file_signature(path: Path) -> Optional[tuple[int, int]]:
+    """
+    :return: modification time (ns) and size of the file or None if there is no such file; a different signature means
+    the file was written since
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def add_alias(exercise_names_dict: dict[str, list[str]], key: str, alias: str) -> None:
+    alias_list = exercise_names_dict.setdefault(key, [])
+    if alias not in alias_list:
+        alias_list.append(alias)
+
+
+class AliasStore:
+    """
+    Keep the exercise names dictionary (key -> list of aliases) on the disk. Every change is appended to a small log
+    file next to the json file (e.g. "exercise_names.json.log", one json line per added alias), so adding an alias
+    costs a single short write. The full json file is rewritten only when the store is flushed - on close, when the
+    log grows over compact_every changes or when flush_interval seconds passed since the last flush - and only if
+    anything changed. The file is written to a temporary file first and then renamed, so it is never left half-written.
+    Changes still in the log are replayed on the next load.
+    Another process may save the file while the store is open (e.g. read.py --resolve while the daemon runs). Aliases it
+    added are merged into the dictionary - when the dictionary is flushed, so they are not overwritten, and on
+    changes(), so a long-running process learns them.
+
+    Example use:
+
+        with AliasStore("input/exercise_names.json") as store:
+            exercise_names_dict = store.load()
+            store.record("squat", "back squat")  # exercise_names_dict["squat"] now has "back squat" in it
+
+    """
+
+    def __init__(self, filename: Union[str, Path], *, compact_every: int = COMPACT_EVERY,
+                 flush_interval: Optional[float] = FLUSH_INTERVAL) -> None:
+        self.filename = Path(filename)
+        self.log_filename = self.filename.with_name(self.filename.name + ".log")
+        self.compact_every = compact_every
+        self.flush_interval = flush_interval
+
+        self.exercise_names_dict = {}
+        self.file_signature = None  # of the file as it was last read or written by this store
+        self.merged_changes = []  # (key, alias) pairs merged from the file, not returned by changes() yet
+        self.dirty = False
+        self.no_of_logged_changes = 0
+        self.last_flush = time.monotonic()
+
+    def __enter__(self) -> "AliasStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def load(self) -> dict[str, list[str]]:
+        """
+        Read the json file and apply changes left in the log by a run that didn't flush them.
+        :return: exercise names dictionary; the store keeps a reference to it and saves it on flush
+        """
+        self.file_signature = file_signature(self.filename)
+        if self.filename.is_file():
+            with open(self.filename, 'r') as f:
+                self.exercise_names_dict = json.load(f)
+        else:
+            self.exercise_names_dict = {}
+
+        if self.log_filename.is_file():
+            with open(self.log_filename, 'r') as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except json.JSONDecodeError:
+                        # the last line may be cut off if the run was killed while writing it
+                        continue
+                    add_alias(self.exercise_names_dict, change["key"], change["alias"])
+                    self.no_of_logged_changes += 1
+            self.dirty = self.no_of_logged_changes > 0
+
+        return self.exercise_names_dict
+
+    def record(self, key: str, alias: str) -> str:
+        """
+        Add the alias to the dictionary (if it's not there already) and append the change to the log, compacting the
+        log if it's due.
+        :return: key the alias is saved under
+        """
+        add_alias(self.exercise_names_dict, key, alias)
+        with open(self.log_filename, 'a') as f:
+            f.write(json.dumps({"key": key, "alias": alias}) + '\n')
+        self.dirty = True
+        self.no_of_logged_changes += 1
+
+        if self.no_of_logged_changes >= self.compact_every or (
+                self.flush_interval is not None and time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush()
+        return key
+
+    def _merge_file(self) -> None:
+        # add keys and aliases saved to the file by another process since it was last read or written here
+        current_signature = file_signature(self.filename)
+        if current_signature == self.file_signature:
+            return
+        self.file_signature = current_signature
+        if current_signature is None:
+            return
+        with open(self.filename, 'r') as f:
+            saved_exercise_names_dict = json.load(f)
+        for key, alias_list in saved_exercise_names_dict.items():
+            if key not in self.exercise_names_dict:
+                self.exercise_names_dict[key] = []
+                self.merged_changes.append((key, key))
+            for alias in alias_list:
+                if alias not in self.exercise_names_dict[key]:
+                    self.exercise_names_dict[key].append(alias)
+                    self.merged_changes.append((key, alias))
+
+    def changes(self) -> list[tuple[str, str]]:
+        """
+        :return: (key, alias) pairs saved to the file by other processes since the last call, already added to the
+        dictionary
+        """
+        self._merge_file()
+        changes, self.merged_changes = self.merged_changes, []
+        return changes
+
+    def flush(self) -> None:
+        """
+        Rewrite the json file with the current dictionary (if anything changed) and clear the log.
+        """
+        if self.dirty:
+            # don't overwrite aliases another process saved in the meantime
+            self._merge_file()
+            self.filename.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', dir=self.filename.parent, prefix=self.filename.name,
+                                             suffix=".tmp", delete=False) as f:
+                json.dump(self.exercise_names_dict, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(f.name, self.filename)
+            self.file_signature = file_signature(self.filename)
+
+            # the log is removed only after the file holds all its changes, replaying it again wouldn't hurt anyway
+            if self.log_filename.is_file():
+                os.remove(self.log_filename)
+            self.dirty = False
+            self.no_of_logged_changes = 0
+        self.last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
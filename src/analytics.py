@@ -0,0 +1,195 @@
+from datetime import date, timedelta
+from pathlib import Path
+from typing import NamedTuple, Optional, Union
+import json
+import os
+import pprint as pp
+from workout_writer import OUTPUT_DIR
+
+CACHE_PATH = OUTPUT_DIR.parent / "analytics_cache.json"
+
+
+class PersonalRecord(NamedTuple):
+    date: date
+    exercise: str
+    estimated_1rm: float
+    filename: str
+
+
+def epley_1rm(reps: int, weight: float) -> float:
+    """
+    Estimate one-rep max with the Epley formula: weight * (1 + reps / 30). A single rep is the one-rep max itself and
+    sets with unknown number of reps (saved as 0) give no estimate.
+    """
+    if reps <= 0:
+        return 0.0
+    if reps == 1:
+        return weight
+    return weight * (1 + reps / 30)
+
+
+def summarize_workout(workout_dict: dict, filename: str) -> dict:
+    """
+    Reduce a workout saved by WorkoutDictBuilder to the numbers all analytics are computed from. Sections are merged,
+    as an exercise is never saved in two sections of the same workout.
+    :param workout_dict: workout as loaded from the json file (date as a string, sets as [reps, weight] lists)
+    :param filename: name of the file, used for the date if the workout has none (YYYYMMDDNN.json)
+    :return: {"date": "YYYY-MM-DD", "exercises": {exercise name: [volume, best estimated 1RM, number of sets]}}
+    """
+    workout_date = workout_dict.get("date")
+    if not workout_date:
+        workout_date = date(int(filename[:4]), int(filename[4:6]), int(filename[6:8])).isoformat()
+    exercises = {}
+    for section in workout_dict["exercises"].values():
+        for exercise_name, sets_list in section.items():
+            exercises[exercise_name] = [
+                sum(reps * weight for reps, weight in sets_list),
+                max((epley_1rm(reps, weight) for reps, weight in sets_list), default=0.0),
+                len(sets_list)
+            ]
+    return {"date": workout_date, "exercises": exercises}
+
+
+class WorkoutAnalytics:
+    """
+    Per-exercise volume, estimated one-rep max, weekly tonnage and personal records over the workouts saved in
+    output/workouts. Each file is read once and reduced to a small summary (see summarize_workout()); summaries are kept
+    in a cache file together with the modification time and size of the workout file, so only new or changed files are
+    read again on refresh() and all queries run over the summaries alone.
+
+    Example use:
+
+        analytics = WorkoutAnalytics()
+        analytics.exercise_volume()  # {"squat": 123450.0, ...}
+        analytics.personal_records("squat")
+
+    """
+
+    def __init__(self, output_dir: Union[str, Path] = OUTPUT_DIR, cache_path: Union[str, Path] = CACHE_PATH) -> None:
+        """
+        :param output_dir: directory with the workout json files
+        :param cache_path: json file the summaries are cached in
+        """
+        self.output_dir = Path(output_dir)
+        self.cache_path = Path(cache_path)
+
+        # filename -> {"mtime_ns", "size", "date", "exercises"}, or {"mtime_ns", "size", "invalid"} for files that
+        # could not be read
+        if self.cache_path.is_file():
+            with open(self.cache_path, 'r') as f:
+                self.summaries = json.load(f)
+        else:
+            self.summaries = {}
+        self.refresh()
+
+    def refresh(self) -> int:
+        """
+        Summarize workout files that were added or changed since the last refresh and forget the deleted ones. The cache
+        file is saved if anything changed.
+        :return: number of files read
+        """
+        no_of_files_read = 0
+        existing_filenames = set()
+        if self.output_dir.is_dir():
+            for entry in os.scandir(self.output_dir):
+                if not entry.name.endswith('.json') or not entry.name[:-5].isdigit():
+                    continue
+                existing_filenames.add(entry.name)
+                stat = entry.stat()
+                summary = self.summaries.get(entry.name)
+                if summary and summary["mtime_ns"] == stat.st_mtime_ns and summary["size"] == stat.st_size:
+                    continue
+                try:
+                    with open(entry.path, 'r') as f:
+                        summary = summarize_workout(json.load(f), entry.name)
+                except (OSError, ValueError, KeyError, TypeError):
+                    # empty, truncated or not a workout at all; kept as invalid until the file changes, so it isn't
+                    # read again on every refresh
+                    summary = {"invalid": True}
+                self.summaries[entry.name] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, **summary}
+                no_of_files_read += 1
+
+        deleted_filenames = self.summaries.keys() - existing_filenames
+        for filename in deleted_filenames:
+            del self.summaries[filename]
+
+        if no_of_files_read or deleted_filenames:
+            self.save()
+        return no_of_files_read
+
+    def invalid_filenames(self) -> list[str]:
+        """
+        :return: workout files that could not be read as workouts, left out of all analytics
+        """
+        return sorted(filename for filename, summary in self.summaries.items() if summary.get("invalid"))
+
+    def save(self) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, 'w') as f:
+            json.dump(self.summaries, f)
+
+    def _in_order(self, start: Optional[date] = None, end: Optional[date] = None) -> list[tuple[str, dict]]:
+        # summaries in chronological order (filenames break ties between workouts on the same day), within the dates
+        start = start.isoformat() if start else ''
+        end = end.isoformat() if end else '9999-12-31'
+        return sorted(
+            ((filename, summary) for filename, summary in self.summaries.items()
+             if not summary.get("invalid") and start <= summary["date"] <= end),
+            key=lambda item: (item[1]["date"], item[0])
+        )
+
+    def exercise_volume(self, start: Optional[date] = None, end: Optional[date] = None) -> dict[str, float]:
+        """
+        :return: exercise name -> total volume (sum of reps * weight) of workouts between start and end (inclusive)
+        """
+        volume = {}
+        for _, summary in self._in_order(start, end):
+            for exercise_name, (exercise_volume, _, _) in summary["exercises"].items():
+                volume[exercise_name] = volume.get(exercise_name, 0.0) + exercise_volume
+        return volume
+
+    def estimated_1rm(self, exercise_name: str) -> list[tuple[date, float]]:
+        """
+        :return: best estimated one-rep max of the exercise in each workout it was done in, in chronological order
+        """
+        return [
+            (date.fromisoformat(summary["date"]), summary["exercises"][exercise_name][1])
+            for _, summary in self._in_order() if exercise_name in summary["exercises"]
+        ]
+
+    def weekly_tonnage(self) -> dict[date, float]:
+        """
+        :return: Monday of the week -> total volume of all exercises in that week, in chronological order
+        """
+        tonnage = {}
+        for _, summary in self._in_order():
+            workout_date = date.fromisoformat(summary["date"])
+            monday = workout_date - timedelta(days=workout_date.weekday())
+            tonnage[monday] = tonnage.get(monday, 0.0) + sum(volume for volume, _, _ in summary["exercises"].values())
+        return tonnage
+
+    def personal_records(self, exercise_name: Optional[str] = None) -> list[PersonalRecord]:
+        """
+        Find workouts in which the estimated one-rep max of an exercise beat all previous ones. The first workout of
+        each exercise sets its first record.
+        :param exercise_name: only records of this exercise if given
+        :return: records in chronological order
+        """
+        best = {}
+        records = []
+        for filename, summary in self._in_order():
+            for name, (_, estimated_1rm, _) in summary["exercises"].items():
+                if exercise_name and name != exercise_name or estimated_1rm <= 0.0:
+                    continue
+                if estimated_1rm > best.get(name, 0.0):
+                    best[name] = estimated_1rm
+                    records.append(PersonalRecord(date.fromisoformat(summary["date"]), name, estimated_1rm, filename))
+        return records
+
+
+if __name__ == "__main__":
+    workout_analytics = WorkoutAnalytics()
+    pp.pprint(workout_analytics.exercise_volume())
+    pp.pprint(workout_analytics.personal_records())
+    if workout_analytics.invalid_filenames():
+        print(f"Skipped invalid workout files: {', '.join(workout_analytics.invalid_filenames())}")
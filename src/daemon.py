@@ -0,0 +1,279 @@
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterable, Optional, Union
+import argparse
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from group_exercise_names import GroupExerciseNames
+from read import SINKS, build_workout, parse_workout_lines
+from read_file import WorkoutSplitter
+from review_queue import ReviewQueue, review_queue_path
+from workout_writer import json_default
+
+# localhost port the daemon listens on if no Unix socket is given
+PORT = 8765
+
+
+class ParserDaemon:
+    """
+    Parse notebooks in a long-running process, keeping everything that a read.py run sets up from scratch: the alias
+    index of GroupExerciseNames, the memoized parse_date() and split_sets(), the review queue decisions and the writer
+    with its index of the output directory. The daemon never asks anything, the same as a batch import: unknown exercise
+    names are kept as they are and they, as well as lines that may be section names, are returned with each workout and
+    queued for review (see read.py --resolve). The queue can be resolved while the daemon runs: the queue file is read
+    again at the start of a request if it was saved since, and names the daemon doesn't know are looked up in the alias
+    file again if it was saved since (see AliasStore.changes()); neither file is overwritten with the daemon's older
+    version of it. A request is saved only if all of its workouts could be built. Apart from read.py --resolve
+    rewriting the workouts it resolves, the daemon should be the only process writing to the output while it runs, as
+    the writer's index of existing workouts is read only when the daemon starts.
+
+    Example use:
+
+        with ParserDaemon() as parser_daemon:
+            parser_daemon.handle({"text": "12/09/22 B\\nSquat: 5x40,60"})
+            parser_daemon.handle({"path": "input/initial_21102022.txt", "save": True})
+
+    """
+
+    def __init__(self, *, sink: str = 'json', exercise_names_filename: Union[str, Path] = "input/exercise_names.json",
+                 output_path: Optional[Union[str, Path]] = None,
+                 review_queue_filename: Optional[Union[str, Path]] = None) -> None:
+        """
+        :param sink: output format of saved workouts, one of read.SINKS
+        :param output_path: where the sink saves workouts (the sink's default location if not given)
+        :param review_queue_filename: the sink's default review queue if not given
+        """
+        self.workout_name_tracker = GroupExerciseNames(filename=exercise_names_filename, interactive=False)
+        self.review_queue = ReviewQueue(review_queue_filename or review_queue_path(sink))
+        self.writer = SINKS[sink](output_path) if output_path else SINKS[sink]()
+        self.no_of_requests = 0
+        self.no_of_workouts = 0
+        self.start_time = time.monotonic()
+
+    def __enter__(self) -> "ParserDaemon":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def parse(self, lines: Iterable[str], *, save: bool = False) -> list[dict]:
+        """
+        :param lines: lines of a notebook
+        :param save: if True, save the workouts with the writer (queued items are linked to their files)
+        :return: {"workout": workout dictionary, "review": {"aliases": [...], "sections": [...]}} for each workout,
+        plus "filename" if it was saved
+        """
+        # every workout is built before any of them is saved, so a request that fails part way leaves nothing behind
+        # and can simply be sent again
+        built_workouts = []
+        try:
+            for workout in WorkoutSplitter().split(lines):
+                workout_dict = build_workout(workout, parse_workout_lines(workout), self.workout_name_tracker,
+                                             review_queue=self.review_queue)
+                # items found in this workout, linked to its file once it's saved
+                built_workouts.append((workout, workout_dict, self.review_queue.pending_aliases,
+                                       self.review_queue.pending_sections))
+                self.review_queue.pending_aliases = []
+                self.review_queue.pending_sections = []
+        finally:
+            # items of a workout that failed are dropped with it
+            self.review_queue.pending_aliases = []
+            self.review_queue.pending_sections = []
+
+        results = []
+        for workout, workout_dict, aliases, sections in built_workouts:
+            result = {
+                "workout": workout_dict.workout_dict,
+                "review": {"aliases": list(dict.fromkeys(aliases)), "sections": list(dict.fromkeys(sections))}
+            }
+            if save:
+                result["filename"] = workout_dict.save_dict(writer=self.writer)
+                self.review_queue.pending_aliases = aliases
+                self.review_queue.pending_sections = sections
+                self.review_queue.add_workout(result["filename"], workout)
+            results.append(result)
+
+        if save and results:
+            # make the workouts visible to whoever sent them as soon as the response arrives
+            self.writer.flush()
+            self.review_queue.save()
+        self.no_of_workouts += len(results)
+        return results
+
+    def handle(self, request: dict) -> dict:
+        """
+        :param request: {"text": notebook content} or {"path": path to a notebook file}, optionally with "save": true
+        :return: {"workouts": list of parse() results}
+        """
+        self.no_of_requests += 1
+        # read.py --resolve may have taken items off the queue or made decisions about section names in the meantime
+        self.review_queue.reload_if_changed()
+        save = bool(request.get("save", False))
+        if "text" in request:
+            return {"workouts": self.parse(request["text"].splitlines(), save=save)}
+        if "path" in request:
+            with open(request["path"], 'r') as f:
+                return {"workouts": self.parse(f, save=save)}
+        raise ValueError('Request has neither "text" nor "path".')
+
+    def status(self) -> dict:
+        return {
+            "requests": self.no_of_requests,
+            "workouts": self.no_of_workouts,
+            "uptime_seconds": time.monotonic() - self.start_time
+        }
+
+    def close(self) -> None:
+        self.writer.close()
+        self.review_queue.save()
+        self.workout_name_tracker.close()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    # connections are kept open between requests, so a client doesn't pay for a new connection every time
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, status: int, response: dict) -> None:
+        body = json.dumps(response, default=json_default).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path != "/status":
+            self._respond(404, {"error": f"Unknown path {self.path}."})
+            return
+        with self.server.lock:
+            self._respond(200, self.server.parser_daemon.status())
+
+    def do_POST(self) -> None:
+        if self.path != "/parse":
+            self._respond(404, {"error": f"Unknown path {self.path}."})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            # connections are served in threads, requests one at a time
+            with self.server.lock:
+                response = self.server.parser_daemon.handle(request)
+        except (ValueError, TypeError, OSError) as e:
+            self._respond(400, {"error": str(e)})
+            return
+        except Exception as e:
+            # e.g. a date the parser doesn't accept; the daemon keeps running
+            self._respond(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self._respond(200, response)
+
+    def log_message(self, format: str, *args) -> None:
+        # the daemon is called hundreds of times a day, requests are not logged
+        pass
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(parser_daemon: ParserDaemon, *, port: int = PORT,
+                socket_path: Optional[Union[str, Path]] = None) -> socketserver.BaseServer:
+    """
+    :param port: localhost port to listen on (0 for any free port), unless socket_path is given
+    :param socket_path: Unix socket to listen on instead of a port
+    :return: server to call serve_forever() on
+    """
+    if socket_path:
+        if os.path.exists(socket_path):
+            # left by a daemon that wasn't shut down
+            os.remove(socket_path)
+        server = _UnixHTTPServer(str(socket_path), _RequestHandler)
+    else:
+        # only local processes can connect
+        server = ThreadingHTTPServer(("127.0.0.1", port), _RequestHandler)
+        server.daemon_threads = True
+    server.parser_daemon = parser_daemon
+    server.lock = threading.Lock()
+    return server
+
+
+class _UnixHTTPConnection(HTTPConnection):
+    def __init__(self, socket_path: str) -> None:
+        super().__init__("localhost")
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+class DaemonClient:
+    """
+    Send notebooks to a running daemon over a single connection kept open between requests.
+
+    Example use:
+
+        with DaemonClient(socket_path="/tmp/workouts.sock") as client:
+            workouts = client.parse(text="12/09/22 B\\nSquat: 5x40,60")["workouts"]
+
+    """
+
+    def __init__(self, *, port: int = PORT, socket_path: Optional[Union[str, Path]] = None) -> None:
+        self.connection = _UnixHTTPConnection(str(socket_path)) if socket_path else HTTPConnection("127.0.0.1", port)
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _request(self, method: str, path: str, request: Optional[dict] = None) -> dict:
+        body = json.dumps(request).encode() if request is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        result = json.loads(response.read())
+        if response.status != 200:
+            raise ValueError(result["error"])
+        return result
+
+    def parse(self, *, text: Optional[str] = None, path: Optional[Union[str, Path]] = None, save: bool = False) -> dict:
+        """
+        :param text: notebook content
+        :param path: path to a notebook file readable by the daemon, if no text is given
+        :param save: save the workouts to the daemon's output
+        :return: {"workouts": [...]}, see ParserDaemon.parse()
+        """
+        request = {"text": text} if text is not None else {"path": str(Path(path).resolve())}
+        request["save"] = save
+        return self._request("POST", "/parse", request)
+
+    def status(self) -> dict:
+        return self._request("GET", "/status")
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-s', '--sink', choices=[*SINKS.keys()], default='json')
+    parser.add_argument('--port', type=int, default=PORT)  # localhost port
+    parser.add_argument('--socket', metavar='PATH')  # listen on a Unix socket instead of a port
+    args = parser.parse_args()
+
+    with ParserDaemon(sink=args.sink) as parser_daemon:
+        server = make_server(parser_daemon, port=args.port, socket_path=args.socket)
+        print(f"Listening on {args.socket or f'127.0.0.1:{args.port}'}.")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if args.socket and os.path.exists(args.socket):
+                os.remove(args.socket)
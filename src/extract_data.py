@@ -1,5 +1,14 @@
 import re
 
+# patterns are compiled once per process, not on every call
+EXERCISE_NAME_PATTERN = re.compile(r"\D+\s|(:\s)")
+REPS_PATTERN = re.compile(r"\D(\s|(:\s))[(]?\d([\d\s*+,.)(xX]|kg)+")
+MULTIPLE_SPACES_PATTERN = re.compile(r" +")
+BRACKETS_PATTERN = re.compile(r"[)(]")
+SPECIALS = r"[+,.x]"
+REPEATED_SPECIALS_PATTERN = re.compile(r"(" + SPECIALS + r")\1+")
+TRAILING_SPECIALS = "+,.x"
+
 
 class ExtractData:
     """
@@ -10,17 +19,17 @@ class ExtractData:
     def __init__(self, line) -> None:
         self.line = line
 
-    def _replace_multiple_with_single_specials(self, txt: str, *, specials: str = r"[+,.x]") -> str:
+    def _replace_multiple_with_single_specials(self, txt: str, *, specials: str = SPECIALS) -> str:
         """
-        Replace multiple special characters with single ones.
+        Replace multiple special characters with single ones, e.g. "5++5,,8" -> "5+5,8". Done in a single pass over the
+        string (a run of the same special character is matched once and replaced with its first character), so the
+        time is linear in the length of the string no matter how many runs there are.
         """
-        group = re.search(specials + r"{2,}", txt)
-        if group:
-            char = group.group()[0]
-            txt = re.sub(r'[' + char + r']{2,}', char, txt)
-            return self._replace_multiple_with_single_specials(txt)
+        if specials == SPECIALS:
+            pattern = REPEATED_SPECIALS_PATTERN
         else:
-            return txt
+            pattern = re.compile(r"(" + specials + r")\1+")
+        return pattern.sub(r"\1", txt)
 
     def exercise_name(self) -> str:
         """
@@ -28,19 +37,17 @@ class ExtractData:
         space will be extracted from the given string. The output is lower-case and stripped from any multiple
         consecutive spaces.
         """
-        pattern = re.compile(r"\D+\s|(:\s)")
-        exercise_name = pattern.search(self.line).group()
+        exercise_name = EXERCISE_NAME_PATTERN.search(self.line).group()
 
         # remove ':' and leading/following spaces
         exercise_name = exercise_name.replace(':', '').strip()
         # remove any double spaces
-        exercise_name = re.sub(' +', ' ', exercise_name).lower()
+        exercise_name = MULTIPLE_SPACES_PATTERN.sub(' ', exercise_name).lower()
 
         return exercise_name
 
     def reps(self) -> str:
-        pattern = re.compile(r"\D(\s|(:\s))[(]?\d([\d\s*+,.)(xX]|kg)+")
-        reps = pattern.search(self.line).group().lower()  # lower converts any 'X' to 'x'
+        reps = REPS_PATTERN.search(self.line).group().lower()  # lower converts any 'X' to 'x'
         reps = reps.replace('*', '')  # remove '*'
 
         # first 2 or 3 characters are redundant. It either non-digit + white-space or non-digit + ':' + white-space.
@@ -49,24 +56,22 @@ class ExtractData:
         reps = reps[2:].strip()
 
         # removing brackets
-        reps = re.sub(r"[)(]", "", reps)
+        reps = BRACKETS_PATTERN.sub("", reps)
 
         # May happen that the string ends with one or more meaningless characters (\s, '+', ',' or 'x' - let's call them
-        # specials). Going over all characters starting from the end of the string and finding any specials followed by
-        # removing it should solve the issue. The loop should break whenever any digit is detected to avoid messing up
-        # the string
-        for i in range(len(reps) - 1, -1, -1):
-            if re.match(r"[\s+,.x]", reps[i]):
-                reps = reps[:-1]
-            else:
-                break
+        # specials). Going over all characters starting from the end of the string and finding the first one that is not
+        # a special tells where the meaningful part ends; the string is then sliced only once.
+        end = len(reps)
+        while end > 0 and (reps[end - 1] in TRAILING_SPECIALS or reps[end - 1].isspace()):
+            end -= 1
+        reps = reps[:end]
 
         # May happen that there is a meaningless combo of characters ("specials") within the string. That cannot be
         # solved programmatically without loosing information therefore user input is required.
         reps = self._replace_multiple_with_single_specials(reps)
 
         # remove all spaces
-        reps = re.sub(' ', '', reps)
+        reps = reps.replace(' ', '')
 
         return reps
 
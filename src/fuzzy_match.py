@@ -0,0 +1,58 @@
+def trigrams(name: str) -> set[str]:
+    """
+    Split the name into overlapping groups of three characters. The name is padded, so the beginning and the end of the
+    name count as well, e.g. "row" -> {"  r", " ro", "row", "ow "}.
+    """
+    padded_name = f"  {name} "
+    return {padded_name[i:i + 3] for i in range(len(padded_name) - 2)}
+
+
+class TrigramIndex:
+    """
+    Find names similar to the given one using an inverted index trigram -> names. Only names sharing at least one
+    trigram with the given name are ever compared with it, so a lookup doesn't go through all the names. Similarity is
+    the Dice coefficient of the trigram sets: 2 * |A & B| / (|A| + |B|), 1.0 for identical names.
+
+    Example use:
+
+        index = TrigramIndex()
+        index.add("sitting row", "sitting low row")
+        index.add("bench", "bench press")
+        index.top_k("sitting row (cables)")  # [("sitting low row", 0.727...)]
+
+    """
+
+    def __init__(self) -> None:
+        self.postings = {}  # trigram -> set of names
+        self.name_trigrams = {}  # name -> number of its trigrams
+        self.keys = {}  # name -> key it belongs to
+
+    def add(self, name: str, key: str) -> None:
+        if name in self.keys:
+            return
+        self.keys[name] = key
+        name_trigrams = trigrams(name)
+        self.name_trigrams[name] = len(name_trigrams)
+        for trigram in name_trigrams:
+            self.postings.setdefault(trigram, set()).add(name)
+
+    def top_k(self, name: str, k: int = 10) -> list[tuple[str, float]]:
+        """
+        :return: up to k (key, similarity) pairs sorted from the most similar; each key is scored by its best name
+        """
+        name_trigrams = trigrams(name)
+
+        # count trigrams shared with each name found in the postings
+        no_of_shared_trigrams = {}
+        for trigram in name_trigrams:
+            for candidate in self.postings.get(trigram, ()):
+                no_of_shared_trigrams[candidate] = no_of_shared_trigrams.get(candidate, 0) + 1
+
+        key_scores = {}
+        for candidate, shared in no_of_shared_trigrams.items():
+            score = 2 * shared / (len(name_trigrams) + self.name_trigrams[candidate])
+            key = self.keys[candidate]
+            if score > key_scores.get(key, 0.0):
+                key_scores[key] = score
+
+        return sorted(key_scores.items(), key=lambda key_score: key_score[1], reverse=True)[:k]
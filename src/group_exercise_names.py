@@ -1,36 +1,100 @@
-import json
 import re
 from pathlib import Path
-from typing import Union
-import os
+from typing import Optional, Union
+from fuzzy_match import TrigramIndex
+from alias_store import AliasStore
+
+# similarity above which an unknown exercise name is assigned to an existing exercise without asking the user
+AUTO_ACCEPT_THRESHOLD = 0.85
+# number of the most similar exercises listed when the user is asked
+SHORTLIST_SIZE = 10
 
 
 class GroupExerciseNames:
-    def __init__(self, *, filename: Union[str, Path] = "input/exercise_names.json"):
+    """
+    Example use:
+
+        with GroupExerciseNames() as workout_name_tracker:
+            key = workout_name_tracker.get_alias("Bench")
+
+    """
+
+    def __init__(self, *, filename: Union[str, Path] = "input/exercise_names.json", interactive: bool = True,
+                 auto_accept_threshold: float = AUTO_ACCEPT_THRESHOLD, shortlist_size: int = SHORTLIST_SIZE,
+                 store: Optional[AliasStore] = None):
+        """
+        :param filename: json file with exercise names (keys) and their aliases
+        :param interactive: if False, never ask the user; unknown names are returned as they are (provisional keys) and
+        collected in self.unresolved instead, until they're learned
+        :param auto_accept_threshold: similarity (0-1) above which an unknown name is assigned to the most similar
+        exercise without asking
+        :param shortlist_size: number of most similar exercises offered to the user
+        :param store: where the names are loaded from and new aliases saved to, AliasStore(filename) if not given; a
+        SharedAliasStore lets processes running at the same time learn each other's aliases
+        """
         self.filename = filename
+        self.interactive = interactive
+        self.unresolved = set()
+        self.auto_accept_threshold = auto_accept_threshold
+        self.shortlist_size = shortlist_size
 
-        if os.path.exists(filename):
-            with open(self.filename, 'r') as f:
-                self.exercise_names_dict = json.load(f)
-        else:
-            self.exercise_names_dict = {}
+        # changes are saved by the store as they happen, the whole file is rewritten only on flush()/close()
+        self.store = store if store is not None else AliasStore(filename)
+        self.exercise_names_dict = self.store.load()
 
-    def __del__(self):
-        # remove duplicates
+        # inverted index alias -> key (keys are aliases of themselves) for constant-time lookups. It also serves as the
+        # set of known aliases, so duplicates never make it into the alias lists.
+        self.alias_index = {}
+        # trigram index over keys and aliases for names that don't match exactly
+        self.fuzzy_index = TrigramIndex()
         for key, alias_list in self.exercise_names_dict.items():
-            self.exercise_names_dict[key] = list(set(alias_list))
+            self.exercise_names_dict[key] = self._add_to_index(key, alias_list)
+
+    def __enter__(self) -> "GroupExerciseNames":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
 
-        # save file
-        with open(self.filename, 'w') as f:
-            json.dump(self.exercise_names_dict, f)
+    def flush(self) -> None:
+        self.store.flush()
 
-    def _get_exercise_name(self, exercise_name: str) -> str:
+    def close(self) -> None:
+        self.store.close()
+
+    def _add_to_index(self, key: str, alias_list: list[str]) -> list[str]:
+        """
+        Add the key and its aliases to the alias index. The first key an alias was seen under wins, the same way the
+        dictionary used to be scanned in order.
+        :return: alias_list stripped from duplicates (order preserved)
+        """
+        self.alias_index.setdefault(key, key)
+        self.fuzzy_index.add(key, key)
+        unique_alias_list = list(dict.fromkeys(alias_list))
+        for alias in unique_alias_list:
+            self.alias_index.setdefault(alias, key)
+            self.fuzzy_index.add(alias, key)
+        return unique_alias_list
+
+    def _add_alias_to_index(self, key: str, alias: str) -> None:
+        self.alias_index.setdefault(key, key)
+        self.alias_index.setdefault(alias, key)
+        # a provisional key is resolved once it's learned, e.g. kept as a new exercise under its own name
+        self.unresolved.discard(key)
+        self.unresolved.discard(alias)
+        self.fuzzy_index.add(key, key)
+        self.fuzzy_index.add(alias, key)
+
+    def _get_exercise_name(self, exercise_name: str, candidates: Optional[list[str]] = None) -> str:
         """
         Ask user to match the given exercise_name to existing or input a new one.
+        :param candidates: keys offered to the user, all keys if not given
         :return: dictionary key to be used later
         """
+        if candidates is None:
+            candidates = [*self.exercise_names_dict.keys()]
         existing_exercises_list = []
-        for i, key in enumerate(self.exercise_names_dict.keys()):
+        for i, key in enumerate(candidates):
             existing_exercises_list.append(f"{str(i + 1)}. '{key}' =?= '{exercise_name}'")
         no_of_existing_exercises = len(existing_exercises_list)
         existing_exercises_str = '\n'.join(existing_exercises_list)
@@ -48,7 +112,7 @@ class GroupExerciseNames:
                 if option == '0':
                     return exercise_name
                 elif 1 <= int(option) <= no_of_existing_exercises:
-                    return [*self.exercise_names_dict.keys()][int(option) - 1]
+                    return candidates[int(option) - 1]
                 else:
                     raise ValueError(
                         f"Wrong number was given. Expected range 0-{no_of_existing_exercises}, got {option}"
@@ -69,25 +133,45 @@ class GroupExerciseNames:
 
     def get_alias(self, exercise_name: str) -> str:
         """
-        Check if exercise provided exists as a key or value in the dictionary. if they don't ask user
-        to choose either assigning it to the existing exercise as an alias or creating a new one.
+        Check if exercise provided exists as a key or value in the dictionary. If it doesn't, but it's very similar to an
+        existing one (e.g. a typo), assign it to that one. Otherwise ask user to choose either assigning it to one of the
+        most similar existing exercises as an alias or creating a new one.
         :return: key
         """
 
         exercise_name = exercise_name.lower().strip()
 
         # check if the exercise name already exists
-        for key, value in self.exercise_names_dict.items():
-            if exercise_name in value or exercise_name == key:
-                return key
+        if exercise_name in self.alias_index:
+            return self.alias_index[exercise_name]
 
-        # ask user what to do next and get the name (alias) for the exercise
-        key = self._get_exercise_name(exercise_name)
+        # the name may have been learned by another process sharing the store in the meantime
+        for key, alias in self.store.changes():
+            self._add_alias_to_index(key, alias)
+        if exercise_name in self.alias_index:
+            return self.alias_index[exercise_name]
 
-        if key in [*self.exercise_names_dict.keys()]:
-            self.exercise_names_dict[key].append(exercise_name)
+        # find the most similar existing exercises
+        shortlist = self.fuzzy_index.top_k(exercise_name, self.shortlist_size)
+
+        if shortlist and shortlist[0][1] >= self.auto_accept_threshold:
+            # similar enough to be a typo or a slightly different spelling
+            key = shortlist[0][0]
+        elif not self.interactive:
+            # keep the name as is until the user decides what it is; it's not saved to the file in the meantime
+            self.unresolved.add(exercise_name)
+            return exercise_name
         else:
-            self.exercise_names_dict[key] = [exercise_name]
+            # ask user what to do next and get the name (alias) for the exercise; all exercises are listed if there are
+            # only a few of them, otherwise just the most similar ones
+            if len(self.exercise_names_dict) > self.shortlist_size:
+                key = self._get_exercise_name(exercise_name, [key for key, _ in shortlist])
+            else:
+                key = self._get_exercise_name(exercise_name)
 
-        return key
+        # the store adds the alias to self.exercise_names_dict; a shared store returns the key another process saved the
+        # name under if it was first
+        key = self.store.record(key, exercise_name)
+        self._add_alias_to_index(key, exercise_name)
 
+        return key
@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+from workout_writer import OUTPUT_DIR
+
+
+def manifest_path(sink: str) -> Path:
+    """
+    Each output format keeps its own manifest, so switching formats doesn't skip workouts never saved in the new one.
+    """
+    return OUTPUT_DIR.parent / f"manifest_{sink}.json"
+
+
+def block_hash(workout: list[str]) -> str:
+    return hashlib.sha1('\n'.join(workout).encode()).hexdigest()
+
+
+class ImportManifest:
+    """
+    Remember which workout blocks of a notebook were already imported and where they were saved, so the notebook can be
+    re-imported without processing (and duplicating) unchanged workouts. A block is identified by its date line and
+    the number of blocks with the same date line before it, and compared using the hash of its content.
+
+    Example manifest file:
+
+        {
+            "initial_21102022.txt": {
+                "12/09/22 B#0": {"hash": "3f78...", "filename": "2022091201.json"},
+                "14/09/22 A#0": {"hash": "9a0c...", "filename": "2022091401.json"}
+            }
+        }
+
+    Use:
+
+        with ImportManifest("initial_21102022.txt") as manifest:
+            for block_key, workout in manifest.changed_workouts(ReadFile(filename).iter_workouts()):
+                filename = writer.write(..., filename=manifest.filename(block_key))
+                manifest.update(block_key, workout, filename)
+
+    """
+
+    def __init__(self, notebook_name: str, path: Union[str, Path] = manifest_path('json')) -> None:
+        self.notebook_name = os.path.basename(notebook_name)
+        self.path = Path(path)
+
+        if self.path.is_file():
+            with open(self.path, 'r') as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {}
+        self.blocks = self.manifest.setdefault(self.notebook_name, {})
+
+    def __enter__(self) -> "ImportManifest":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.save()
+
+    def changed_workouts(self, workouts: Iterable[list[str]]) -> Iterator[tuple[str, list[str]]]:
+        """
+        Filter out workouts whose content didn't change since they were last imported.
+        :return: generator of (block key, workout) pairs for new and changed workouts
+        """
+        date_line_counts = {}
+        for workout in workouts:
+            occurrence = date_line_counts.get(workout[0], 0)
+            date_line_counts[workout[0]] = occurrence + 1
+            block_key = f"{workout[0]}#{occurrence}"
+            if self.is_changed(block_key, workout):
+                yield block_key, workout
+
+    def is_changed(self, block_key: str, workout: list[str]) -> bool:
+        """
+        :return: True if the block is new or its content changed since it was last imported
+        """
+        block = self.blocks.get(block_key)
+        return not (block and block["hash"] == block_hash(workout))
+
+    def filename(self, block_key: str) -> Optional[str]:
+        """
+        :return: filename the block was saved to previously or None if it's a new block
+        """
+        block = self.blocks.get(block_key)
+        return block["filename"] if block else None
+
+    def update(self, block_key: str, workout: list[str], filename: str) -> None:
+        self.blocks[block_key] = {"hash": block_hash(workout), "filename": filename}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(self.manifest, f)
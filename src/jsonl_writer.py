@@ -0,0 +1,172 @@
+from array import array
+from datetime import date
+from pathlib import Path
+from typing import Optional, Union
+import os
+import json
+from workout_writer import WorkoutWriter, OUTPUT_DIR
+
+SETS_PATH = OUTPUT_DIR.parent / "sets.jsonl"
+
+
+def workout_to_columns(key: str, workout_dict: dict) -> dict:
+    """
+    Convert a workout dictionary built by WorkoutDictBuilder to columns, one entry per set. Exercise and section names
+    are stored once per workout and referred to by their index.
+
+    Example output:
+
+        {
+            "workout": "2022091201",
+            "date": "2022-09-12",
+            "sections": ["main"],
+            "exercises": ["squat", "bench press"],
+            "section": [0, 0, 0],
+            "exercise": [0, 0, 1],
+            "reps": [5, 5, 5],
+            "weight": [40.0, 60.0, 40.0]
+        }
+
+    """
+    columns = {
+        "workout": key,
+        "date": str(workout_dict["date"]) if workout_dict["date"] else None,
+        "sections": [],
+        "exercises": [],
+        "section": [],
+        "exercise": [],
+        "reps": [],
+        "weight": []
+    }
+    for section_name, section in workout_dict["exercises"].items():
+        section_id = len(columns["sections"])
+        columns["sections"].append(section_name)
+        for exercise_name, sets_list in section.items():
+            exercise_id = len(columns["exercises"])
+            columns["exercises"].append(exercise_name)
+            for reps, weight in sets_list:
+                columns["section"].append(section_id)
+                columns["exercise"].append(exercise_id)
+                columns["reps"].append(reps)
+                columns["weight"].append(weight)
+    return columns
+
+
+class JsonLinesWriter(WorkoutWriter):
+    """
+    Append workouts to a single JSON Lines file, one workout per line in the columnar form of workout_to_columns(),
+    instead of writing one json file per workout. Byte offsets of each workout are kept in a small index file next to
+    it, so a single workout can be read without going through the whole file. Workouts are named the same way as by
+    WorkoutWriter, just without the ".json" extension, and their date/exercise index is kept in "sets.jsonl.index.json".
+
+    Example use:
+
+        with JsonLinesWriter() as writer:
+            for workout_dict in workout_dicts:
+                writer.write(workout_dict)
+        sets = load_sets()
+
+    """
+
+    def __init__(self, path: Union[str, Path] = SETS_PATH, *, batch_size: int = 256, fsync: bool = False) -> None:
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+        self.offsets = load_offsets(self.path)
+        super().__init__(self.path.parent, batch_size=batch_size, fsync=fsync)
+
+    def _existing_filenames(self) -> list[str]:
+        return [key + '.json' for key in self.offsets]
+
+    def _workout_index_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".index.json")
+
+    def _existing_exercise_names(self, key: str) -> list[str]:
+        return load_workout(key, self.path, offsets=self.offsets)["exercises"]
+
+    def _write_batch(self, batch: list[tuple[str, dict]]) -> None:
+        with open(self.path, 'ab') as f:
+            for filename, workout_dict in batch:
+                key = filename[:-5] if filename.endswith('.json') else filename
+                self.offsets[key] = f.tell()
+                f.write(json.dumps(workout_to_columns(key, workout_dict)).encode() + b'\n')
+
+        with open(self.index_path, 'w') as f:
+            json.dump({"size": os.path.getsize(self.path), "offsets": self.offsets}, f)
+
+    def _fsync(self) -> None:
+        for path in [self.path, self.index_path]:
+            if path.is_file():
+                with open(path, 'rb') as f:
+                    os.fsync(f.fileno())
+
+
+def load_offsets(path: Union[str, Path] = SETS_PATH) -> dict[str, int]:
+    """
+    Read the offsets index of the JSON Lines file. The index is rebuilt from the file itself if it is missing or does
+    not match the file (e.g. the import was interrupted between writing the two).
+    :return: dictionary workout key -> byte offset of its line
+    """
+    path = Path(path)
+    index_path = path.with_name(path.name + ".idx")
+    if not path.is_file():
+        return {}
+
+    if index_path.is_file():
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        if index["size"] == os.path.getsize(path):
+            return index["offsets"]
+
+    offsets = {}
+    with open(path, 'rb') as f:
+        offset = 0
+        for line in f:
+            if line.strip():
+                offsets[json.loads(line)["workout"]] = offset
+            offset += len(line)
+    return offsets
+
+
+def load_workout(key: str, path: Union[str, Path] = SETS_PATH, *, offsets: Optional[dict[str, int]] = None) -> dict:
+    """
+    Read the columns of a single workout using the offsets index.
+    """
+    if offsets is None:
+        offsets = load_offsets(path)
+    with open(path, 'rb') as f:
+        f.seek(offsets[key])
+        return json.loads(f.readline())
+
+
+def load_sets(path: Union[str, Path] = SETS_PATH) -> dict:
+    """
+    Load all sets from the JSON Lines file with a single read and concatenate them into typed columns, one entry per
+    set: "workout" (key), "date" (datetime.date), "section", "exercise", "reps" (array of ints) and "weight" (array of
+    floats).
+    """
+    sets = {
+        "workout": [],
+        "date": [],
+        "section": [],
+        "exercise": [],
+        "reps": array('l'),
+        "weight": array('d')
+    }
+    if not Path(path).is_file():
+        return sets
+
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    # only the latest line of each workout counts, a rewritten workout is appended again at the end of the file
+    for offset in load_offsets(path).values():
+        columns = json.loads(content[offset:content.index(b'\n', offset)])
+        no_of_sets = len(columns["reps"])
+        workout_date = date.fromisoformat(columns["date"]) if columns["date"] else None
+        sets["workout"] += [columns["workout"]] * no_of_sets
+        sets["date"] += [workout_date] * no_of_sets
+        sets["section"] += [columns["sections"][i] for i in columns["section"]]
+        sets["exercise"] += [columns["exercises"][i] for i in columns["exercise"]]
+        sets["reps"].extend(columns["reps"])
+        sets["weight"].extend(columns["weight"])
+    return sets
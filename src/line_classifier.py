@@ -0,0 +1,58 @@
+import re
+from enum import Enum
+from typing import NamedTuple, Optional
+from extract_data import ExtractData
+
+SECTION_NAMES = ['extra', 'alternative']
+
+# patterns are compiled once per process, not on every line
+WORD_PATTERN = re.compile(r"[a-z]+")
+WORD_OR_COLON_PATTERN = re.compile(r"[a-z:]+")
+DIGIT_PATTERN = re.compile(r"\d")
+
+
+class LineType(Enum):
+    SECTION = "section"
+    EXERCISE = "exercise"
+    JOG = "jog"
+    AMBIGUOUS = "ambiguous"
+
+
+class ClassifiedLine(NamedTuple):
+    line_type: LineType
+    line: str
+    section_name: Optional[str] = None
+    exercise_name: Optional[str] = None
+    reps: Optional[str] = None
+
+
+def classify_line(line: str) -> ClassifiedLine:
+    """
+    Tokenize a single (non-date) workout line once and decide what it is. Following cases are considered:
+        1.  first word is a known section name (plural or not); e.g. "Extras:" -> SECTION
+        2.  no digits, only lower-case letters and ':'; e.g. "warmup:" -> AMBIGUOUS (user has to decide)
+        3.  contains 'jog'; e.g. "Jog 5km" -> JOG (not sorted yet, skipped)
+        4.  anything else; e.g. "Squat: 70x5+5+9" -> EXERCISE with exercise_name and reps already extracted
+    :param line: single line of a workout, without the date line
+    :return: ClassifiedLine with the line type and the data relevant to that type
+    """
+    line_lower = line.lower()
+
+    # identify if the line contains a name of the section
+    first_word = WORD_PATTERN.search(line_lower)
+    potentially_section_name = first_word.group().replace('s', '') if first_word else ''
+    if potentially_section_name in SECTION_NAMES:
+        return ClassifiedLine(LineType.SECTION, line, section_name=potentially_section_name)
+
+    if not DIGIT_PATTERN.search(line_lower):
+        word_or_colon = WORD_OR_COLON_PATTERN.search(line_lower)
+        if word_or_colon is None or word_or_colon.group() == line:
+            # problematic lines are solved manually
+            return ClassifiedLine(LineType.AMBIGUOUS, line)
+
+    # skip jogging because I didn't sort that one yet
+    if 'jog' in line_lower:
+        return ClassifiedLine(LineType.JOG, line)
+
+    data = ExtractData(line)
+    return ClassifiedLine(LineType.EXERCISE, line, exercise_name=data.exercise_name(), reps=data.reps())
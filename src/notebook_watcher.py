@@ -0,0 +1,80 @@
+import os
+from pathlib import Path
+from typing import Union
+from read_file import WorkoutSplitter
+from import_manifest import ImportManifest
+
+
+class NotebookWatcher:
+    """
+    Follow a notebook that is being appended to. Each poll() reads only the bytes added since the previous one and
+    feeds the complete lines through the same WorkoutSplitter, which keeps the last, still open workout between polls.
+    Workouts are compared with the import manifest, so only new workouts and workouts that changed are returned. The
+    open workout is returned as well (as it would be at the end of the file) and again whenever lines are added to it,
+    keeping its block key, so its output file is rewritten rather than duplicated.
+
+    Example use:
+
+        watcher = NotebookWatcher("input/notebook.txt", manifest)
+        while True:
+            for block_key, workout in watcher.poll():
+                ...
+                manifest.update(block_key, workout, filename)
+            time.sleep(1)
+
+    """
+
+    def __init__(self, filename: Union[str, Path], manifest: ImportManifest) -> None:
+        self.filename = filename
+        self.manifest = manifest
+        self._reset()
+
+    def _reset(self) -> None:
+        self.inode = None  # editors usually save by replacing the file, which gives it a new inode
+        self.offset = 0  # bytes of the file read so far
+        self.partial_line = b''  # end of the file after the last newline, fed once it's complete
+        self.splitter = WorkoutSplitter()
+        self.date_line_counts = {}  # date line -> number of complete workouts with it, for block keys
+
+    def _block_key(self, workout: list[str], date_line_counts: dict[str, int]) -> str:
+        # the same block keys as ImportManifest.changed_workouts() gives when reading the whole file
+        occurrence = date_line_counts.get(workout[0], 0)
+        date_line_counts[workout[0]] = occurrence + 1
+        return f"{workout[0]}#{occurrence}"
+
+    def poll(self) -> list[tuple[str, list[str]]]:
+        """
+        Read what was appended to the notebook since the last poll.
+        :return: (block key, workout) pairs of new and changed workouts, in the order of the file
+        """
+        stat = os.stat(self.filename)
+        if stat.st_size < self.offset or self.inode is not None and stat.st_ino != self.inode:
+            # the file was truncated or replaced, start over; unchanged workouts are still filtered by the manifest
+            self._reset()
+        self.inode = stat.st_ino
+
+        with open(self.filename, 'rb') as f:
+            f.seek(self.offset)
+            appended = f.read()
+        self.offset += len(appended)
+
+        lines = (self.partial_line + appended).split(b'\n')
+        self.partial_line = lines.pop()
+
+        workouts = []
+        for line in lines:
+            workout = self.splitter.feed(line.decode().rstrip('\r'))
+            if workout:
+                workouts.append((self._block_key(workout, self.date_line_counts), workout))
+
+        # the open workout as it would be if the file ended here; its key is not counted until it's complete
+        pending_splitter = WorkoutSplitter()
+        pending_splitter.single_workout = list(self.splitter.single_workout)
+        pending_workouts = [pending_splitter.feed(self.partial_line.decode().rstrip('\r'))] if self.partial_line else []
+        pending_workouts.append(pending_splitter.finish())
+        pending_date_line_counts = dict(self.date_line_counts)
+        for workout in pending_workouts:
+            if workout:
+                workouts.append((self._block_key(workout, pending_date_line_counts), workout))
+
+        return [(block_key, workout) for block_key, workout in workouts if self.manifest.is_changed(block_key, workout)]
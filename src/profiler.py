@@ -0,0 +1,236 @@
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from time import perf_counter
+from typing import Iterable, Iterator, Optional, Union
+import builtins
+import cProfile
+import json
+import tracemalloc
+
+
+class StageStats:
+    __slots__ = ("calls", "seconds", "blocked_seconds", "allocated_bytes")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0  # wall time spent in the stage itself, without stages nested in it
+        self.blocked_seconds = 0.0  # part of seconds spent waiting for the user in input()
+        self.allocated_bytes = 0  # net memory allocated in the stage itself (if allocations are traced)
+
+
+class _Frame:
+    __slots__ = ("name", "start", "memory", "child_seconds", "child_bytes", "blocked_seconds")
+
+    def __init__(self, name: str, start: float, memory: int) -> None:
+        self.name = name
+        self.start = start
+        self.memory = memory
+        self.child_seconds = 0.0
+        self.child_bytes = 0
+        self.blocked_seconds = 0.0
+
+
+class Profiler:
+    """
+    Opt-in instrumentation of read(). Parts of the pipeline are marked as stages, either as a block of code (stage())
+    or as an iterator (iterate(), for the generators the pipeline is built of). Stages may be nested and each one is
+    given only its own time, without the stages nested in it. Time spent waiting for the user in input() is counted
+    separately from the compute time of the stage that asked. When disabled, stage() and iterate() do nothing.
+
+    Example use:
+
+        with Profiler() as profiler:
+            read(filename, profiler=profiler)
+        print(profiler.format_table())
+
+    """
+
+    def __init__(self, *, enabled: bool = True, trace_allocations: bool = True,
+                 collect_function_stats: bool = False) -> None:
+        """
+        :param enabled: if False, the profiler does nothing
+        :param trace_allocations: trace memory allocated in each stage with tracemalloc (slows the run down)
+        :param collect_function_stats: run cProfile separately for each stage (see dump_hottest_stage())
+        """
+        self.enabled = enabled
+        self.trace_allocations = trace_allocations
+        self.collect_function_stats = collect_function_stats
+
+        self.stages = {}  # stage name -> StageStats
+        self.function_stats = {}  # stage name -> cProfile.Profile
+        self.input_calls = 0
+        self.input_seconds = 0.0
+        self.total_seconds = 0.0
+        self.peak_bytes = 0
+
+        self._stack = []
+        self._start = 0.0
+        self._input = None
+        self._started_tracemalloc = False
+        self._null_context = nullcontext()
+
+    def __enter__(self) -> "Profiler":
+        if self.enabled:
+            if self.trace_allocations and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            # input() is looked up in builtins on every call, so everything that asks the user goes through this
+            self._input = builtins.input
+            builtins.input = self._timed_input
+            self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self.enabled:
+            self.total_seconds += perf_counter() - self._start
+            builtins.input = self._input
+            if self.trace_allocations and tracemalloc.is_tracing():
+                self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    def _timed_input(self, *args) -> str:
+        start = perf_counter()
+        try:
+            return self._input(*args)
+        finally:
+            waited = perf_counter() - start
+            self.input_calls += 1
+            self.input_seconds += waited
+            if self._stack:
+                self._stack[-1].blocked_seconds += waited
+
+    def _memory(self) -> int:
+        return tracemalloc.get_traced_memory()[0] if self.trace_allocations and tracemalloc.is_tracing() else 0
+
+    def _enter(self, name: str) -> None:
+        if self.collect_function_stats:
+            if self._stack:
+                self.function_stats[self._stack[-1].name].disable()
+            self.function_stats.setdefault(name, cProfile.Profile()).enable()
+        self._stack.append(_Frame(name, perf_counter(), self._memory()))
+
+    def _exit(self) -> None:
+        frame = self._stack.pop()
+        elapsed = perf_counter() - frame.start
+        allocated = self._memory() - frame.memory
+
+        stats = self.stages.setdefault(frame.name, StageStats())
+        stats.calls += 1
+        stats.seconds += elapsed - frame.child_seconds
+        stats.blocked_seconds += frame.blocked_seconds
+        stats.allocated_bytes += allocated - frame.child_bytes
+
+        if self._stack:
+            self._stack[-1].child_seconds += elapsed
+            self._stack[-1].child_bytes += allocated
+        if self.collect_function_stats:
+            self.function_stats[frame.name].disable()
+            if self._stack:
+                self.function_stats[self._stack[-1].name].enable()
+
+    @contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def stage(self, name: str):
+        """
+        :return: context manager timing the block of code as the stage name
+        """
+        return self._stage(name) if self.enabled else self._null_context
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterable:
+        """
+        Time getting each item from the iterable as the stage name, e.g. the lines a generator reads.
+        :return: the iterable with the same items
+        """
+        if not self.enabled:
+            return iterable
+        return self._iterate(name, iterable)
+
+    def _iterate(self, name: str, iterable: Iterable) -> Iterator:
+        iterator = iter(iterable)
+        while True:
+            with self._stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def report(self) -> dict:
+        """
+        :return: summary of the run: per-stage calls, seconds, compute seconds (without waiting for the user), seconds
+        blocked on input and net allocated kilobytes, plus the totals
+        """
+        return {
+            "total_seconds": self.total_seconds,
+            "input_calls": self.input_calls,
+            "input_seconds": self.input_seconds,
+            "peak_allocated_kb": self.peak_bytes / 1024 if self.trace_allocations else None,
+            "stages": {
+                name: {
+                    "calls": stats.calls,
+                    "seconds": stats.seconds,
+                    "compute_seconds": stats.seconds - stats.blocked_seconds,
+                    "blocked_on_input_seconds": stats.blocked_seconds,
+                    "allocated_kb": stats.allocated_bytes / 1024 if self.trace_allocations else None
+                }
+                for name, stats in sorted(self.stages.items(), key=lambda item: -item[1].seconds)
+            }
+        }
+
+    def format_table(self) -> str:
+        """
+        :return: the report as a plain-text table, slowest stage first
+        """
+        report = self.report()
+        rows = [("stage", "calls", "seconds", "compute", "input", "alloc KB")]
+        for name, stage in report["stages"].items():
+            allocated = f"{stage['allocated_kb']:.1f}" if stage["allocated_kb"] is not None else "-"
+            rows.append((name, str(stage["calls"]), f"{stage['seconds']:.4f}", f"{stage['compute_seconds']:.4f}",
+                         f"{stage['blocked_on_input_seconds']:.4f}", allocated))
+        rows.append(("total", "", f"{report['total_seconds']:.4f}",
+                     f"{report['total_seconds'] - report['input_seconds']:.4f}", f"{report['input_seconds']:.4f}",
+                     f"{report['peak_allocated_kb']:.1f} peak" if report["peak_allocated_kb"] is not None else "-"))
+
+        # stage names aligned to the left, numbers to the right
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        return '\n'.join(
+            '  '.join([row[0].ljust(widths[0])] + [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])])
+            for row in rows
+        )
+
+    def save_json(self, path: Union[str, Path]) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def hottest_stage(self) -> Optional[str]:
+        """
+        :return: name of the stage with the most compute time (None if no stage ran)
+        """
+        if not self.stages:
+            return None
+        return max(self.stages, key=lambda name: self.stages[name].seconds - self.stages[name].blocked_seconds)
+
+    def dump_hottest_stage(self, path: Union[str, Path]) -> Optional[str]:
+        """
+        Save cProfile statistics of the hottest stage, to be read with pstats (requires collect_function_stats).
+        :return: name of the stage dumped
+        """
+        name = self.hottest_stage()
+        if name is None or name not in self.function_stats:
+            return None
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.function_stats[name].dump_stats(str(path))
+        return name
+
+
+# used wherever no profiler is given, so the pipeline doesn't need to check for one
+NULL_PROFILER = Profiler(enabled=False)
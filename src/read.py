@@ -1,49 +1,378 @@
-import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice, tee
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+from alias_store import AliasStore
 from read_file import ReadFile
-from extract_data import ExtractData
-from split_sets import SplitSets
+from line_classifier import classify_line, ClassifiedLine, LineType
+from split_sets import split_sets
 from group_exercise_names import GroupExerciseNames
 from workout_dict_builder import WorkoutDictBuilder
+from workout_writer import WorkoutWriter, OUTPUT_DIR
+from jsonl_writer import JsonLinesWriter, SETS_PATH
+from sqlite_writer import SQLiteWriter, DB_PATH
+from alias_registry import AliasRegistryManager, SharedAliasStore
+from import_manifest import ImportManifest, manifest_path
+from notebook_watcher import NotebookWatcher
+from review_queue import ReviewQueue, review_queue_path
 from ask_user import yes_or_no
+from profiler import Profiler, NULL_PROFILER
 import pprint as pp
 import argparse
+import time
 
+# number of workouts sent to a worker process at once
+CHUNKSIZE = 64
 
-def read(filename: str, *, _print: bool = False):
-    workout_list = ReadFile(filename).split_content()
-    workout_name_tracker = GroupExerciseNames()
-    for workout in workout_list:
-        workout_dict = WorkoutDictBuilder()
-        workout_dict.add_date(workout[0])
-        for line in workout[1:]:
-            # identify if the line contains a name of the section
-            potentially_section_name = re.sub(r"s", "", re.search(r"[a-z]+", line.lower()).group())
-            if potentially_section_name in ['extra', 'alternative']:
-                workout_dict.add_section(potentially_section_name)
-            elif not re.search(r"\d+", line.lower()) and re.search(r"[a-z:]+", line.lower()).group() == line:
-                # problematic lines are solved manually
-                if yes_or_no(f"Is the line {line} in workout {workout} a section name?"):
-                    section_name = input("Rewrite section name: ").lower()
-                else:
-                    continue
+# where --profile saves the timings by default
+PROFILE_PATH = Path(__file__).resolve().parent.parent / "output" / "profile.json"
+
+# output formats: one json file per workout, all sets in one JSON Lines file or a SQLite database
+SINKS = {
+    'json': WorkoutWriter,
+    'jsonl': JsonLinesWriter,
+    'sqlite': SQLiteWriter
+}
+# where each sink saves workouts by default
+SINK_PATHS = {
+    'json': OUTPUT_DIR,
+    'jsonl': SETS_PATH,
+    'sqlite': DB_PATH
+}
+
+
+def parse_workout_lines(workout: list[str], *, profiler: Profiler = NULL_PROFILER
+                        ) -> list[tuple[ClassifiedLine, Optional[list]]]:
+    """
+    Do the part of the work that does not depend on the alias file and never asks the user anything: classify each line
+    of the workout and split sets of the exercise lines. Safe to run in a worker process.
+    :param workout: workout as returned by ReadFile, date line first
+    :param profiler: times the "extract" and "split_sets" stages (serial mode only)
+    :return: list of (classified line, sets list) pairs, sets list being None for non-exercise lines
+    """
+    parsed_lines = []
+    for line in workout[1:]:
+        with profiler.stage("extract"):
+            classified_line = classify_line(line)  # name and reps are extracted in the same pass
+        if classified_line.line_type is LineType.EXERCISE:
+            with profiler.stage("split_sets"):
+                sets_list = split_sets(classified_line.reps)
+            parsed_lines.append((classified_line, sets_list))
+        else:
+            parsed_lines.append((classified_line, None))
+    return parsed_lines
+
+
+def ask_section_name(line: str, workout: list[str]) -> Optional[str]:
+    """
+    Ask the user if the line is a section name.
+    :return: section name given by the user or None if the line is not a section
+    """
+    if yes_or_no(f"Is the line {line} in workout {workout} a section name?"):
+        return input("Rewrite section name: ").lower()
+    return None
+
+
+def build_workout(workout: list[str], parsed_lines: list[tuple[ClassifiedLine, Optional[list]]],
+                  workout_name_tracker: GroupExerciseNames, *,
+                  review_queue: Optional[ReviewQueue] = None) -> WorkoutDictBuilder:
+    """
+    Resolve exercise aliases and ambiguous lines (asking the user if needed) and build the workout dictionary. Has to
+    run in the main process, one workout after another.
+    :param review_queue: if given (batch mode), ambiguous lines are never asked about - they are taken from decisions
+    saved in the queue or skipped and queued; unknown exercise names returned by a non-interactive workout_name_tracker
+    are queued as well
+    """
+    workout_dict = WorkoutDictBuilder()
+    workout_dict.add_date(workout[0])
+    for classified_line, sets_list in parsed_lines:
+        if classified_line.line_type is LineType.SECTION:
+            workout_dict.add_section(classified_line.section_name)
+        elif classified_line.line_type is LineType.AMBIGUOUS:
+            # problematic lines are solved manually
+            if review_queue is None:
+                section_name = ask_section_name(classified_line.line, workout)
+            elif review_queue.is_decided(classified_line.line):
+                section_name = review_queue.section_name(classified_line.line)
             else:
-                # skip jogging because I didn't sort that one yet
-                if 'jog' not in line.lower():
-                    exercise_alias = ExtractData(line).exercise_name()  # get name as is in the file
-                    exercise_name = workout_name_tracker.get_alias(exercise_alias)  # generalise/assign alias
-                    workout_dict.add_exercise(exercise_name)  # add exercise to the dictionary
-                    sets_list = SplitSets(ExtractData(line).reps()).get_list()
-                    workout_dict.add_sets(sets_list)  # add sets to the exercise
-        if _print:
-            pp.pprint(workout)
-            pp.pprint(workout_dict.workout_dict)
-        workout_dict.save_dict()
+                review_queue.add_section(classified_line.line)
+                section_name = None
+            if section_name:
+                workout_dict.add_section(section_name)
+        elif classified_line.line_type is LineType.EXERCISE:
+            # generalise/assign alias to the name as is in the file
+            exercise_name = workout_name_tracker.get_alias(classified_line.exercise_name)
+            if review_queue is not None and exercise_name in workout_name_tracker.unresolved:
+                review_queue.add_alias(exercise_name)
+            workout_dict.add_exercise(exercise_name)  # add exercise to the dictionary
+            workout_dict.add_sets(sets_list)  # add sets to the exercise
+    return workout_dict
+
+
+def parse_in_parallel(workouts: Iterable[list[str]], jobs: int, *, chunksize: int = CHUNKSIZE
+                      ) -> Iterator[tuple[list[str], list[tuple[ClassifiedLine, Optional[list]]]]]:
+    """
+    Spread parse_workout_lines() over a pool of jobs processes. Workouts are read and sent to the pool in windows of
+    a few chunks per process, so the file is still never held in memory as a whole. Results come back in the input
+    order.
+    :return: generator of (workout, parsed lines) pairs
+    """
+    workouts = iter(workouts)
+    window_size = jobs * chunksize * 4
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        while True:
+            window = list(islice(workouts, window_size))
+            if not window:
+                break
+            yield from zip(window, executor.map(parse_workout_lines, window, chunksize=chunksize))
+
+
+def read(filename: str, *, _print: bool = False, jobs: int = 1, sink: str = 'json', incremental: bool = False,
+         batch: bool = False, exercise_names_filename: Union[str, Path] = "input/exercise_names.json",
+         output_path: Optional[Union[str, Path]] = None, profiler: Profiler = NULL_PROFILER,
+         alias_store: Optional[AliasStore] = None, manifest_filename: Optional[Union[str, Path]] = None,
+         review_queue_filename: Optional[Union[str, Path]] = None) -> int:
+    """
+    :param filename: path to the notebook
+    :param jobs: number of processes used to parse workouts
+    :param sink: output format, one of SINKS
+    :param incremental: skip workouts that didn't change since the last import
+    :param batch: never ask the user; unknown exercise names and ambiguous lines go to the review queue (see resolve())
+    :param exercise_names_filename: json file with exercise names and their aliases
+    :param output_path: where the sink saves workouts (the sink's default location if not given)
+    :param profiler: times the stages of the run: "read_file", "extract", "split_sets", "parse" (the rest of parsing, or
+    waiting for the workers in parallel mode), "resolve" (aliases and ambiguous lines) and "write"
+    :param alias_store: where exercise names are loaded from and saved to, instead of exercise_names_filename (e.g.
+    SharedAliasStore when other processes import notebooks at the same time)
+    :param manifest_filename: import manifest used in incremental mode (the sink's default if not given)
+    :param review_queue_filename: review queue used in batch mode (the sink's default if not given)
+    :return: number of items left in the review queue (0 if not in batch mode)
+    """
+    workout_name_tracker = GroupExerciseNames(filename=exercise_names_filename, interactive=not batch,
+                                              store=alias_store)
+    review_queue = ReviewQueue(review_queue_filename or review_queue_path(sink)) if batch else None
+    # workouts are processed as they are read, so the whole file is never held in memory
+    workouts = profiler.iterate("read_file", ReadFile(filename).iter_workouts())
+
+    if incremental:
+        # skip workouts that didn't change since the last import and rewrite the files of the ones that did
+        manifest = ImportManifest(filename, manifest_filename or manifest_path(sink))
+        changed_workouts_1, changed_workouts_2 = tee(manifest.changed_workouts(workouts))
+        block_keys = (block_key for block_key, _ in changed_workouts_1)
+        workouts = (workout for _, workout in changed_workouts_2)
+    else:
+        manifest = None
+        block_keys = None
+
+    if jobs > 1:
+        # classifying lines and splitting sets is spread over processes, while aliases are still resolved here, in
+        # order, so the workers never wait for the user and output files are named the same way as in serial mode
+        parsed_workouts = parse_in_parallel(workouts, jobs)
+    else:
+        parsed_workouts = ((workout, parse_workout_lines(workout, profiler=profiler)) for workout in workouts)
+    parsed_workouts = profiler.iterate("parse", parsed_workouts)
+
+    # one writer for the whole run, so the output directory is scanned only once
+    writer = SINKS[sink](output_path) if output_path else SINKS[sink]()
+    with workout_name_tracker, manifest or nullcontext(), review_queue or nullcontext(), writer:
+        for workout, parsed_lines in parsed_workouts:
+            with profiler.stage("resolve"):
+                workout_dict = build_workout(workout, parsed_lines, workout_name_tracker, review_queue=review_queue)
+            if _print:
+                pp.pprint(workout)
+                pp.pprint(workout_dict.workout_dict)
+            with profiler.stage("write"):
+                if incremental:
+                    block_key = next(block_keys)
+                    output_filename = workout_dict.save_dict(filename=manifest.filename(block_key), writer=writer)
+                    manifest.update(block_key, workout, output_filename)
+                else:
+                    output_filename = workout_dict.save_dict(writer=writer)
+                if batch:
+                    review_queue.add_workout(output_filename, workout)
+        with profiler.stage("write"):
+            writer.flush()
+
+    return review_queue.no_of_items() if batch else 0
+
+
+def notebook_output_paths(output_dir: Union[str, Path], notebook: Union[str, Path], sink: str
+                          ) -> tuple[Path, Path, Path]:
+    """
+    Where a notebook imported by read_directory() is saved: a directory named after the notebook inside output_dir,
+    laid out the same way as the default output directory.
+    :return: output path of the sink, import manifest and review queue filenames
+    """
+    notebook_dir = Path(output_dir) / Path(notebook).stem
+    return (notebook_dir / SINK_PATHS[sink].relative_to(OUTPUT_DIR.parent), notebook_dir / manifest_path(sink).name,
+            notebook_dir / review_queue_path(sink).name)
+
+
+def _read_notebook(notebook: Path, output_dir: Path, sink: str, incremental: bool, registry) -> int:
+    # runs in a worker process of read_directory()
+    output_path, manifest_filename, review_queue_filename = notebook_output_paths(output_dir, notebook, sink)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    return read(str(notebook), sink=sink, incremental=incremental, batch=True, output_path=output_path,
+                alias_store=SharedAliasStore(registry), manifest_filename=manifest_filename,
+                review_queue_filename=review_queue_filename)
+
+
+def read_directory(dirname: Union[str, Path], *, jobs: int = 1, sink: str = 'json', incremental: bool = False,
+                   exercise_names_filename: Union[str, Path] = "input/exercise_names.json",
+                   output_dir: Optional[Union[str, Path]] = None) -> dict[str, int]:
+    """
+    Import every notebook (*.txt) in the directory, jobs notebooks at a time in separate processes. Workers never ask
+    the user (batch mode): each notebook keeps its own review queue, see notebook_output_paths(). All of them resolve
+    names against one alias registry held by a coordinator process (see AliasRegistry), so an alias learned in one
+    notebook is used by the others straight away and the alias file is written by a single process.
+    :param output_dir: where the directories of the notebooks are created, output/<directory name> if not given
+    :return: notebook filename -> number of items left for review
+    """
+    dirname = Path(dirname)
+    output_dir = Path(output_dir) if output_dir else OUTPUT_DIR.parent / dirname.name
+    notebooks = sorted(path for path in dirname.iterdir() if path.suffix == '.txt' and path.is_file())
+
+    with AliasRegistryManager() as manager:
+        registry = manager.AliasRegistry(exercise_names_filename)
+        try:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                futures = {notebook.name: executor.submit(_read_notebook, notebook, output_dir, sink, incremental,
+                                                          registry) for notebook in notebooks}
+                return {name: future.result() for name, future in futures.items()}
+        finally:
+            registry.close()
+
+
+def watch(filename: str, *, interval: float = 1.0, polls: Optional[int] = None, _print: bool = False,
+          sink: str = 'json', batch: bool = False,
+          exercise_names_filename: Union[str, Path] = "input/exercise_names.json",
+          output_path: Optional[Union[str, Path]] = None, manifest_filename: Optional[Union[str, Path]] = None,
+          review_queue_filename: Optional[Union[str, Path]] = None):
+    """
+    Keep importing the notebook as it's appended to: every interval seconds read only the new bytes (see
+    NotebookWatcher) and save new and changed workouts, the same way as read(incremental=True) would. The import
+    manifest is shared with incremental reads, so the first poll imports only what changed since the last import.
+    :param interval: seconds between polls
+    :param polls: number of polls to do (forever, until interrupted, if not given)
+    :param manifest_filename: import manifest shared with incremental reads (the sink's default if not given)
+    :param review_queue_filename: review queue used in batch mode (the sink's default if not given)
+    """
+    workout_name_tracker = GroupExerciseNames(filename=exercise_names_filename, interactive=not batch)
+    review_queue = ReviewQueue(review_queue_filename or review_queue_path(sink)) if batch else None
+    manifest = ImportManifest(filename, manifest_filename or manifest_path(sink))
+    watcher = NotebookWatcher(filename, manifest)
+
+    writer = SINKS[sink](output_path) if output_path else SINKS[sink]()
+    with workout_name_tracker, manifest, review_queue or nullcontext(), writer:
+        poll_number = 0
+        unparsed_block_keys = set()  # workouts that couldn't be parsed, reported once until they can be
+        try:
+            while polls is None or poll_number < polls:
+                if poll_number:
+                    time.sleep(interval)
+                poll_number += 1
+
+                for block_key, workout in watcher.poll():
+                    try:
+                        parsed_lines = parse_workout_lines(workout)
+                    except (AttributeError, ValueError):
+                        # most likely the last line is still being typed (e.g. "Deadlift" without any sets yet); the
+                        # workout isn't marked as imported, so it's parsed again on the next poll
+                        if block_key not in unparsed_block_keys:
+                            print(f"Workout {workout[0]} cannot be parsed yet, it will be retried on the next poll.")
+                        unparsed_block_keys.add(block_key)
+                        continue
+                    unparsed_block_keys.discard(block_key)
+                    workout_dict = build_workout(workout, parsed_lines, workout_name_tracker, review_queue=review_queue)
+                    if _print:
+                        pp.pprint(workout_dict.workout_dict)
+                    output_filename = workout_dict.save_dict(filename=manifest.filename(block_key), writer=writer)
+                    manifest.update(block_key, workout, output_filename)
+                    if batch:
+                        review_queue.add_workout(output_filename, workout)
+                # make the new workouts visible straight away
+                writer.flush()
+                manifest.save()
+        except KeyboardInterrupt:
+            pass
+
+
+def resolve(*, sink: str = 'json', exercise_names_filename: Union[str, Path] = "input/exercise_names.json",
+            output_path: Optional[Union[str, Path]] = None, review_queue_filename: Optional[Union[str, Path]] = None):
+    """
+    Go through the review queue left by batch imports: ask the user about every unknown exercise name and ambiguous
+    line, then rebuild and rewrite only the workouts they were found in.
+    :param review_queue_filename: the sink's default queue if not given
+    """
+    workout_name_tracker = GroupExerciseNames(filename=exercise_names_filename)
+    affected_filenames = {}  # used as an ordered set
+
+    with workout_name_tracker, ReviewQueue(review_queue_filename or review_queue_path(sink)) as review_queue:
+        for exercise_name in [*review_queue.aliases.keys()]:
+            workout_name_tracker.get_alias(exercise_name)  # the user assigns the name to an exercise
+            affected_filenames.update(dict.fromkeys(review_queue.decide_alias(exercise_name)))
+        for line, filenames in [*review_queue.sections.items()]:
+            section_name = ask_section_name(line, review_queue.workouts[filenames[0]])
+            affected_filenames.update(dict.fromkeys(review_queue.decide_section(line, section_name)))
+
+        writer = SINKS[sink](output_path) if output_path else SINKS[sink]()
+        with writer:
+            for filename in affected_filenames:
+                workout = review_queue.workouts[filename]
+                workout_dict = build_workout(workout, parse_workout_lines(workout), workout_name_tracker,
+                                             review_queue=review_queue)
+                workout_dict.save_dict(filename=filename, writer=writer)
+        review_queue.remove_resolved_workouts()
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('-f', '--filename')  # initial_21102022.txt
+    parser.add_argument('-d', '--directory')  # import every notebook in input/<directory>
     parser.add_argument('-p', '--print', default=False)
+    parser.add_argument('-j', '--jobs', type=int, default=1)  # number of worker processes
+    parser.add_argument('-s', '--sink', choices=[*SINKS.keys()], default='json')
+    parser.add_argument('-i', '--incremental', action='store_true')  # skip workouts imported before
+    parser.add_argument('-b', '--batch', action='store_true')  # don't ask, queue unresolved items for review
+    parser.add_argument('-r', '--resolve', action='store_true')  # go through the review queue
+    parser.add_argument('-w', '--watch', action='store_true')  # keep importing what is appended to the notebook
+    parser.add_argument('--interval', type=float, default=1.0)  # seconds between checks in watch mode
+    # time the stages of the run, print them and save them as json
+    parser.add_argument('--profile', nargs='?', const=str(PROFILE_PATH), metavar='JSON_PATH')
+    parser.add_argument('--profile-stats', metavar='PSTATS_PATH')  # cProfile dump of the slowest stage
     args = parser.parse_args()
 
-    read("input/" + args.filename, _print=args.print)
+    if args.resolve and args.directory:
+        for notebook in sorted(Path("input", args.directory).glob("*.txt")):
+            output_path, _, review_queue_filename = notebook_output_paths(
+                OUTPUT_DIR.parent / Path(args.directory).name, notebook, args.sink)
+            if review_queue_filename.is_file():
+                resolve(sink=args.sink, output_path=output_path, review_queue_filename=review_queue_filename)
+    elif args.resolve:
+        resolve(sink=args.sink)
+    elif args.directory:
+        no_of_items = read_directory("input/" + args.directory, jobs=args.jobs, sink=args.sink,
+                                     incremental=args.incremental)
+        for notebook, no_of_notebook_items in no_of_items.items():
+            if no_of_notebook_items:
+                print(f"{notebook}: {no_of_notebook_items} item(s) left for review.")
+        if any(no_of_items.values()):
+            print("Run with --directory and --resolve to go through them.")
+    elif args.watch:
+        watch("input/" + args.filename, interval=args.interval, _print=args.print, sink=args.sink, batch=args.batch)
+    else:
+        profiler = Profiler(collect_function_stats=bool(args.profile_stats)) if args.profile or args.profile_stats \
+            else NULL_PROFILER
+        with profiler:
+            no_of_items = read("input/" + args.filename, _print=args.print, jobs=args.jobs, sink=args.sink,
+                               incremental=args.incremental, batch=args.batch, profiler=profiler)
+        if no_of_items:
+            print(f"{no_of_items} item(s) left for review, run with --resolve to go through them.")
+        if profiler.enabled:
+            print(profiler.format_table())
+            if args.profile:
+                profiler.save_json(args.profile)
+            if args.profile_stats:
+                print(f"cProfile stats of stage {profiler.dump_hottest_stage(args.profile_stats)} saved to "
+                      f"{args.profile_stats}.")
@@ -1,17 +1,36 @@
-import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
+import mmap
+import os
 import pprint as pp
+from typing import Iterable, Iterator, Optional
+
+DIGITS = frozenset('0123456789')
+
+# maximum number of distinct lines remembered by parse_date()
+PARSE_DATE_CACHE_SIZE = 1024
+# number of chunks the file is cut into per worker process in ReadFile.iter_workouts_parallel(), so processes that
+# finish early pick up more work
+CHUNKS_PER_JOB = 4
+
+
+@lru_cache(maxsize=None)
+def _current_year() -> int:
+    # evaluated once per run
+    return datetime.now().year
 
 
 def is_valid_year(year: str) -> bool:
     # check if the year is greater than the current one
     if len(year) == 2:
-        if int(year) > int(datetime.now().strftime('%y')):
+        if int(year) > _current_year() % 100:
             return False
         else:
             return True
     elif len(year) == 4:
-        if int(year) > int(datetime.now().strftime('%Y')):
+        if int(year) > _current_year():
             return False
         else:
             return True
@@ -32,7 +51,7 @@ def is_valid_day(day: str, month: str) -> bool:
     # check if the day is valid
     if int(day) >= 0:
         max_days = [31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-        if int(day) <= max_days[int(month)]:
+        if int(day) <= max_days[int(month) - 1]:
             return True
         else:
             return False
@@ -40,21 +59,190 @@ def is_valid_day(day: str, month: str) -> bool:
         return False
 
 
+def _count_digits(_str: str, start: int, step: int, max_digits: int) -> int:
+    # count consecutive digits (at most max_digits) going from start in the direction of step
+    count = 0
+    i = start
+    while count < max_digits and 0 <= i < len(_str) and _str[i] in DIGITS:
+        count += 1
+        i += step
+    return count
+
+
+@lru_cache(maxsize=PARSE_DATE_CACHE_SIZE)
+def parse_date(_str: str) -> Optional[tuple[int, int, int]]:
+    """
+    Find the first date of the format d/m/y in the string _str, where d and m have 1 or 2 digits and y has 2 to 4
+    digits, and check if it is valid. Same as searching for the regex r"\\d{1,2}/\\d{1,2}/\\d{2,4}", but done by
+    walking from one '/' to the next, so lines without any '/' (most of them) are rejected straight away. Results are
+    memoized, so the same line is parsed only once, e.g. by ReadFile and later by WorkoutDictBuilder.add_date().
+    :param _str: input string
+    :return: (d, m, y) with the full year given or None if there is no valid date in the string
+    """
+    if '/' not in _str:
+        return None
+
+    slash = _str.find('/')
+    while slash != -1:
+        no_of_day_digits = _count_digits(_str, slash - 1, -1, 2)
+        no_of_month_digits = _count_digits(_str, slash + 1, 1, 2)
+        second_slash = slash + 1 + no_of_month_digits
+        if no_of_day_digits and no_of_month_digits and _str[second_slash:second_slash + 1] == '/':
+            no_of_year_digits = _count_digits(_str, second_slash + 1, 1, 4)
+            if no_of_year_digits >= 2:
+                d = _str[slash - no_of_day_digits:slash]
+                m = _str[slash + 1:second_slash]
+                y = _str[second_slash + 1:second_slash + 1 + no_of_year_digits]
+                # only the first date found in the string counts
+                if is_valid_year(y) and is_valid_month(m) and is_valid_day(d, m):
+                    return int(d), int(m), int(y) if len(y) == 4 else 2000 + int(y)
+                return None
+        slash = _str.find('/', slash + 1)
+
+    return None
+
+
 def is_date(_str: str) -> bool:
     """
     Check if the string _str has a date of the format d/m/y where d, m, y are integers.
     :param _str: input string
     :return: True if the input string has a date, False otherwise
     """
-    date_match_obj = re.search(r"\d{1,2}/\d{1,2}/\d{2,4}", _str)
-    # check if there is a date of the format d/m/y in the string
-    if date_match_obj:
-        d, m, y = tuple(date_match_obj.group().split('/'))
+    return parse_date(_str) is not None
 
-        if is_valid_year(y) and is_valid_month(m) and is_valid_day(d, m):
-            return True
-    else:
-        return False
+
+class WorkoutSplitter:
+    """
+    The state machine splitting lines of a notebook into workouts, fed one line at a time. It keeps only the workout
+    being built, so the lines can come from anywhere - a whole file (ReadFile) or the bytes appended to it since it was
+    last read (see NotebookWatcher).
+
+    Example use:
+
+        splitter = WorkoutSplitter()
+        for line in lines:
+            workout = splitter.feed(line)
+            if workout:
+                ...
+        workout = splitter.finish()  # the last workout, if the lines ended in the middle of it
+
+    """
+
+    def __init__(self) -> None:
+        self.single_workout = []
+
+    def feed(self, line: str) -> Optional[list[str]]:
+        """
+        :param line: next line of the notebook
+        :return: the previous workout if the line completes it, None otherwise
+        """
+        line = line.strip('\n ')
+
+        # check for the date only once per line; lines without a '/' can't have one and don't go through the cache
+        line_date = parse_date(line) if '/' in line else None
+
+        if self.single_workout:
+            if not (line == '' or line_date):
+                # append the line if it's not an empty space or date
+                self.single_workout.append(line)
+            if line_date or line == '':
+                # complete previous workout day if the line is a date or an empty line
+                workout = self.single_workout
+                self.single_workout = []
+                return workout
+        elif line_date:
+            # start a new workout day if the line is date
+            self.single_workout = [line]
+        return None
+
+    def finish(self) -> Optional[list[str]]:
+        """
+        End of the lines: the workout being built is complete, unless it's just a date line that came last.
+        :return: the last workout or None
+        """
+        workout = self.single_workout if len(self.single_workout) > 1 else None
+        self.single_workout = []
+        return workout
+
+    def split(self, lines: Iterable[str]) -> Iterator[list[str]]:
+        """
+        Feed all the lines and finish.
+        :return: generator of workouts, each yielded as soon as it is complete
+        """
+        for line in lines:
+            workout = self.feed(line)
+            if workout:
+                yield workout
+        workout = self.finish()
+        if workout:
+            yield workout
+
+
+def _next_empty_line_end(data: mmap.mmap, position: int) -> Optional[int]:
+    # end of the first empty line (or a line of spaces) starting after the position, None if there is none
+    line_start = data.find(b'\n', position) + 1
+    if not line_start:
+        return None
+    while True:
+        line_end = data.find(b'\n', line_start)
+        if line_end == -1:
+            return None
+        if not data[line_start:line_end].removesuffix(b'\r').strip(b' '):
+            return line_end + 1
+        line_start = line_end + 1
+
+
+def chunk_boundaries(data: mmap.mmap, no_of_chunks: int) -> list[tuple[int, int]]:
+    """
+    Cut the notebook into byte ranges of roughly equal size, each one (except the last) ending right after an empty
+    line. WorkoutSplitter never carries anything over an empty line, so every range holds only whole workouts and can be
+    split on its own.
+    :param data: contents of the notebook
+    :param no_of_chunks: number of ranges wanted; there are fewer if the notebook has too few empty lines
+    :return: (start, end) pairs covering the whole notebook, in order
+    """
+    size = len(data)
+    boundaries = [0]
+    for i in range(1, no_of_chunks):
+        cut = _next_empty_line_end(data, max(size * i // no_of_chunks, boundaries[-1]))
+        if cut is None or cut >= size:
+            break
+        boundaries.append(cut)
+    boundaries.append(size)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def split_range(filename: str, start: int, end: int) -> list[list[str]]:
+    """
+    Split a range of the notebook cut by chunk_boundaries() into workouts. Works on the bytes of the memory-mapped file:
+    outside a workout only a date line matters, and a line without a '/' can't be one (see parse_date()), so such lines
+    (headers, notes between workouts) are skipped without being decoded.
+    :return: workouts in the same form as ReadFile.iter_workouts() gives
+    """
+    workouts = []
+    splitter = WorkoutSplitter()
+    feed = splitter.feed
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        # the range is cut out of the mapped file and into lines in one go
+        chunk = data[start:end]
+    if b'\r' in chunk:
+        # the same lines as reading the file in text mode gives
+        chunk = chunk.replace(b'\r\n', b'\n')
+    lines = chunk.split(b'\n')
+    if not lines[-1]:
+        # the range ends with a newline, it's not followed by another line
+        lines.pop()
+
+    for line in lines:
+        if not splitter.single_workout and b'/' not in line:
+            continue
+        workout = feed(line.decode())
+        if workout:
+            workouts.append(workout)
+    workout = splitter.finish()
+    if workout:
+        workouts.append(workout)
+    return workouts
 
 
 class ReadFile:
@@ -97,36 +285,56 @@ class ReadFile:
         content = ReadFile("filename.txt")
         workout_list = content.split_content()
 
+    or, to process workouts one at a time without loading the whole file:
+
+        for workout in ReadFile("filename.txt").iter_workouts():
+            ...
+
+    or, to split a big notebook in several processes:
+
+        workout_list = ReadFile("filename.txt").split_content(jobs=4)
+
     """
 
     def __init__(self, filename: str) -> None:
-        with open(filename, 'r') as f:
-            self.workout_diary_content = f.readlines()
-
-    def split_content(self) -> list:
-        workout_diary_list = []
-        single_workout = []
-
-        for i, line in enumerate(self.workout_diary_content):
-            line = line.strip('\n ')
-            if single_workout:
-                if not (line == '' or is_date(line)):
-                    # append the line if it's not an empty space or date
-                    single_workout.append(line)
-                if is_date(line) or line == '' or i == len(self.workout_diary_content) - 1:
-                    # save previous workout day (if there is any) if the line is one of the following:
-                    # 1. date
-                    # 2. empty line
-                    # 3. last line of the file
-                    workout_diary_list.append(single_workout)
-                    single_workout = []
-            elif not single_workout and is_date(line):
-                # start a new workout day if the line is date
-                single_workout = [line]
-            else:
-                continue
-
-        return workout_diary_list
+        self.filename = filename
+
+    def iter_workouts(self) -> Iterator[list[str]]:
+        """
+        Read the file line by line and yield each workout as soon as it is complete, i.e. when an empty line, a date or
+        the end of the file is reached. Only the workout being built is kept in memory.
+        :return: generator of workouts, each being a list of lines starting with the date line
+        """
+        with open(self.filename, 'r') as f:
+            yield from WorkoutSplitter().split(f)
+
+    def iter_workouts_parallel(self, jobs: int, *, no_of_chunks: Optional[int] = None) -> Iterator[list[str]]:
+        """
+        Split the notebook in jobs processes: the memory-mapped file is cut into ranges of whole workouts (see
+        chunk_boundaries()), each split by a worker (see split_range()). Workouts come out in the order of the file, the
+        same as from iter_workouts(), one range at a time.
+        :param no_of_chunks: number of ranges, jobs * CHUNKS_PER_JOB if not given
+        :return: generator of workouts
+        """
+        with open(self.filename, 'rb') as f:
+            if not os.fstat(f.fileno()).st_size:
+                # an empty file can't be memory-mapped
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                ranges = chunk_boundaries(data, no_of_chunks or jobs * CHUNKS_PER_JOB)
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            starts, ends = zip(*ranges)
+            for workouts in executor.map(split_range, repeat(self.filename), starts, ends):
+                yield from workouts
+
+    def split_content(self, jobs: int = 1) -> list:
+        """
+        :param jobs: number of processes splitting the file (see iter_workouts_parallel())
+        """
+        if jobs > 1:
+            return list(self.iter_workouts_parallel(jobs))
+        return list(self.iter_workouts())
 
 
 if __name__ == "__main__":
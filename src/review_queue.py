@@ -0,0 +1,172 @@
+import json
+from pathlib import Path
+from typing import Callable, Optional, Union
+from alias_store import file_signature
+from workout_writer import OUTPUT_DIR
+
+
+def review_queue_path(sink: str) -> Path:
+    """
+    Each output format keeps its own queue, as the queue refers to workouts by the names they were saved under.
+    """
+    return OUTPUT_DIR.parent / f"review_queue_{sink}.json"
+
+
+class ReviewQueue:
+    """
+    Collect everything a batch (non-interactive) import could not decide on its own - unknown exercise names and lines
+    that may be section names - together with the workouts they were found in, so the user can go through them later
+    and only the affected workouts are rewritten.
+
+    Example queue file:
+
+        {
+            "aliases": {"dead lift": ["2022091401.json"]},
+            "sections": {"warmup:": ["2022091401.json"]},
+            "section_names": {"cooldown:": null},
+            "workouts": {"2022091401.json": ["14/09/22 A", "warmup:", "Dead lift: 10x50,  5x60,70,80"]}
+        }
+
+    "section_names" keeps decisions already made for ambiguous lines: the section name or null if the line is not a
+    section. Those lines are not queued again.
+
+    The queue may be saved by two processes at the same time, e.g. the daemon queuing new items while read.py --resolve
+    takes others off. Changes made since the file was read are kept, so if another process saved the file in the
+    meantime, it is read again and the changes are applied on top of it (reload_if_changed(), also done by save()).
+
+    Use:
+
+        with ReviewQueue(path) as review_queue:
+            # while building a workout
+            review_queue.add_alias("dead lift")
+            # once the workout is saved
+            review_queue.add_workout(filename, workout)
+
+    """
+
+    def __init__(self, path: Union[str, Path] = review_queue_path('json')) -> None:
+        self.path = Path(path)
+        self._load()
+
+        # items found in the workout being built, waiting for the filename it is saved under
+        self.pending_aliases = []
+        self.pending_sections = []
+        # (method, arguments) of the changes made since the file was read or saved
+        self.changes = []
+
+    def __enter__(self) -> "ReviewQueue":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.save()
+
+    def _load(self) -> None:
+        self.file_signature = file_signature(self.path)
+        if self.path.is_file():
+            with open(self.path, 'r') as f:
+                queue = json.load(f)
+        else:
+            queue = {}
+        self.aliases = queue.get("aliases", {})
+        self.sections = queue.get("sections", {})
+        self.section_names = queue.get("section_names", {})
+        self.workouts = queue.get("workouts", {})
+
+    def _apply(self, method: Callable, *args):
+        # make the change and remember it, so it can be made again over a newer version of the file
+        self.changes.append((method, args))
+        return method(*args)
+
+    def reload_if_changed(self) -> bool:
+        """
+        Read the file again if another process saved it since it was read or saved here, and apply the changes made
+        here since then on top of it.
+        :return: True if the file was read again
+        """
+        if file_signature(self.path) == self.file_signature:
+            return False
+        self._load()
+        for method, args in self.changes:
+            method(*args)
+        return True
+
+    def no_of_items(self) -> int:
+        return len(self.aliases) + len(self.sections)
+
+    def add_alias(self, exercise_name: str) -> None:
+        self.pending_aliases.append(exercise_name)
+
+    def add_section(self, line: str) -> None:
+        self.pending_sections.append(line)
+
+    def is_decided(self, line: str) -> bool:
+        return line in self.section_names
+
+    def section_name(self, line: str) -> Optional[str]:
+        """
+        :return: section name decided for the line or None if the line is not a section
+        """
+        return self.section_names.get(line)
+
+    def add_workout(self, filename: str, workout: list[str]) -> None:
+        """
+        Link items found while building the workout to the file it was saved to.
+        """
+        if not (self.pending_aliases or self.pending_sections):
+            return
+
+        self._apply(self._add_workout, filename, workout, self.pending_aliases, self.pending_sections)
+        self.pending_aliases = []
+        self.pending_sections = []
+
+    def _add_workout(self, filename: str, workout: list[str], aliases: list[str], sections: list[str]) -> None:
+        for items, new_items in [(self.aliases, aliases), (self.sections, sections)]:
+            for item in new_items:
+                filenames = items.setdefault(item, [])
+                if filename not in filenames:
+                    filenames.append(filename)
+        self.workouts[filename] = workout
+
+    def decide_section(self, line: str, section_name: Optional[str]) -> list[str]:
+        """
+        Save the decision for an ambiguous line and take it off the queue.
+        :return: filenames of the workouts affected
+        """
+        return self._apply(self._decide_section, line, section_name)
+
+    def _decide_section(self, line: str, section_name: Optional[str]) -> list[str]:
+        self.section_names[line] = section_name
+        return self.sections.pop(line, [])
+
+    def decide_alias(self, exercise_name: str) -> list[str]:
+        """
+        Take the exercise name off the queue once it is added to the alias file.
+        :return: filenames of the workouts affected
+        """
+        return self._apply(self._decide_alias, exercise_name)
+
+    def _decide_alias(self, exercise_name: str) -> list[str]:
+        return self.aliases.pop(exercise_name, [])
+
+    def remove_resolved_workouts(self) -> None:
+        self._apply(self._remove_resolved_workouts)
+
+    def _remove_resolved_workouts(self) -> None:
+        # forget workouts that are not referred to by any item left in the queue
+        still_queued = {filename for filenames in [*self.aliases.values(), *self.sections.values()]
+                        for filename in filenames}
+        self.workouts = {filename: workout for filename, workout in self.workouts.items() if filename in still_queued}
+
+    def save(self) -> None:
+        # don't overwrite what another process saved in the meantime
+        self.reload_if_changed()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({
+                "aliases": self.aliases,
+                "sections": self.sections,
+                "section_names": self.section_names,
+                "workouts": self.workouts
+            }, f)
+        self.file_signature = file_signature(self.path)
+        self.changes = []
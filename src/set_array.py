@@ -0,0 +1,82 @@
+from array import array
+from typing import Iterable, Iterator, Union
+
+
+class SetArray:
+    """
+    Compact list of (reps, weight) sets. Reps and weights are kept in two parallel typed arrays (8-byte signed ints
+    and 8-byte floats) instead of one tuple object per set, so a whole training history fits in a fraction of the
+    memory. It behaves like the list of tuples it replaces - it can be iterated, indexed, appended to, extended and
+    compared to a list - and WorkoutWriter saves it as the same json array of [reps, weight] pairs.
+
+    Example use:
+
+        sets_list = SetArray([(5, 40.0), (5, 60.0)])
+        sets_list.append((2, 90.0))
+        list(sets_list)  # [(5, 40.0), (5, 60.0), (2, 90.0)]
+
+    """
+
+    __slots__ = ("reps", "weights")
+
+    def __init__(self, sets: Iterable[tuple[int, float]] = ()) -> None:
+        self.reps = array('q')
+        self.weights = array('d')
+        self.extend(sets)
+
+    def append(self, single_set: tuple[int, float]) -> None:
+        reps, weight = single_set
+        self.reps.append(reps)
+        self.weights.append(weight)
+
+    def extend(self, sets: Iterable[tuple[int, float]]) -> None:
+        if isinstance(sets, SetArray):
+            # no tuples are created when joining two arrays
+            self.reps.extend(sets.reps)
+            self.weights.extend(sets.weights)
+        else:
+            for single_set in sets:
+                self.append(single_set)
+
+    def __iadd__(self, sets: Iterable[tuple[int, float]]) -> "SetArray":
+        self.extend(sets)
+        return self
+
+    @classmethod
+    def from_columns(cls, reps: Iterable[int], weights: Iterable[float]) -> "SetArray":
+        # build the arrays straight from the two columns, without a tuple per set (and without __init__ creating
+        # empty arrays first)
+        sets_list = cls.__new__(cls)
+        sets_list.reps = array('q', reps)
+        sets_list.weights = array('d', weights)
+        return sets_list
+
+    def copy(self) -> "SetArray":
+        sets_list = SetArray()
+        sets_list.reps = array('q', self.reps)
+        sets_list.weights = array('d', self.weights)
+        return sets_list
+
+    def to_list(self) -> list[tuple[int, float]]:
+        return list(zip(self.reps, self.weights))
+
+    def __len__(self) -> int:
+        return len(self.reps)
+
+    def __iter__(self) -> Iterator[tuple[int, float]]:
+        return zip(self.reps, self.weights)
+
+    def __getitem__(self, index: int) -> tuple[int, float]:
+        return self.reps[index], self.weights[index]
+
+    def __eq__(self, other: Union["SetArray", list, tuple]) -> bool:
+        if isinstance(other, SetArray):
+            return self.reps == other.reps and self.weights == other.weights
+        if isinstance(other, (list, tuple)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # mutable, like the list it replaces
+
+    def __repr__(self) -> str:
+        return f"SetArray({self.to_list()})"
@@ -1,6 +1,71 @@
+from functools import lru_cache
 from math import floor
 import re
 from typing import Callable, Optional
+from set_array import SetArray
+
+# maximum number of distinct sets strings remembered by split_sets()
+SPLIT_SETS_CACHE_SIZE = 4096
+
+PRODUCT_WEIGHT_PATTERN = re.compile(r"2x[\d.]+x\d")
+
+
+def _normalize_sets(sets: str) -> tuple[str, Optional[str]]:
+    """
+    Pure version of SplitSets._which_varies(). Rewrites the sets string to one of the notations handled by var_reps(),
+    var_weight() or var_both() without changing any object.
+    :return: rewritten sets string and name of the SplitSets method that splits it (None if it cannot be split)
+    """
+    while True:
+        if 'x' in sets:
+            if sets.count('x') > 1:
+                product_weight_group = PRODUCT_WEIGHT_PATTERN.search(sets)
+                if product_weight_group:
+                    start, end = product_weight_group.span()
+                    end -= 2  # exclude 'x\d' from the string
+                    weight = sets[start:end].split('x')[1]
+                    # swap product with sum
+                    sets = re.sub(sets[start:end], weight + '+' + weight, sets)
+                    continue
+                return sets, 'var_both'
+            else:
+                if ',' in sets.split('x')[1]:
+                    return sets, 'var_weight'
+                elif sets.split('x')[1] == '':
+                    return sets, None
+                else:
+                    return sets, 'var_reps'
+        else:
+            if '+' in sets:
+                # body-weight exercise with no added weight
+                sets = '0.0x' + sets
+                continue
+            else:
+                return sets, None
+
+
+@lru_cache(maxsize=SPLIT_SETS_CACHE_SIZE)
+def _split_sets_cached(sets: str) -> Optional[SetArray]:
+    # cached results are never handed out, callers get copies (see split_sets()) so that none can modify them
+    return SplitSets(sets).get_list()
+
+
+def split_sets(sets: str) -> Optional[SetArray]:
+    """
+    Memoized equivalent of SplitSets(sets).get_list(). The same sets strings show up again and again in the notebook,
+    so results are kept in a bounded LRU cache keyed by the sets string (already normalized by ExtractData.reps()).
+    :param sets: sets string, e.g. "5x40,60,70,80"
+    :return: new SetArray of (reps, weight) sets or None if the string cannot be split
+    """
+    sets_list = _split_sets_cached(sets)
+    return sets_list.copy() if sets_list is not None else None
+
+
+def split_sets_cache_info():
+    """
+    :return: named tuple with hits, misses, maxsize and currsize of the split_sets() cache
+    """
+    return _split_sets_cached.cache_info()
 
 
 class SplitSets:
@@ -15,35 +80,13 @@ class SplitSets:
             3.  multiple 'x'; e.g. "5x40,60,70,80,2x90" -> var_both()
             4.  multiple 'x', groups such '2x[0-9]+x[0-9]' are present; convert to '[0-9]+[+][0-9]+x[0-9]' and run
                 through the function again
+        The sets string is rewritten in place (see _normalize_sets()) so that the returned method can split it.
         :return: one of the three functions for splitting sets
         """
-        if 'x' in self.sets:
-            if self.sets.count('x') > 1:
-                product_weight_group = re.search(r"2x[\d.]+x\d", self.sets)
-                if product_weight_group:
-                    start, end = product_weight_group.span()
-                    end -= 2  # exclude 'x\d' from the string
-                    weight = self.sets[start:end].split('x')[1]
-                    # swap product with sum
-                    self.sets = re.sub(self.sets[start:end], weight + '+' + weight, self.sets)
-                    return self._which_varies()
-                return self.var_both
-            else:
-                if ',' in self.sets.split('x')[1]:
-                    return self.var_weight
-                elif self.sets.split('x')[1] == '':
-                    return None
-                else:
-                    return self.var_reps
-        else:
-            if '+' in self.sets:
-                # body-weight exercise with no added weight
-                self.sets = '0.0x' + self.sets
-                return self._which_varies()
-            else:
-                return None
+        self.sets, method_name = _normalize_sets(self.sets)
+        return getattr(self, method_name) if method_name else None
 
-    def var_reps(self) -> list[tuple[int, float]]:
+    def var_reps(self) -> SetArray:
         """
         Convert following strings:
             1. 72x5+5+12
@@ -86,13 +129,13 @@ class SplitSets:
             int_reps_list = [int(floor(float(str_reps)))]
 
         # couple up weights and reps
-        sets_list = []
+        sets_list = SetArray()
         for reps in int_reps_list:
             sets_list.append((reps, float_weight))
 
         return sets_list
 
-    def var_weight(self) -> list[tuple[int, float]]:
+    def var_weight(self) -> SetArray:
         """
         Convert following strings:
             1. 5x40,60,70,80
@@ -128,13 +171,13 @@ class SplitSets:
             float_weight_list = [float(str_weight)]
 
         # couple up weights and reps
-        sets_list = []
+        sets_list = SetArray()
         for w in float_weight_list:
             sets_list.append((int(str_reps), w))
 
         return sets_list
 
-    def var_both(self) -> list[tuple[int, float]]:
+    def var_both(self) -> SetArray:
         """
         Convert following strings:
             1. 8x60+8x70+6x70
@@ -172,16 +215,20 @@ class SplitSets:
         float_weight_list = list(map(lambda x: float(x), str_weight_list))
 
         # couple sets and reps
-        sets_list = []
+        sets_list = SetArray()
         for i, r in enumerate(int_rep_list):
             sets_list.append((r, float_weight_list[i]))
 
         return sets_list
 
-    def get_list(self) -> Optional[list]:
+    def get_list(self) -> Optional[SetArray]:
         method = self._which_varies()
         if method:
-            return method()
+            try:
+                return method()
+            except OverflowError:
+                # reps too big for the array (e.g. OCR junk), treated the same as a string that cannot be split
+                return None
         else:
             return None
 
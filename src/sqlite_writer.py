@@ -0,0 +1,255 @@
+from datetime import date
+from pathlib import Path
+from typing import Optional, Union
+import sqlite3
+from workout_writer import WorkoutWriter, OUTPUT_DIR
+
+DB_PATH = OUTPUT_DIR.parent / "workouts.sqlite3"
+
+# maximum number of parameters in a single "IN (...)" query
+MAX_QUERY_PARAMETERS = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workouts (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    date TEXT
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS exercises (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS workout_sections (
+    workout_id INTEGER NOT NULL REFERENCES workouts (id),
+    position INTEGER NOT NULL,
+    section_id INTEGER NOT NULL REFERENCES sections (id),
+    PRIMARY KEY (workout_id, position)
+);
+CREATE TABLE IF NOT EXISTS workout_exercises (
+    workout_id INTEGER NOT NULL REFERENCES workouts (id),
+    position INTEGER NOT NULL,
+    section_id INTEGER NOT NULL REFERENCES sections (id),
+    exercise_id INTEGER NOT NULL REFERENCES exercises (id),
+    PRIMARY KEY (workout_id, position)
+);
+CREATE TABLE IF NOT EXISTS sets (
+    workout_id INTEGER NOT NULL REFERENCES workouts (id),
+    section_id INTEGER NOT NULL REFERENCES sections (id),
+    exercise_id INTEGER NOT NULL REFERENCES exercises (id),
+    date TEXT,
+    set_number INTEGER NOT NULL,
+    reps INTEGER NOT NULL,
+    weight REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sets_exercise_date ON sets (exercise_id, date);
+CREATE INDEX IF NOT EXISTS sets_workout ON sets (workout_id);
+"""
+
+
+def connect(path: Union[str, Path] = DB_PATH) -> sqlite3.Connection:
+    """
+    Open the database, creating the tables if they don't exist yet. The database is kept in WAL mode, so queries can
+    run while an import is writing to it.
+    """
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class SQLiteWriter(WorkoutWriter):
+    """
+    Save workouts to a SQLite database instead of one json file per workout. Sections and exercises (the keys given by
+    GroupExerciseNames) are stored once in their own tables, workout_sections and workout_exercises keep what each
+    workout is made of (in order, including exercises without any sets) and every set is a row of the sets table, which
+    also keeps the date of its workout, so sets of an exercise between two dates are found through the (exercise, date)
+    index.
+    Each batch of workouts is written in a single transaction with executemany(). Workouts are named the same way as by
+    WorkoutWriter, just without the ".json" extension; rewriting a workout replaces all its rows.
+
+    Example database:
+
+        workouts:   id | key        | date
+                    1  | 2022091201 | 2022-09-12
+        sections:   id | name
+                    1  | main
+        exercises:  id | name
+                    1  | squat
+        workout_sections:   workout_id | position | section_id
+                            1          | 0        | 1
+        workout_exercises:  workout_id | position | section_id | exercise_id
+                            1          | 0        | 1          | 1
+        sets:       workout_id | section_id | exercise_id | date       | set_number | reps | weight
+                    1          | 1          | 1           | 2022-09-12 | 0          | 5    | 40.0
+                    1          | 1          | 1           | 2022-09-12 | 1          | 5    | 60.0
+
+    Example use:
+
+        with SQLiteWriter() as writer:
+            for workout_dict in workout_dicts:
+                writer.write(workout_dict)
+        sets = query_sets("squat", date(2022, 9, 1), date(2022, 9, 30))
+
+    """
+
+    def __init__(self, path: Union[str, Path] = DB_PATH, *, batch_size: int = 1024, fsync: bool = False) -> None:
+        """
+        :param path: database file
+        :param batch_size: number of workouts written in one transaction
+        :param fsync: if True, every transaction is forced to the disk (synchronous = FULL), otherwise only the WAL
+        checkpoints are (synchronous = NORMAL, the database can't get corrupted, but the last transactions may be lost
+        on a power failure)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = connect(self.path)
+        self.connection.execute(f"PRAGMA synchronous = {'FULL' if fsync else 'NORMAL'}")
+        # names -> ids, the tables are small enough to be kept in memory
+        self.section_ids = dict(self.connection.execute("SELECT name, id FROM sections"))
+        self.exercise_ids = dict(self.connection.execute("SELECT name, id FROM exercises"))
+        super().__init__(self.path.parent, batch_size=batch_size, fsync=fsync)
+
+    def _existing_filenames(self) -> list[str]:
+        return [key + '.json' for key, in self.connection.execute("SELECT key FROM workouts")]
+
+    def _workout_index_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".index.json")
+
+    def _existing_exercise_names(self, key: str) -> list[str]:
+        return [name for name, in self.connection.execute(
+            "SELECT exercises.name FROM workout_exercises "
+            "JOIN workouts ON workouts.id = workout_exercises.workout_id "
+            "JOIN exercises ON exercises.id = workout_exercises.exercise_id "
+            "WHERE workouts.key = ? ORDER BY position", (key,))]
+
+    def _ids(self, table: str, ids: dict[str, int], names: set[str]) -> None:
+        # add names missing from the table and fetch their ids
+        new_names = [name for name in names if name not in ids]
+        if new_names:
+            self.connection.executemany(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)",
+                                        [(name,) for name in new_names])
+            for i in range(0, len(new_names), MAX_QUERY_PARAMETERS):
+                chunk = new_names[i:i + MAX_QUERY_PARAMETERS]
+                ids.update(self.connection.execute(
+                    f"SELECT name, id FROM {table} WHERE name IN ({', '.join('?' * len(chunk))})", chunk))
+
+    def _write_batch(self, batch: list[tuple[str, dict]]) -> None:
+        # a workout rewritten within the batch is saved only once, as it is in the end
+        workouts = {}
+        for filename, workout_dict in batch:
+            workouts[filename[:-5] if filename.endswith('.json') else filename] = workout_dict
+
+        with self.connection:  # one transaction, committed at the end of the block
+            self.connection.executemany(
+                "INSERT INTO workouts (key, date) VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET date = excluded.date",
+                [(key, str(workout_dict["date"]) if workout_dict["date"] else None)
+                 for key, workout_dict in workouts.items()])
+            workout_ids = {}
+            keys = [*workouts.keys()]
+            for i in range(0, len(keys), MAX_QUERY_PARAMETERS):
+                chunk = keys[i:i + MAX_QUERY_PARAMETERS]
+                workout_ids.update(self.connection.execute(
+                    f"SELECT key, id FROM workouts WHERE key IN ({', '.join('?' * len(chunk))})", chunk))
+            # contents of rewritten workouts are replaced
+            for table in ["workout_sections", "workout_exercises", "sets"]:
+                self.connection.executemany(f"DELETE FROM {table} WHERE workout_id = ?",
+                                            [(workout_id,) for workout_id in workout_ids.values()])
+
+            self._ids("sections", self.section_ids,
+                      {section_name for workout_dict in workouts.values() for section_name in workout_dict["exercises"]})
+            self._ids("exercises", self.exercise_ids,
+                      {exercise_name for workout_dict in workouts.values()
+                       for section in workout_dict["exercises"].values() for exercise_name in section})
+
+            section_rows = []
+            exercise_rows = []
+            rows = []
+            for key, workout_dict in workouts.items():
+                workout_id = workout_ids[key]
+                workout_date = str(workout_dict["date"]) if workout_dict["date"] else None
+                exercise_position = 0
+                for section_position, (section_name, section) in enumerate(workout_dict["exercises"].items()):
+                    section_id = self.section_ids[section_name]
+                    section_rows.append((workout_id, section_position, section_id))
+                    for exercise_name, sets_list in section.items():
+                        exercise_id = self.exercise_ids[exercise_name]
+                        exercise_rows.append((workout_id, exercise_position, section_id, exercise_id))
+                        exercise_position += 1
+                        rows += [(workout_id, section_id, exercise_id, workout_date, set_number, reps, weight)
+                                 for set_number, (reps, weight) in enumerate(sets_list)]
+            self.connection.executemany(
+                "INSERT INTO workout_sections (workout_id, position, section_id) VALUES (?, ?, ?)", section_rows)
+            self.connection.executemany(
+                "INSERT INTO workout_exercises (workout_id, position, section_id, exercise_id) VALUES (?, ?, ?, ?)",
+                exercise_rows)
+            self.connection.executemany(
+                "INSERT INTO sets (workout_id, section_id, exercise_id, date, set_number, reps, weight) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def _fsync(self) -> None:
+        # move everything from the WAL to the database file itself
+        self.connection.execute("PRAGMA wal_checkpoint(FULL)")
+
+    def close(self) -> None:
+        super().close()
+        self.connection.close()
+
+
+def load_workout(key: str, path: Union[str, Path] = DB_PATH) -> dict:
+    """
+    Read a single workout from the database, in the same form as it is saved to a json file by WorkoutWriter: date as
+    a string and sets as [reps, weight] lists.
+    """
+    connection = connect(path)
+    try:
+        row = connection.execute("SELECT id, date FROM workouts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        workout_id, workout_date = row
+        workout_dict = {"date": workout_date, "exercises": {}}
+        for section_name, in connection.execute(
+                "SELECT name FROM workout_sections JOIN sections ON sections.id = section_id "
+                "WHERE workout_id = ? ORDER BY position", (workout_id,)):
+            workout_dict["exercises"][section_name] = {}
+        for section_name, exercise_name in connection.execute(
+                "SELECT sections.name, exercises.name FROM workout_exercises "
+                "JOIN sections ON sections.id = section_id JOIN exercises ON exercises.id = exercise_id "
+                "WHERE workout_id = ? ORDER BY position", (workout_id,)):
+            workout_dict["exercises"][section_name][exercise_name] = []
+        for section_name, exercise_name, reps, weight in connection.execute(
+                "SELECT sections.name, exercises.name, reps, weight FROM sets "
+                "JOIN sections ON sections.id = section_id JOIN exercises ON exercises.id = exercise_id "
+                "WHERE workout_id = ? ORDER BY set_number", (workout_id,)):
+            workout_dict["exercises"][section_name][exercise_name].append([reps, weight])
+        return workout_dict
+    finally:
+        connection.close()
+
+
+def query_sets(exercise_name: str, start: Optional[date] = None, end: Optional[date] = None, *,
+               path: Union[str, Path] = DB_PATH) -> list[tuple[date, list[list]]]:
+    """
+    Get all sets of the exercise between two dates (both inclusive), the same as workout_index.query_sets() does for
+    json files, using the (exercise, date) index.
+    :return: (workout date, sets list) pairs in date order, sets as [reps, weight] lists
+    """
+    connection = connect(path)
+    try:
+        sets = []
+        last_workout_id = None
+        for workout_id, workout_date, reps, weight in connection.execute(
+                "SELECT workout_id, sets.date, reps, weight FROM sets JOIN exercises ON exercises.id = sets.exercise_id "
+                "WHERE exercises.name = ? AND sets.date >= ? AND sets.date <= ? "
+                "ORDER BY sets.date, workout_id, set_number",
+                (exercise_name, start.isoformat() if start else '', end.isoformat() if end else '9999-12-31')):
+            if workout_id != last_workout_id:
+                sets.append((date.fromisoformat(workout_date), []))
+                last_workout_id = workout_id
+            sets[-1][1].append([reps, weight])
+        return sets
+    finally:
+        connection.close()
@@ -0,0 +1,80 @@
+from datetime import date
+from json.encoder import encode_basestring_ascii
+from pathlib import Path
+from typing import Union
+import json
+from set_array import SetArray
+
+# one set as json writes a (reps, weight) pair, without the brackets
+_format_set = '{}, {!r}'.format
+
+
+def json_default(obj):
+    """
+    Serialize objects json doesn't know: sets arrays as lists of [reps, weight] pairs (the same output as the lists of
+    tuples they replace), anything else (e.g. dates) as a string.
+    """
+    if isinstance(obj, SetArray):
+        return obj.to_list()
+    return str(obj)
+
+
+def _dumps_sets(sets_list) -> str:
+    if not isinstance(sets_list, SetArray):
+        # e.g. a list of tuples of a workout dictionary built by hand
+        return json.dumps(sets_list, default=json_default)
+    if not sets_list.reps:
+        return '[]'
+    # int and float formatting is the same as json's, so the pairs are joined without going through the encoder
+    sets_string = '[[' + '], ['.join(map(_format_set, sets_list.reps, sets_list.weights)) + ']]'
+    if 'n' in sets_string:
+        # a nan or inf weight, which json writes as NaN or Infinity
+        return json.dumps(sets_list.to_list())
+    return sets_string
+
+
+def dumps_workout(workout_dict: dict) -> str:
+    """
+    Serialize a workout dictionary of WorkoutDictBuilder ({"date": date or None, "exercises": {section: {exercise:
+    SetArray}}}) to exactly the same json as json.dumps(workout_dict, default=json_default) gives. The layout is fixed,
+    so the string is put together directly: names are escaped by json's own C function, the date is written without
+    the default hook and each SetArray straight from its two arrays, without a tuple per set. Dictionaries of any other
+    shape are left to json.dumps().
+    :return: json string
+    """
+    if tuple(workout_dict) != ("date", "exercises"):
+        return json.dumps(workout_dict, default=json_default)
+
+    workout_date = workout_dict["date"]
+    sections = []
+    for section_name, section in workout_dict["exercises"].items():
+        exercises = [encode_basestring_ascii(exercise_name) + ': ' + _dumps_sets(sets_list)
+                     for exercise_name, sets_list in section.items()]
+        sections.append(encode_basestring_ascii(section_name) + ': {' + ', '.join(exercises) + '}')
+    date_string = 'null' if workout_date is None else encode_basestring_ascii(str(workout_date))
+    return '{"date": ' + date_string + ', "exercises": {' + ', '.join(sections) + '}}'
+
+
+def loads_workout(s: Union[str, bytes]) -> dict:
+    """
+    Read a workout saved by dumps_workout() (or json.dump()) back into the form WorkoutDictBuilder builds: the date as
+    datetime.date and the sets as SetArray (int reps, float weights). The json is parsed by json's C decoder, the pairs
+    of each exercise are then transposed into the reps and weights columns with zip().
+    :return: workout dictionary
+    """
+    workout_dict = json.loads(s)
+    if workout_dict["date"] is not None:
+        workout_dict["date"] = date.fromisoformat(workout_dict["date"])
+    for section in workout_dict["exercises"].values():
+        for exercise_name, sets in section.items():
+            # [[reps, weight], ...] -> (reps, ...), (weight, ...)
+            section[exercise_name] = SetArray.from_columns(*zip(*sets)) if sets else SetArray()
+    return workout_dict
+
+
+def load_workout(path: Union[str, Path]) -> dict:
+    """
+    Read a workout json file saved by WorkoutWriter, see loads_workout().
+    """
+    with open(path, 'rb') as f:
+        return loads_workout(f.read())
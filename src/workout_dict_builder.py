@@ -1,9 +1,9 @@
-from typing import Optional
-from datetime import date, time, datetime, timedelta
+from typing import Iterable, Optional
+from datetime import date
 import re
-from pathlib import Path
-import os
-import json
+from workout_writer import WorkoutWriter
+from read_file import parse_date
+from set_array import SetArray
 
 
 def date_string_to_list(date_str: str) -> list[int]:
@@ -55,12 +55,17 @@ class WorkoutDictBuilder:
 
     def add_date(self, date_str: str) -> None:
         """
-        Use the conversion provided in date_string_to_list() and save the date in the workout_dict using datetime.date.
+        Save the date in the workout_dict using datetime.date. The date line was most likely parsed already by ReadFile,
+        so the memoized parse_date() is used first, falling back to date_string_to_list() for strings it doesn't accept.
         :param date_str: string containing date of the format d/m/y
         """
-        date_list = date_string_to_list(date_str)
+        date_tuple = parse_date(date_str)
+        if date_tuple:
+            day, month, year = date_tuple
+        else:
+            day, month, year = date_string_to_list(date_str)
         # noinspection PyTypedDict
-        self.workout_dict["date"] = date(date_list[2], date_list[1], date_list[0])
+        self.workout_dict["date"] = date(year, month, day)
 
     def add_section(self, section_name: str) -> None:
         section_name = re.search(r"[A-Za-z]+", section_name).group()  # clean the string
@@ -72,11 +77,12 @@ class WorkoutDictBuilder:
         if self._find_exercise_section(exercise_name):
             self.latest_section_added = self._find_exercise_section(exercise_name)
         else:
-            self.workout_dict["exercises"][self.latest_section_added][exercise_name] = []
+            # sets are kept in a compact array rather than a list of tuples (see SetArray)
+            self.workout_dict["exercises"][self.latest_section_added][exercise_name] = SetArray()
 
         self.latest_exercise_added = exercise_name
 
-    def add_sets(self, sets_list: list, exercise_name: Optional[str] = None) -> None:
+    def add_sets(self, sets_list: Iterable[tuple[int, float]], exercise_name: Optional[str] = None) -> None:
         if exercise_name:
             self.latest_section_added = self._find_exercise_section(exercise_name)
             self.latest_exercise_added = exercise_name
@@ -84,28 +90,16 @@ class WorkoutDictBuilder:
         if sets_list:
             self.workout_dict["exercises"][self.latest_section_added][self.latest_exercise_added] += sets_list
 
-    def save_dict(self, *, filename: Optional[str] = None) -> None:
-        path = Path(__file__).resolve().parent / "output" / "workouts"
-        # exclude filenames that have different format
-        filenames = [str(x)[:-5] for x in os.listdir(path) if '.json' in str(x) and str(x[:-5]).isdigit()]
-        if not filename:
-            if self.workout_dict["date"]:
-                # convert date to the filename date part
-                date_filename = datetime.combine(self.workout_dict["date"], time()).strftime("%Y%m%d")
-                # find filenames with the same dates in it
-                same_date_filenames = [f for f in filenames if date_filename in f]
-                if same_date_filenames:
-                    filename = str(max([int(x) for x in same_date_filenames]) + 1) + '.json'
-                else:
-                    filename = date_filename + '01.json'
-            else:
-                most_recent_workout = max([int(x) for x in filenames])  # find most recently added workout
-                # extract year, month and day from the string and convert to integers
-                year = int(str(most_recent_workout)[:-2][0:4])
-                month = int(str(most_recent_workout)[:-2][4:6])
-                day = int(str(most_recent_workout)[:-2][6:])
-                # convert integers to date and add one day, then save as a valid-format filename (string)
-                filename = (datetime.combine(date(year, month, day), time()) + timedelta(days=1)).strftime("%Y%m%d") + '01.json'
-
-        with open(path / filename, 'w') as f:
-            json.dump(self.workout_dict, f, default=str)
+    def save_dict(self, *, filename: Optional[str] = None, writer: Optional[WorkoutWriter] = None) -> str:
+        """
+        Save the workout to a json file. Pass a writer shared between workouts to avoid scanning the output directory
+        for every single workout; otherwise a one-off writer is used and the file is written straight away.
+        :param filename: custom filename, generated from the date if not given
+        :param writer: WorkoutWriter to queue the workout in
+        :return: filename the workout is saved to
+        """
+        if writer:
+            return writer.write(self.workout_dict, filename=filename)
+        else:
+            with WorkoutWriter() as writer:
+                return writer.write(self.workout_dict, filename=filename)
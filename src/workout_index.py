@@ -0,0 +1,141 @@
+from bisect import bisect_left, insort
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterable, Optional, Union
+import json
+import os
+
+
+def _key_bounds(start: Optional[date], end: Optional[date]) -> tuple[str, Optional[str]]:
+    # keys are "YYYYMMDDNN", so all workouts between two dates (inclusive) lie between the first key of the start date
+    # and the first key of the day after the end date
+    lower = start.strftime("%Y%m%d") if start else ''
+    upper = (end + timedelta(days=1)).strftime("%Y%m%d") if end else None
+    return lower, upper
+
+
+class WorkoutIndex:
+    """
+    Keep track of saved workouts by date and exercise, so range queries don't need to open every workout file. Keys are
+    workout filenames without the extension ("YYYYMMDDNN"), which sort in date order; they point to the file itself
+    (WorkoutWriter) or to the offset of the workout in the JSON Lines file (JsonLinesWriter). The index file stores
+    exercise names of each workout; sorted keys and the inverted exercise name -> keys lists are built when it is loaded
+    and kept sorted as workouts are added, so both queries are binary searches.
+
+    Example index file:
+
+        {
+            "workouts": {
+                "2022091201": ["squat", "bench press"],
+                "2022091401": ["deadlift", "overhead press"]
+            }
+        }
+
+    Example use:
+
+        workout_index = WorkoutIndex("output/workouts/.index.json")
+        workout_index.workouts_with("squat", date(2022, 9, 1), date(2022, 9, 30))  # ["2022091201"]
+
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+
+        if self.path.is_file():
+            with open(self.path, 'r') as f:
+                self.workouts = json.load(f)["workouts"]
+        else:
+            self.workouts = {}
+
+        self.dirty = False
+        self.keys = sorted(self.workouts)
+        self.exercises = {}
+        for key in self.keys:
+            for exercise_name in self.workouts[key]:
+                # keys are visited in order, so the lists come out sorted
+                self.exercises.setdefault(exercise_name, []).append(key)
+
+    def add(self, key: str, exercise_names: Iterable[str]) -> None:
+        """
+        Add a workout to the index or replace exercises of the one saved under the same key (e.g. when it's rewritten).
+        """
+        if key in self.workouts:
+            self._remove_exercises(key)
+        else:
+            insort(self.keys, key)
+
+        self.workouts[key] = list(dict.fromkeys(exercise_names))
+        for exercise_name in self.workouts[key]:
+            insort(self.exercises.setdefault(exercise_name, []), key)
+        self.dirty = True
+
+    def _remove_exercises(self, key: str) -> None:
+        for exercise_name in self.workouts[key]:
+            self.exercises[exercise_name].remove(key)
+            if not self.exercises[exercise_name]:
+                del self.exercises[exercise_name]
+
+    def remove(self, key: str) -> None:
+        self._remove_exercises(key)
+        del self.workouts[key]
+        self.keys.pop(bisect_left(self.keys, key))
+        self.dirty = True
+
+    def _between(self, keys: list[str], start: Optional[date], end: Optional[date]) -> list[str]:
+        lower, upper = _key_bounds(start, end)
+        return keys[bisect_left(keys, lower):bisect_left(keys, upper) if upper else len(keys)]
+
+    def keys_between(self, start: Optional[date] = None, end: Optional[date] = None) -> list[str]:
+        """
+        :return: keys of all workouts between start and end (both inclusive, open-ended if not given), in date order
+        """
+        return self._between(self.keys, start, end)
+
+    def workouts_with(self, exercise_name: str, start: Optional[date] = None, end: Optional[date] = None) -> list[str]:
+        """
+        :return: keys of workouts between start and end (both inclusive) with the exercise in them, in date order
+        """
+        return self._between(self.exercises.get(exercise_name, []), start, end)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # written to a temporary file first, so a crash never leaves a half-written index behind
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"workouts": self.workouts}, f)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def exercise_names(workout_dict: dict) -> list[str]:
+    """
+    :return: names of all exercises of the workout built by WorkoutDictBuilder, over all sections
+    """
+    return [exercise_name for section in workout_dict["exercises"].values() for exercise_name in section]
+
+
+def index_path(output_dir: Union[str, Path]) -> Path:
+    """
+    The index of a directory of workout files is kept in it, in a hidden file that "*.json" patterns don't match.
+    """
+    return Path(output_dir) / ".index.json"
+
+
+def query_sets(exercise_name: str, start: Optional[date] = None, end: Optional[date] = None, *,
+               output_dir: Union[str, Path]) -> list[tuple[date, list[list]]]:
+    """
+    Get all sets of the exercise between two dates from the json files written by WorkoutWriter, opening only the files
+    of workouts that have the exercise in them.
+    :param output_dir: directory with the workout files and their index (see index_path())
+    :return: (workout date, sets list) pairs in date order, sets as [reps, weight] lists
+    """
+    output_dir = Path(output_dir)
+    sets = []
+    for key in WorkoutIndex(index_path(output_dir)).workouts_with(exercise_name, start, end):
+        with open(output_dir / (key + '.json'), 'r') as f:
+            workout_dict = json.load(f)
+        workout_date = date(int(key[:4]), int(key[4:6]), int(key[6:8]))
+        for section in workout_dict["exercises"].values():
+            if exercise_name in section:
+                sets.append((workout_date, section[exercise_name]))
+    return sets
@@ -0,0 +1,154 @@
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional, Union
+import os
+import json
+from workout_codec import dumps_workout, json_default
+from workout_index import WorkoutIndex, exercise_names
+
+OUTPUT_DIR = Path(__file__).resolve().parent.parent / "output" / "workouts"
+
+
+def is_workout_filename(filename: str) -> bool:
+    # exclude filenames that have different format than YYYYMMDDNN.json
+    return filename.endswith('.json') and filename[:-5].isdigit() and len(filename[:-5]) >= 10
+
+
+class WorkoutWriter:
+    """
+    Save workout dictionaries to json files named YYYYMMDDNN.json, where NN is the number of the workout on that day.
+    The output directory is scanned once, when the writer is created. Names are given out from an in-memory index of
+    the highest NN for each date, and files are written in batches. The writer also keeps the date/exercise index of
+    the saved workouts up to date (see WorkoutIndex), stored in the ".index.json" file in the output directory.
+
+    Example use:
+
+        with WorkoutWriter() as writer:
+            for workout_dict in workout_dicts:
+                writer.write(workout_dict)
+
+    """
+
+    def __init__(self, output_dir: Union[str, Path] = OUTPUT_DIR, *, batch_size: int = 256,
+                 fsync: bool = False) -> None:
+        """
+        :param output_dir: directory the json files are saved to
+        :param batch_size: number of workouts kept in memory before they are written to the disk
+        :param fsync: if True, force all files written by this writer to the disk when it is closed
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.pending = []  # (filename, workout_dict) pairs waiting to be written
+        self.written_filenames = []
+
+        # date ("YYYYMMDD") -> highest workout number on that day
+        self.latest_numbers = {}
+        existing_filenames = self._existing_filenames()
+        for filename in existing_filenames:
+            self._add_to_index(filename)
+
+        # workouts saved before the index existed or by a writer that was never closed are added from their files,
+        # workouts removed since are dropped
+        self.workout_index = WorkoutIndex(self._workout_index_path())
+        existing_keys = {filename[:-5] for filename in existing_filenames if is_workout_filename(filename)}
+        for key in existing_keys - self.workout_index.workouts.keys():
+            self.workout_index.add(key, self._existing_exercise_names(key))
+        for key in self.workout_index.workouts.keys() - existing_keys:
+            self.workout_index.remove(key)
+
+    def __enter__(self) -> "WorkoutWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _existing_filenames(self) -> list[str]:
+        return os.listdir(self.output_dir)
+
+    def _workout_index_path(self) -> Path:
+        return self.output_dir / ".index.json"
+
+    def _existing_exercise_names(self, key: str) -> list[str]:
+        try:
+            with open(self.output_dir / (key + '.json'), 'r') as f:
+                return exercise_names(json.load(f))
+        except (OSError, ValueError, KeyError, AttributeError):
+            # not a workout saved by this writer, it is only indexed by the date
+            return []
+
+    def _add_to_index(self, filename: str) -> None:
+        if is_workout_filename(filename):
+            date_filename, number = filename[:8], int(filename[8:-5])
+            if number > self.latest_numbers.get(date_filename, 0):
+                self.latest_numbers[date_filename] = number
+
+    def next_filename(self, workout_date: Optional[date]) -> str:
+        """
+        Get the next free filename for a workout on the given date. If there is no date, the workout is assumed to be on
+        the day after the most recently added workout.
+        """
+        if workout_date:
+            # convert date to the filename date part
+            date_filename = workout_date.strftime("%Y%m%d")
+        else:
+            if not self.latest_numbers:
+                raise ValueError("Workout has no date and there is no previous workout to guess it from.")
+            # find most recently added workout and add one day to its date
+            most_recent_date = datetime.strptime(max(self.latest_numbers), "%Y%m%d")
+            date_filename = (most_recent_date + timedelta(days=1)).strftime("%Y%m%d")
+
+        return date_filename + f"{self.latest_numbers.get(date_filename, 0) + 1:02d}.json"
+
+    def write(self, workout_dict: dict, *, filename: Optional[str] = None) -> str:
+        """
+        Queue the workout to be saved and write the whole batch if it is full.
+        :param workout_dict: dictionary built by WorkoutDictBuilder
+        :param filename: custom filename, generated from the date if not given
+        :return: filename the workout is saved to
+        """
+        if not filename:
+            filename = self.next_filename(workout_dict["date"])
+        self._add_to_index(filename)
+        if is_workout_filename(filename):
+            self.workout_index.add(filename[:-5], exercise_names(workout_dict))
+        self.pending.append((filename, workout_dict))
+
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+        return filename
+
+    def _write_batch(self, batch: list[tuple[str, dict]]) -> None:
+        for filename, workout_dict in batch:
+            with open(self.output_dir / filename, 'w') as f:
+                f.write(dumps_workout(workout_dict))
+            self.written_filenames.append(filename)
+
+    def _fsync(self) -> None:
+        for filename in self.written_filenames:
+            with open(self.output_dir / filename, 'rb') as f:
+                os.fsync(f.fileno())
+        self.written_filenames = []
+        # make sure the directory entries are on the disk as well
+        dir_fd = os.open(self.output_dir, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def flush(self) -> None:
+        """
+        Write all queued workouts to the disk.
+        """
+        if self.pending:
+            self._write_batch(self.pending)
+        self.pending = []
+
+    def close(self) -> None:
+        self.flush()
+        if self.workout_index.dirty:
+            self.workout_index.save()
+        if self.fsync:
+            self._fsync()
@@ -0,0 +1,56 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from alias_registry import AliasRegistryManager, SharedAliasStore
+from group_exercise_names import GroupExerciseNames
+
+
+class TestAliasRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = Path(self.tmp_dir.name) / "exercise_names.json"
+        with open(self.filename, 'w') as f:
+            json.dump({"squat": ["squat"], "overhead press": ["ohp"]}, f)
+        self.manager = AliasRegistryManager()
+        self.manager.start()
+        self.registry = self.manager.AliasRegistry(self.filename)
+
+    def tearDown(self) -> None:
+        self.manager.shutdown()
+        self.tmp_dir.cleanup()
+
+    def test_changes_of_other_stores(self) -> None:
+        store_1, store_2 = SharedAliasStore(self.registry), SharedAliasStore(self.registry)
+        store_1.load()
+        exercise_names_dict = store_2.load()
+        self.assertEqual("squat", store_1.record("squat", "back squat"))
+        self.assertEqual([("squat", "back squat")], store_2.changes())
+        self.assertEqual(["squat", "back squat"], exercise_names_dict["squat"])
+        self.assertEqual([], store_2.changes())
+
+    def test_first_key_wins(self) -> None:
+        store_1, store_2 = SharedAliasStore(self.registry), SharedAliasStore(self.registry)
+        store_1.load()
+        store_2.load()
+        store_1.record("squat", "sq")
+        self.assertEqual("squat", store_2.record("sq", "sq"))
+        self.assertEqual("overhead press", store_2.record("press", "ohp"))
+
+    def test_close_saves_file(self) -> None:
+        SharedAliasStore(self.registry).record("squat", "back squat")
+        self.registry.close()
+        with open(self.filename, 'r') as f:
+            self.assertEqual({"squat": ["squat", "back squat"], "overhead press": ["ohp"]}, json.load(f))
+
+    def test_group_exercise_names_sees_aliases_of_others(self) -> None:
+        workout_name_tracker = GroupExerciseNames(store=SharedAliasStore(self.registry), interactive=False)
+        # assigned by the user of another process, not similar enough to be assigned automatically
+        SharedAliasStore(self.registry).record("squat", "back squat")
+        self.assertEqual("squat", workout_name_tracker.get_alias("back squat"))
+        self.assertEqual(set(), workout_name_tracker.unresolved)
+        self.assertEqual(["squat", "back squat"], workout_name_tracker.exercise_names_dict["squat"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from alias_store import AliasStore
+
+
+class TestAliasStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filename = Path(self.tmp_dir.name) / "exercise_names.json"
+        with open(self.filename, 'w') as f:
+            json.dump({"squat": ["squat"]}, f)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _read_file(self) -> dict:
+        with open(self.filename, 'r') as f:
+            return json.load(f)
+
+    def test_load_missing_file(self) -> None:
+        actual = AliasStore(Path(self.tmp_dir.name) / "missing.json").load()
+        self.assertEqual({}, actual)
+
+    def test_record_appends_to_log_only(self) -> None:
+        store = AliasStore(self.filename)
+        store.load()["squat"].append("back squat")
+        store.record("squat", "back squat")
+        self.assertEqual({"squat": ["squat"]}, self._read_file())
+        with open(store.log_filename, 'r') as f:
+            self.assertEqual([{"key": "squat", "alias": "back squat"}], [json.loads(line) for line in f])
+
+    def test_load_replays_log(self) -> None:
+        store = AliasStore(self.filename)
+        store.load()["bench press"] = ["bench press"]
+        store.record("bench press", "bench press")
+        store.record("squat", "back squat")
+        with open(store.log_filename, 'a') as f:
+            f.write('{"key": "squat", "al')  # cut off by a crash
+        expected = {"squat": ["squat", "back squat"], "bench press": ["bench press"]}
+        new_store = AliasStore(self.filename)
+        self.assertEqual(expected, new_store.load())
+        self.assertTrue(new_store.dirty)
+
+    def test_close_compacts(self) -> None:
+        with AliasStore(self.filename) as store:
+            store.load()["squat"].append("back squat")
+            store.record("squat", "back squat")
+        self.assertEqual({"squat": ["squat", "back squat"]}, self._read_file())
+        self.assertFalse(store.log_filename.exists())
+        self.assertEqual(["exercise_names.json"], os.listdir(self.tmp_dir.name))
+
+    def test_compact_every(self) -> None:
+        store = AliasStore(self.filename, compact_every=2, flush_interval=None)
+        exercise_names_dict = store.load()
+        for alias in ["back squat", "front squat"]:
+            exercise_names_dict["squat"].append(alias)
+            store.record("squat", alias)
+        self.assertEqual({"squat": ["squat", "back squat", "front squat"]}, self._read_file())
+        self.assertFalse(store.log_filename.exists())
+
+    def test_flush_interval(self) -> None:
+        store = AliasStore(self.filename, flush_interval=60.0)
+        store.load()["squat"].append("back squat")
+        with patch('alias_store.time.monotonic', return_value=store.last_flush + 61.0):
+            store.record("squat", "back squat")
+        self.assertEqual({"squat": ["squat", "back squat"]}, self._read_file())
+
+    def test_close_without_changes(self) -> None:
+        mtime_before = os.stat(self.filename).st_mtime_ns
+        with AliasStore(self.filename) as store:
+            store.load()
+        self.assertEqual(mtime_before, os.stat(self.filename).st_mtime_ns)
+
+    def test_file_saved_by_another_process(self) -> None:
+        store = AliasStore(self.filename)
+        store.load()
+        self.assertEqual([], store.changes())
+        with AliasStore(self.filename) as other_store:
+            other_store.load()
+            other_store.record("barbell row", "rows")
+        store.record("squat", "back squat")
+        self.assertEqual([("barbell row", "barbell row"), ("barbell row", "rows")], store.changes())
+        self.assertEqual([], store.changes())
+        store.close()
+        self.assertEqual({"squat": ["squat", "back squat"], "barbell row": ["rows"]}, self._read_file())
+
+
+if __name__ == "__main__":
+    unittest.main()
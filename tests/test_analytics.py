@@ -0,0 +1,96 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from analytics import WorkoutAnalytics, PersonalRecord, epley_1rm, summarize_workout
+
+
+class TestAnalytics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_dir_path = Path(self.tmp_dir.name) / "workouts"
+        self.output_dir_path.mkdir()
+        self.cache_path = Path(self.tmp_dir.name) / "analytics_cache.json"
+        self._write("2022091201.json", "2022-09-12", {"main": {"squat": [[5, 100.0], [5, 100.0]]}})
+        self._write("2022091401.json", "2022-09-14", {"main": {"squat": [[3, 100.0]], "bench press": [[5, 60.0]]}})
+        self._write("2022092001.json", "2022-09-20", {"main": {"squat": [[1, 120.0]]}, "extra": {"dips": [[8, 0.0]]}})
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _write(self, filename: str, workout_date: str, exercises: dict) -> None:
+        with open(self.output_dir_path / filename, 'w') as f:
+            json.dump({"date": workout_date, "exercises": exercises}, f)
+
+    def _analytics(self) -> WorkoutAnalytics:
+        return WorkoutAnalytics(self.output_dir_path, self.cache_path)
+
+    def test_epley_1rm(self) -> None:
+        self.assertAlmostEqual(116.6666666, epley_1rm(5, 100.0), places=5)
+        self.assertEqual(100.0, epley_1rm(1, 100.0))
+        self.assertEqual(0.0, epley_1rm(0, 100.0))
+
+    def test_summarize_workout_no_date(self) -> None:
+        expected = {"date": "2022-09-15", "exercises": {"squat": [500.0, 100.0 * (1 + 5 / 30), 1]}}
+        actual = summarize_workout({"date": None, "exercises": {"main": {"squat": [[5, 100.0]]}}}, "2022091501.json")
+        self.assertEqual(expected, actual)
+
+    def test_exercise_volume(self) -> None:
+        expected = {"squat": 1420.0, "bench press": 300.0, "dips": 0.0}
+        actual = self._analytics().exercise_volume()
+        self.assertEqual(expected, actual)
+
+    def test_exercise_volume_date_range(self) -> None:
+        expected = {"squat": 300.0, "bench press": 300.0}
+        actual = self._analytics().exercise_volume(date(2022, 9, 13), date(2022, 9, 14))
+        self.assertEqual(expected, actual)
+
+    def test_weekly_tonnage(self) -> None:
+        expected = {date(2022, 9, 12): 1600.0, date(2022, 9, 19): 120.0}
+        actual = self._analytics().weekly_tonnage()
+        self.assertEqual(expected, actual)
+
+    def test_personal_records(self) -> None:
+        expected = [
+            PersonalRecord(date(2022, 9, 12), "squat", epley_1rm(5, 100.0), "2022091201.json"),
+            PersonalRecord(date(2022, 9, 20), "squat", 120.0, "2022092001.json")
+        ]
+        actual = self._analytics().personal_records("squat")
+        self.assertEqual(expected, actual)
+
+    def test_estimated_1rm(self) -> None:
+        expected = [date(2022, 9, 12), date(2022, 9, 14), date(2022, 9, 20)]
+        actual = [workout_date for workout_date, _ in self._analytics().estimated_1rm("squat")]
+        self.assertEqual(expected, actual)
+
+    def test_refresh_reads_only_changed_files(self) -> None:
+        analytics = self._analytics()
+        self.assertEqual(0, analytics.refresh())
+        self.assertEqual(0, self._analytics().refresh())  # summaries loaded from the cache file
+
+        self._write("2022091401.json", "2022-09-14", {"main": {"squat": [[3, 200.0], [3, 200.0]]}})
+        os.remove(self.output_dir_path / "2022092001.json")
+        self.assertEqual(1, analytics.refresh())
+        self.assertEqual({"squat": 2200.0}, analytics.exercise_volume())
+
+    def test_invalid_files_skipped(self) -> None:
+        # an empty placeholder and a file cut off in the middle of writing
+        open(self.output_dir_path / "2022091601.json", 'w').close()
+        with open(self.output_dir_path / "2022091801.json", 'w') as f:
+            f.write('{"date": "2022-09-18", "exercises": {"main": {"squat": [[5, 1')
+        analytics = self._analytics()
+        self.assertEqual(["2022091601.json", "2022091801.json"], analytics.invalid_filenames())
+        self.assertEqual({"squat": 1420.0, "bench press": 300.0, "dips": 0.0}, analytics.exercise_volume())
+        # not read again until they change
+        self.assertEqual(0, self._analytics().refresh())
+
+        self._write("2022091801.json", "2022-09-18", {"main": {"squat": [[5, 10.0]]}})
+        self.assertEqual(1, analytics.refresh())
+        self.assertEqual(["2022091601.json"], analytics.invalid_filenames())
+        self.assertEqual(1470.0, analytics.exercise_volume()["squat"])
+
+
+if __name__ == "__main__":
+    unittest.main()
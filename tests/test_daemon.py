@@ -0,0 +1,137 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from daemon import DaemonClient, ParserDaemon, make_server
+from read import resolve
+
+NOTEBOOK = "Workout\nDay A: squat\n\n12/09/22 B\nSquat: 5x40,60\nDead lift: 5x70\n\n14/09/22 A\nBench: 5x50\n"
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.exercise_names_path = Path(self.tmp_dir.name) / "exercise_names.json"
+        with open(self.exercise_names_path, 'w') as f:
+            json.dump({"squat": ["squat"], "bench press": ["bench"]}, f)
+        self.output_path = Path(self.tmp_dir.name) / "workouts"
+        self.review_queue_path = Path(self.tmp_dir.name) / "review_queue.json"
+        self.parser_daemon = ParserDaemon(exercise_names_filename=self.exercise_names_path,
+                                          output_path=self.output_path, review_queue_filename=self.review_queue_path)
+
+    def tearDown(self) -> None:
+        self.parser_daemon.close()
+        self.tmp_dir.cleanup()
+
+    def test_parse_text(self) -> None:
+        workouts = self.parser_daemon.handle({"text": NOTEBOOK})["workouts"]
+        self.assertEqual(2, len(workouts))
+        self.assertEqual({"main": {"squat": [(5, 40.0), (5, 60.0)], "dead lift": [(70, 5.0)]}},
+                         workouts[0]["workout"]["exercises"])
+        self.assertEqual({"aliases": ["dead lift"], "sections": []}, workouts[0]["review"])
+        self.assertNotIn("filename", workouts[0])
+        self.assertEqual([], list(self.output_path.glob("2*.json")))
+
+    def test_parse_path_and_save(self) -> None:
+        path = Path(self.tmp_dir.name) / "notebook.txt"
+        path.write_text(NOTEBOOK)
+        workouts = self.parser_daemon.handle({"path": str(path), "save": True})["workouts"]
+        self.assertEqual(["2022091201.json", "2022091401.json"], [workout["filename"] for workout in workouts])
+        # written straight away, not when the daemon stops
+        self.assertTrue((self.output_path / "2022091401.json").is_file())
+        self.assertEqual({"dead lift": ["2022091201.json"]}, self.parser_daemon.review_queue.aliases)
+        # the writer remembers the workouts saved before
+        workouts = self.parser_daemon.handle({"text": NOTEBOOK, "save": True})["workouts"]
+        self.assertEqual(["2022091202.json", "2022091402.json"], [workout["filename"] for workout in workouts])
+
+    def test_failed_request_saves_nothing(self) -> None:
+        # the last line of the second workout can't be parsed
+        notebook = "12/09/22 B\nRows: 5x50\n\n14/09/22 A\nDeadlift\n"
+        with self.assertRaises(AttributeError):
+            self.parser_daemon.handle({"text": notebook, "save": True})
+        self.assertEqual([], list(self.output_path.glob("2*.json")))
+        self.assertEqual({}, self.parser_daemon.review_queue.aliases)
+
+        # sent again once it's fixed, without duplicates of the workouts before the error
+        workouts = self.parser_daemon.handle({"text": notebook.replace("Deadlift", "Deadlift: 5x70"),
+                                              "save": True})["workouts"]
+        self.assertEqual(["2022091201.json", "2022091401.json"], [workout["filename"] for workout in workouts])
+        self.assertEqual({"rows": ["2022091201.json"], "deadlift": ["2022091401.json"]},
+                         self.parser_daemon.review_queue.aliases)
+
+    def test_bad_request(self) -> None:
+        with self.assertRaises(ValueError):
+            self.parser_daemon.handle({"notebook": NOTEBOOK})
+
+    def _serve(self, **kwargs):
+        server = make_server(self.parser_daemon, **kwargs)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_unix_socket(self) -> None:
+        socket_path = Path(self.tmp_dir.name) / "daemon.sock"
+        self._serve(socket_path=socket_path)
+        with DaemonClient(socket_path=socket_path) as client:
+            for _ in range(3):
+                workouts = client.parse(text=NOTEBOOK)["workouts"]
+                self.assertEqual([[5, 40.0], [5, 60.0]], workouts[0]["workout"]["exercises"]["main"]["squat"])
+            self.assertEqual(3, client.status()["requests"])
+            with self.assertRaises(ValueError):
+                client.parse(path=Path(self.tmp_dir.name) / "missing.txt")
+            # the connection is still usable after an error
+            self.assertEqual("2022-09-14", client.parse(text=NOTEBOOK)["workouts"][1]["workout"]["date"])
+
+    def test_localhost_port(self) -> None:
+        server = self._serve(port=0)
+        with DaemonClient(port=server.server_address[1]) as client:
+            workouts = client.parse(text=NOTEBOOK, save=True)["workouts"]
+        self.assertEqual("2022091201.json", workouts[0]["filename"])
+
+    def test_resolve_while_running(self) -> None:
+        notebook = "12/09/22 B\nRows: 5x50\n\n13/09/22 B\nRows: 5x55\n"
+        workouts = self.parser_daemon.handle({"text": notebook, "save": True})["workouts"]
+        self.assertEqual(["rows"], workouts[0]["review"]["aliases"])
+
+        # the user goes through the queue while the daemon keeps running
+        with patch('builtins.input', lambda *args: "barbell row"):
+            resolve(exercise_names_filename=self.exercise_names_path, output_path=self.output_path,
+                    review_queue_filename=self.review_queue_path)
+        with open(self.output_path / "2022091301.json", 'r') as f:
+            self.assertEqual({"main": {"barbell row": [[55, 5.0]]}}, json.load(f)["exercises"])
+
+        workouts = self.parser_daemon.handle({"text": "14/09/22 A\nRows: 5x60\nBench pres: 5x50\n",
+                                              "save": True})["workouts"]
+        self.assertEqual({"aliases": [], "sections": []}, workouts[0]["review"])
+        self.assertEqual(["barbell row", "bench press"], [*workouts[0]["workout"]["exercises"]["main"]])
+        self.assertEqual({}, self.parser_daemon.review_queue.aliases)
+        with open(self.review_queue_path, 'r') as f:
+            self.assertEqual({}, json.load(f)["aliases"])
+
+        # the alias learned by the daemon ("bench pres") is saved without erasing the one added by the user
+        self.parser_daemon.close()
+        with open(self.exercise_names_path, 'r') as f:
+            self.assertEqual({"squat": ["squat"], "bench press": ["bench", "bench pres"], "barbell row": ["rows"]},
+                             json.load(f))
+
+    def test_resolve_as_new_exercise_while_running(self) -> None:
+        workouts = self.parser_daemon.handle({"text": "12/09/22 B\nRows: 5x50\n", "save": True})["workouts"]
+        self.assertEqual(["rows"], workouts[0]["review"]["aliases"])
+
+        # the user keeps the name as it is, so the daemon's provisional key becomes the real one
+        with patch('builtins.input', lambda *args: "0"):
+            resolve(exercise_names_filename=self.exercise_names_path, output_path=self.output_path,
+                    review_queue_filename=self.review_queue_path)
+
+        workouts = self.parser_daemon.handle({"text": "14/09/22 A\nRows: 5x60\n", "save": True})["workouts"]
+        self.assertEqual({"aliases": [], "sections": []}, workouts[0]["review"])
+        self.assertEqual({}, self.parser_daemon.review_queue.aliases)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -36,6 +36,22 @@ class TestExtractData(unittest.TestCase):
             actual = ExtractData(line).reps()
             self.assertEqual(expected[i], actual)
 
+    def test_reps_repeated_specials(self) -> None:
+        expected = "70x5+5,8"
+        actual = ExtractData("Squat: 70xx5+++5,,8").reps()
+        self.assertEqual(expected, actual)
+
+    def test_reps_trailing_specials(self) -> None:
+        expected = "70x5+5+8"
+        actual = ExtractData("Squat: 70x5+5+8 + ,x").reps()
+        self.assertEqual(expected, actual)
+
+    def test_reps_long_junk_runs(self) -> None:
+        # used to hit the recursion limit
+        expected = "70x5" + "+,." * 5000 + "5"
+        actual = ExtractData("Squat: 70x5" + "++,,.." * 5000 + "5" + " +" * 5000).reps()
+        self.assertEqual(expected, actual)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+from fuzzy_match import TrigramIndex, trigrams
+
+
+class TestTrigramIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = TrigramIndex()
+        exercise_names = {
+            "bench press": ["bench press", "bench"],
+            "sitting low row": ["sitting low row", "sitting row", "low row"],
+            "squat": ["squat", "barbell squat"]
+        }
+        for key, alias_list in exercise_names.items():
+            self.index.add(key, key)
+            for alias in alias_list:
+                self.index.add(alias, key)
+
+    def test_trigrams(self) -> None:
+        expected = {"  r", " ro", "row", "ow "}
+        actual = trigrams("row")
+        self.assertEqual(expected, actual)
+
+    def test_top_k_exact_name(self) -> None:
+        expected = ("squat", 1.0)
+        actual = self.index.top_k("barbell squat")[0]
+        self.assertEqual(expected, actual)
+
+    def test_top_k_best_alias_counts(self) -> None:
+        actual = self.index.top_k("sitting row (cables)")
+        self.assertEqual("sitting low row", actual[0][0])
+        self.assertAlmostEqual(0.727, actual[0][1], places=3)
+
+    def test_top_k_limit(self) -> None:
+        actual = self.index.top_k("bench squat row", k=2)
+        self.assertEqual(2, len(actual))
+
+    def test_top_k_sorted(self) -> None:
+        scores = [score for _, score in self.index.top_k("bench squat row")]
+        self.assertEqual(sorted(scores, reverse=True), scores)
+
+    def test_top_k_nothing_similar(self) -> None:
+        expected = []
+        actual = self.index.top_k("zz")
+        self.assertEqual(expected, actual)
+
+
+if __name__ == "__main__":
+    unittest.main()
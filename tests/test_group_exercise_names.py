@@ -1,5 +1,6 @@
 import json
 import os
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import patch, Mock
@@ -8,7 +9,8 @@ from group_exercise_names import GroupExerciseNames
 
 class TestGroupExerciseNames(unittest.TestCase):
     def setUp(self) -> None:
-        self.filepath = Path(__file__).resolve().parent.parent / "input/test_input/exercise_names_test.json"
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepath = Path(self.tmp_dir.name) / "exercise_names_test.json"
         self.data = {
             "bench press": ["bench press", "bench"],
             "sitting low row": ["sitting low row", "sitting row", "low row", "low rows"],
@@ -21,7 +23,8 @@ class TestGroupExerciseNames(unittest.TestCase):
         self.group_names = GroupExerciseNames(filename=self.filepath)
 
     def tearDown(self) -> None:
-        os.remove(self.filepath)
+        self.group_names.close()
+        self.tmp_dir.cleanup()
 
     def test__read_file(self) -> None:
         expected = self.data
@@ -63,6 +66,78 @@ class TestGroupExerciseNames(unittest.TestCase):
         actual = self.group_names.exercise_names_dict
         self.assertEqual(expected, actual)
 
+    def test_get_alias_existing_alias(self) -> None:
+        expected = "sitting low row"
+        actual = self.group_names.get_alias("Low Rows ")
+        self.assertEqual(expected, actual)
+
+    def test_get_alias_existing_key(self) -> None:
+        expected = "squat"
+        actual = self.group_names.get_alias("squat")
+        self.assertEqual(expected, actual)
+
+    @patch('builtins.input', lambda *args: "2")
+    def test_get_alias_new_alias_is_indexed(self) -> None:
+        self.group_names.get_alias(self.exercise_list[1])
+        expected = "sitting low row"
+        actual = self.group_names.alias_index[self.exercise_list[1]]
+        self.assertEqual(expected, actual)
+
+    def test_get_alias_typo_auto_accepted(self) -> None:
+        expected = "bench press"
+        actual = self.group_names.get_alias("bench pres")
+        self.assertEqual(expected, actual)
+        self.assertIn("bench pres", self.group_names.exercise_names_dict["bench press"])
+
+    def test_get_alias_shortlist(self) -> None:
+        with open(self.filepath, 'w') as f:
+            json.dump({**self.data, **{f"exercise {i}": [] for i in range(20)}}, f)
+        input_mock = Mock(return_value="1")
+        with GroupExerciseNames(filename=self.filepath, shortlist_size=2) as group_names, \
+                patch('builtins.input', input_mock):
+            actual = group_names.get_alias("sitting row (cables)")
+        prompt = input_mock.call_args[0][0]
+        self.assertEqual("sitting low row", actual)
+        self.assertIn("1. 'sitting low row'", prompt)
+        self.assertNotIn("exercise 19", prompt)
+
+    def test_get_alias_not_interactive(self) -> None:
+        group_names = GroupExerciseNames(filename=self.filepath, interactive=False)
+        expected = "zercher squat"
+        actual = group_names.get_alias("Zercher squat")
+        self.assertEqual(expected, actual)
+        self.assertEqual({"zercher squat"}, group_names.unresolved)
+        self.assertNotIn("zercher squat", group_names.exercise_names_dict)
+
+    def test__read_file_duplicates_removed(self) -> None:
+        with open(self.filepath, 'w') as f:
+            json.dump({"squat": ["squat", "barbell squat", "squat"]}, f)
+        expected = {"squat": ["squat", "barbell squat"]}
+        actual = GroupExerciseNames(filename=self.filepath).exercise_names_dict
+        self.assertEqual(expected, actual)
+
+    @patch('builtins.input', lambda *args: "2")
+    def test_new_alias_saved_on_close(self) -> None:
+        with GroupExerciseNames(filename=self.filepath) as group_names:
+            group_names.get_alias("sitting row (cables)")
+        with open(self.filepath, 'r') as f:
+            actual = json.load(f)
+        self.assertIn("sitting row (cables)", actual["sitting low row"])
+        self.assertFalse(group_names.store.log_filename.exists())
+
+    @patch('builtins.input', lambda *args: "2")
+    def test_new_alias_kept_without_close(self) -> None:
+        self.group_names.get_alias("sitting row (cables)")
+        # the run was killed before close(), the alias is replayed from the log
+        actual = GroupExerciseNames(filename=self.filepath).exercise_names_dict
+        self.assertIn("sitting row (cables)", actual["sitting low row"])
+
+    def test_file_not_rewritten_when_unchanged(self) -> None:
+        mtime_before = os.stat(self.filepath).st_mtime_ns
+        self.group_names.get_alias("bench")
+        self.group_names.close()
+        self.assertEqual(mtime_before, os.stat(self.filepath).st_mtime_ns)
+
 
 if __name__ == "__main__":
     unittest.main()
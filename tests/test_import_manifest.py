@@ -0,0 +1,49 @@
+import tempfile
+import unittest
+from pathlib import Path
+from import_manifest import ImportManifest
+
+
+class TestImportManifest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "manifest_json.json"
+        self.workouts = [
+            ["17/09/22 B", "Squat: 70x5+5+9"],
+            ["20/09/22 A", "Deadlift: 70x5+5+13"],
+            ["20/09/22 A", "Overhead press: 40x5+5+6"]
+        ]
+        with ImportManifest("notebook.txt", self.path) as manifest:
+            for i, (block_key, workout) in enumerate(manifest.changed_workouts(self.workouts)):
+                manifest.update(block_key, workout, f"file_{i}.json")
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_block_keys(self) -> None:
+        expected = ["17/09/22 B#0", "20/09/22 A#0", "20/09/22 A#1"]
+        actual = [block_key for block_key, _ in ImportManifest("other.txt", self.path).changed_workouts(self.workouts)]
+        self.assertEqual(expected, actual)
+
+    def test_unchanged_workouts_skipped(self) -> None:
+        expected = []
+        actual = list(ImportManifest("notebook.txt", self.path).changed_workouts(self.workouts))
+        self.assertEqual(expected, actual)
+
+    def test_changed_and_new_workouts(self) -> None:
+        workouts = [
+            self.workouts[0],
+            ["20/09/22 A", "Deadlift: 70x5+5+14"],
+            self.workouts[2],
+            ["22/09/22 B", "Squat: 72x5+5+12"]
+        ]
+        manifest = ImportManifest("notebook.txt", self.path)
+        expected = [("20/09/22 A#0", workouts[1]), ("22/09/22 B#0", workouts[3])]
+        actual = list(manifest.changed_workouts(workouts))
+        self.assertEqual(expected, actual)
+        self.assertEqual("file_1.json", manifest.filename("20/09/22 A#0"))
+        self.assertIsNone(manifest.filename("22/09/22 B#0"))
+
+
+if __name__ == "__main__":
+    unittest.main()
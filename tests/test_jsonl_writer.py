@@ -0,0 +1,104 @@
+import tempfile
+import unittest
+from array import array
+from datetime import date
+from pathlib import Path
+from jsonl_writer import JsonLinesWriter, workout_to_columns, load_offsets, load_workout, load_sets
+
+
+class TestJsonLinesWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "sets.jsonl"
+        self.workout_dict_1 = {
+            "date": date(2022, 9, 12),
+            "exercises": {
+                "main": {"squat": [(5, 40.0), (5, 60.0)], "bench press": [(5, 40.0)]},
+                "extra": {"triceps pushdown (rope)": [(5, 16.3)]}
+            }
+        }
+        self.workout_dict_2 = {
+            "date": date(2022, 9, 14),
+            "exercises": {
+                "main": {"deadlift": [(10, 50.0)]}
+            }
+        }
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_workout_to_columns(self) -> None:
+        expected = {
+            "workout": "2022091201",
+            "date": "2022-09-12",
+            "sections": ["main", "extra"],
+            "exercises": ["squat", "bench press", "triceps pushdown (rope)"],
+            "section": [0, 0, 0, 1],
+            "exercise": [0, 0, 1, 2],
+            "reps": [5, 5, 5, 5],
+            "weight": [40.0, 60.0, 40.0, 16.3]
+        }
+        actual = workout_to_columns("2022091201", self.workout_dict_1)
+        self.assertEqual(expected, actual)
+
+    def test_load_sets(self) -> None:
+        with JsonLinesWriter(self.path) as writer:
+            writer.write(self.workout_dict_1)
+            writer.write(self.workout_dict_2)
+        actual = load_sets(self.path)
+        self.assertEqual(["2022091201"] * 4 + ["2022091401"], actual["workout"])
+        self.assertEqual([date(2022, 9, 12)] * 4 + [date(2022, 9, 14)], actual["date"])
+        self.assertEqual(["main", "main", "main", "extra", "main"], actual["section"])
+        self.assertEqual(["squat", "squat", "bench press", "triceps pushdown (rope)", "deadlift"], actual["exercise"])
+        self.assertEqual(array('l', [5, 5, 5, 5, 10]), actual["reps"])
+        self.assertEqual(array('d', [40.0, 60.0, 40.0, 16.3, 50.0]), actual["weight"])
+
+    def test_append_names_workouts_like_json_files(self) -> None:
+        with JsonLinesWriter(self.path) as writer:
+            writer.write(self.workout_dict_1)
+        with JsonLinesWriter(self.path) as writer:
+            actual = writer.write(self.workout_dict_1)
+        self.assertEqual("2022091202.json", actual)
+        self.assertEqual(["2022091201", "2022091202"], [*load_offsets(self.path).keys()])
+
+    def test_load_workout(self) -> None:
+        with JsonLinesWriter(self.path) as writer:
+            writer.write(self.workout_dict_1)
+            writer.write(self.workout_dict_2)
+        expected = workout_to_columns("2022091401", self.workout_dict_2)
+        actual = load_workout("2022091401", self.path)
+        self.assertEqual(expected, actual)
+
+    def test_load_offsets_stale_index(self) -> None:
+        with JsonLinesWriter(self.path) as writer:
+            writer.write(self.workout_dict_1)
+        expected = load_offsets(self.path)
+        (Path(self.tmp_dir.name) / "sets.jsonl.idx").write_text('{"size": 0, "offsets": {}}')
+        actual = load_offsets(self.path)
+        self.assertEqual(expected, actual)
+
+    def test_load_sets_rewritten_workout(self) -> None:
+        with JsonLinesWriter(self.path) as writer:
+            writer.write(self.workout_dict_1)
+            writer.write(self.workout_dict_2)
+            writer.write(self.workout_dict_2, filename="2022091201.json")
+        actual = load_sets(self.path)
+        self.assertEqual(["2022091201", "2022091401"], actual["workout"])
+
+    def test_load_sets_no_file(self) -> None:
+        actual = load_sets(self.path)
+        self.assertEqual([], actual["workout"])
+
+    def test_index_updated_on_write(self) -> None:
+        with JsonLinesWriter(self.path) as writer:
+            writer.write(self.workout_dict_1)
+        self.path.with_name("sets.jsonl.index.json").unlink()
+        with JsonLinesWriter(self.path) as writer:
+            writer.write(self.workout_dict_2)
+        # the first workout is indexed again from the JSON Lines file
+        self.assertEqual(["2022091201"], writer.workout_index.workouts_with("bench press"))
+        self.assertEqual(["2022091201", "2022091401"], writer.workout_index.keys_between(date(2022, 9, 1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
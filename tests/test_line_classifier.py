@@ -0,0 +1,38 @@
+import unittest
+from line_classifier import classify_line, LineType, ClassifiedLine
+
+
+class TestClassifyLine(unittest.TestCase):
+    def test_section_plural(self) -> None:
+        expected = ClassifiedLine(LineType.SECTION, "Extras:", section_name="extra")
+        actual = classify_line("Extras:")
+        self.assertEqual(expected, actual)
+
+    def test_section_singular(self) -> None:
+        expected = ClassifiedLine(LineType.SECTION, "Alternative", section_name="alternative")
+        actual = classify_line("Alternative")
+        self.assertEqual(expected, actual)
+
+    def test_ambiguous(self) -> None:
+        actual = classify_line("warmup:")
+        self.assertEqual(LineType.AMBIGUOUS, actual.line_type)
+
+    def test_jog(self) -> None:
+        actual = classify_line("Jog 5km")
+        self.assertEqual(LineType.JOG, actual.line_type)
+
+    def test_exercise(self) -> None:
+        expected = ClassifiedLine(LineType.EXERCISE, "Lat pulldown: 70.6*x5+5+8", exercise_name="lat pulldown",
+                                  reps="70.6x5+5+8")
+        actual = classify_line("Lat pulldown: 70.6*x5+5+8")
+        self.assertEqual(expected, actual)
+
+    def test_exercise_with_notes(self) -> None:
+        expected = ClassifiedLine(LineType.EXERCISE, "Overhead press (some notes): (20+23)x5+5+8",
+                                  exercise_name="overhead press (some notes)", reps="20+23x5+5+8")
+        actual = classify_line("Overhead press (some notes): (20+23)x5+5+8")
+        self.assertEqual(expected, actual)
+
+
+if __name__ == "__main__":
+    unittest.main()
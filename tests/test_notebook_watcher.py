@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from import_manifest import ImportManifest, block_hash
+from notebook_watcher import NotebookWatcher
+from read_file import ReadFile
+
+
+class TestNotebookWatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "notebook.txt"
+        self.path.write_text("Workout\nDay A: squat\n\n12/09/22 B\nSquat: 5x40,60\n\n14/09/22 A\nDeadlift: 5x70\n")
+        self.manifest = ImportManifest("notebook.txt", Path(self.tmp_dir.name) / "manifest.json")
+        self.watcher = NotebookWatcher(self.path, self.manifest)
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _append(self, text: str) -> None:
+        with open(self.path, 'a') as f:
+            f.write(text)
+
+    def _import(self) -> list[tuple[str, list[str]]]:
+        # poll and mark the workouts as imported, like watch() does
+        workouts = self.watcher.poll()
+        for block_key, workout in workouts:
+            self.manifest.update(block_key, workout, block_key)
+        return workouts
+
+    def test_first_poll_reads_whole_file(self) -> None:
+        expected = [
+            ("12/09/22 B#0", ["12/09/22 B", "Squat: 5x40,60"]),
+            ("14/09/22 A#0", ["14/09/22 A", "Deadlift: 5x70"])  # still open, returned as if the file ended here
+        ]
+        self.assertEqual(expected, self._import())
+        self.assertEqual(self.path.stat().st_size, self.watcher.offset)
+
+    def test_nothing_appended(self) -> None:
+        self._import()
+        self.assertEqual([], self._import())
+
+    def test_open_workout_grows(self) -> None:
+        self._import()
+        self._append("Bench: 5x50\n")
+        expected = [("14/09/22 A#0", ["14/09/22 A", "Deadlift: 5x70", "Bench: 5x50"])]
+        self.assertEqual(expected, self._import())
+
+    def test_new_workout_with_the_same_date_line(self) -> None:
+        self._import()
+        self._append("\n14/09/22 A\nSquat: 5x80\n")
+        expected = [("14/09/22 A#1", ["14/09/22 A", "Squat: 5x80"])]
+        self.assertEqual(expected, self._import())
+
+    def test_partial_line(self) -> None:
+        self._import()
+        self._append("Bench: 5x5")
+        self.assertEqual([("14/09/22 A#0", ["14/09/22 A", "Deadlift: 5x70", "Bench: 5x5"])], self._import())
+        self._append("0\n")
+        self.assertEqual([("14/09/22 A#0", ["14/09/22 A", "Deadlift: 5x70", "Bench: 5x50"])], self._import())
+
+    def test_same_as_read_file(self) -> None:
+        for text in ["Bench: 5x50\n", "\n15/09/22 B\n", "Squat: 5x4", "0\nBench: 5x60\n", "\n"]:
+            self._append(text)
+            self._import()
+        # the same blocks as importing the whole file at once
+        whole_file = ImportManifest("notebook.txt", Path(self.tmp_dir.name) / "other_manifest.json")
+        workouts = ReadFile(str(self.path)).iter_workouts()
+        expected = {block_key: block_hash(workout) for block_key, workout in whole_file.changed_workouts(workouts)}
+        self.assertEqual(expected, {block_key: block["hash"] for block_key, block in self.manifest.blocks.items()})
+        self.assertEqual([], self.watcher.poll())
+
+    def test_truncated_file(self) -> None:
+        self._import()
+        self.path.write_text("12/09/22 B\nSquat: 5x40,60\n")
+        self.assertEqual([], self._import())
+        # saved by replacing the file, as editors do
+        new_path = self.path.with_name("new_notebook.txt")
+        new_path.write_text("12/09/22 B\nSquat: 5x40,70\n14/09/22 A\nDeadlift: 5x70\n")
+        os.replace(new_path, self.path)
+        self.assertEqual([("12/09/22 B#0", ["12/09/22 B", "Squat: 5x40,70"])], self._import())
+
+
+if __name__ == "__main__":
+    unittest.main()
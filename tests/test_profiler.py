@@ -0,0 +1,86 @@
+import builtins
+import json
+import pstats
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from profiler import Profiler, NULL_PROFILER
+
+
+class TestProfiler(unittest.TestCase):
+    def test_nested_stages_self_time(self) -> None:
+        with Profiler(trace_allocations=False) as profiler:
+            with profiler.stage("outer"):
+                time.sleep(0.02)
+                with profiler.stage("inner"):
+                    time.sleep(0.05)
+        self.assertLess(profiler.stages["outer"].seconds, 0.045)
+        self.assertGreaterEqual(profiler.stages["inner"].seconds, 0.05)
+        self.assertEqual(1, profiler.stages["inner"].calls)
+
+    def test_iterate(self) -> None:
+        with Profiler(trace_allocations=False) as profiler:
+            actual = list(profiler.iterate("numbers", iter([1, 2, 3])))
+        self.assertEqual([1, 2, 3], actual)
+        self.assertEqual(4, profiler.stages["numbers"].calls)  # the last call finds the iterator empty
+
+    def test_input_counted_separately(self) -> None:
+        def slow_input(*args) -> str:
+            time.sleep(0.05)
+            return "y"
+
+        with patch('builtins.input', slow_input):
+            with Profiler(trace_allocations=False) as profiler:
+                with profiler.stage("ask"):
+                    self.assertEqual("y", input("Sure? "))
+            self.assertIs(slow_input, builtins.input)  # restored when the profiler exits
+        report = profiler.report()
+        self.assertEqual(1, report["input_calls"])
+        self.assertGreaterEqual(report["stages"]["ask"]["blocked_on_input_seconds"], 0.05)
+        self.assertLess(report["stages"]["ask"]["compute_seconds"], 0.05)
+
+    def test_allocations(self) -> None:
+        with Profiler() as profiler:
+            with profiler.stage("allocate"):
+                data = [bytearray(1024) for _ in range(100)]
+        self.assertGreater(profiler.report()["stages"]["allocate"]["allocated_kb"], 100)
+        self.assertEqual(100, len(data))
+
+    def test_disabled(self) -> None:
+        numbers = [1, 2]
+        with NULL_PROFILER as profiler:
+            with profiler.stage("anything"):
+                pass
+            self.assertIs(numbers, profiler.iterate("numbers", numbers))
+        self.assertEqual({}, profiler.stages)
+
+    def test_save_json_and_table(self) -> None:
+        with Profiler(trace_allocations=False) as profiler:
+            with profiler.stage("work"):
+                sum(range(1000))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "profile.json"
+            profiler.save_json(path)
+            with open(path, 'r') as f:
+                self.assertEqual(["work"], [*json.load(f)["stages"].keys()])
+        table = profiler.format_table().splitlines()
+        self.assertTrue(table[1].startswith("work"))
+        self.assertTrue(table[-1].startswith("total"))
+
+    def test_dump_hottest_stage(self) -> None:
+        with Profiler(trace_allocations=False, collect_function_stats=True) as profiler:
+            with profiler.stage("fast"):
+                sum(range(10))
+            with profiler.stage("slow"):
+                sorted(range(200000), key=lambda x: -x)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "slow.pstats"
+            self.assertEqual("slow", profiler.dump_hottest_stage(path))
+            functions = [function_name for _, _, function_name in pstats.Stats(str(path)).stats]
+        self.assertIn("<lambda>", functions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from group_exercise_names import GroupExerciseNames
+from read import (parse_workout_lines, build_workout, parse_in_parallel, read, read_directory, notebook_output_paths,
+                  watch)
+from profiler import Profiler
+from review_queue import ReviewQueue
+from read_file import ReadFile
+
+
+class TestRead(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.exercise_names_path = Path(self.tmp_dir.name) / "exercise_names.json"
+        with open(self.exercise_names_path, 'w') as f:
+            json.dump({
+                "squat": ["squat"],
+                "bench press": ["bench"],
+                "sitting low row": ["sitting low row"],
+                "lat pulldown": ["lat pulldown"],
+                "deadlift": ["deadlift"],
+                "overhead press": ["overhead press"],
+                "biceps curl (curly bar)": ["biceps curly bar"]
+            }, f)
+        self.workout_name_tracker = GroupExerciseNames(filename=self.exercise_names_path)
+        self.workouts = ReadFile("../input/test_input/workouts_and_redundant_content.txt").split_content()
+
+    def tearDown(self) -> None:
+        self.workout_name_tracker.close()
+        self.tmp_dir.cleanup()
+
+    def test_build_workout(self) -> None:
+        workout = self.workouts[1]
+        expected = {
+            "main": {
+                "lat pulldown": [(5, 70.6), (5, 70.6), (8, 70.6)],
+                "deadlift": [(5, 70.0), (5, 70.0), (13, 70.0)],
+                "overhead press": [(5, 40.0), (5, 40.0), (6, 40.0)]
+            },
+            "extra": {
+                "biceps curl (curly bar)": [(5, 27.5), (5, 27.5), (8, 27.5)]
+            }
+        }
+        actual = build_workout(workout, parse_workout_lines(workout), self.workout_name_tracker)
+        self.assertEqual(expected, actual.workout_dict["exercises"])
+
+    def test_build_workout_batch_mode(self) -> None:
+        workout_name_tracker = GroupExerciseNames(filename=self.exercise_names_path, interactive=False)
+        review_queue = ReviewQueue(Path(self.tmp_dir.name) / "review_queue_json.json")
+        workout = ["12/09/22 B", "Squat: 5x40,60", "warmup:", "Zercher squat: 5x40"]
+        expected = {
+            "main": {
+                "squat": [(5, 40.0), (5, 60.0)],
+                "zercher squat": [(40, 5.0)]
+            }
+        }
+        actual = build_workout(workout, parse_workout_lines(workout), workout_name_tracker, review_queue=review_queue)
+        self.assertEqual(expected, actual.workout_dict["exercises"])
+        self.assertEqual(["zercher squat"], review_queue.pending_aliases)
+        self.assertEqual(["warmup:"], review_queue.pending_sections)
+
+    def test_build_workout_decided_section(self) -> None:
+        review_queue = ReviewQueue(Path(self.tmp_dir.name) / "review_queue_json.json")
+        review_queue.decide_section("warmup:", "warmup")
+        workout = ["12/09/22 B", "warmup:", "Squat: 5x40,60"]
+        actual = build_workout(workout, parse_workout_lines(workout), self.workout_name_tracker,
+                               review_queue=review_queue)
+        self.assertEqual({"main": {}, "warmup": {"squat": [(5, 40.0), (5, 60.0)]}}, actual.workout_dict["exercises"])
+
+    def test_parse_in_parallel_keeps_order(self) -> None:
+        workouts = self.workouts * 50
+        expected = [(workout, parse_workout_lines(workout)) for workout in workouts]
+        actual = list(parse_in_parallel(workouts, 2, chunksize=4))
+        self.assertEqual(expected, actual)
+
+    def test_read_profiled(self) -> None:
+        with Profiler(trace_allocations=False) as profiler:
+            read("../input/test_input/workouts_and_redundant_content.txt",
+                 exercise_names_filename=self.exercise_names_path, output_path=Path(self.tmp_dir.name) / "workouts",
+                 profiler=profiler)
+        stages = profiler.report()["stages"]
+        self.assertEqual({"read_file", "parse", "extract", "split_sets", "resolve", "write"}, stages.keys())
+        self.assertEqual(3, stages["read_file"]["calls"])  # two workouts and the end of the file
+        self.assertEqual(7, stages["split_sets"]["calls"])
+
+    def test_read_directory(self) -> None:
+        notebooks_dir = Path(self.tmp_dir.name) / "athletes"
+        notebooks_dir.mkdir()
+        (notebooks_dir / "anna.txt").write_text(
+            "12/09/22 B\nOverhead pres: 5x40,60\nRows: 5x30\n\n14/09/22 A\nDeadlift: 5x70\n")
+        (notebooks_dir / "bob.txt").write_text("13/09/22 A\nBench: 5x50\nOverhead pres: 5x80\n")
+        (notebooks_dir / "notes.md").write_text("not a notebook")
+        output_dir = Path(self.tmp_dir.name) / "output"
+
+        no_of_items = read_directory(notebooks_dir, jobs=2, exercise_names_filename=self.exercise_names_path,
+                                     output_dir=output_dir)
+
+        # "rows" is unknown and queued for review, "overhead pres" is close enough to "overhead press" to be saved as
+        # its alias
+        self.assertEqual({"anna.txt": 1, "bob.txt": 0}, no_of_items)
+        with open(self.exercise_names_path, 'r') as f:
+            self.assertEqual(["overhead press", "overhead pres"], json.load(f)["overhead press"])
+        output_path, _, review_queue_filename = notebook_output_paths(output_dir, "anna.txt", 'json')
+        self.assertEqual([".index.json", "2022091201.json", "2022091401.json"],
+                         sorted(path.name for path in output_path.iterdir()))
+        self.assertEqual({"rows"}, ReviewQueue(review_queue_filename).aliases.keys())
+        output_path, _, _ = notebook_output_paths(output_dir, "bob.txt", 'json')
+        with open(output_path / "2022091301.json", 'r') as f:
+            expected = {"main": {"bench press": [[50, 5.0]], "overhead press": [[80, 5.0]]}}
+            self.assertEqual(expected, json.load(f)["exercises"])
+
+    def test_watch_last_line_being_typed(self) -> None:
+        notebook = Path(self.tmp_dir.name) / "notebook.txt"
+        notebook.write_text("12/09/22 B\nSquat: 5x40,60\n\n14/09/22 A\nDeadlift")
+        output_path = Path(self.tmp_dir.name) / "workouts"
+        kwargs = dict(polls=1, batch=True, exercise_names_filename=self.exercise_names_path, output_path=output_path,
+                      manifest_filename=Path(self.tmp_dir.name) / "manifest.json",
+                      review_queue_filename=Path(self.tmp_dir.name) / "review_queue.json")
+
+        # the open workout is skipped, the ones before it are still imported
+        with redirect_stdout(io.StringIO()) as stdout:
+            watch(notebook, **kwargs)
+        self.assertEqual("Workout 14/09/22 A cannot be parsed yet, it will be retried on the next poll.\n",
+                         stdout.getvalue())
+        self.assertEqual(["2022091201.json"], sorted(path.name for path in output_path.glob("2*.json")))
+
+        with open(notebook, 'a') as f:
+            f.write(": 5x70\n")
+        watch(notebook, **kwargs)
+        with open(output_path / "2022091401.json", 'r') as f:
+            self.assertEqual({"main": {"deadlift": [[70, 5.0]]}}, json.load(f)["exercises"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
+import tempfile
 import unittest
-from read_file import ReadFile, is_date
+from pathlib import Path
+import mmap
+from read_file import ReadFile, WorkoutSplitter, chunk_boundaries, is_date, parse_date
 
 
 class TestReadFile(unittest.TestCase):
@@ -19,6 +22,38 @@ class TestReadFile(unittest.TestCase):
         actual = is_date("38/07/2014")
         self.assertFalse(actual)
 
+    def test_is_date_last_day_of_month(self) -> None:
+        for date_str in ["31/01/22", "31/12/22", "30/06/2022"]:
+            self.assertTrue(is_date(date_str))
+
+    def test_is_date_day_out_of_month(self) -> None:
+        actual = is_date("31/06/2022")
+        self.assertFalse(actual)
+
+    def test_parse_date_short_year(self) -> None:
+        expected = (7, 9, 2022)
+        actual = parse_date("7/9/22 B")
+        self.assertEqual(expected, actual)
+
+    def test_parse_date_date_plus_some_text(self) -> None:
+        expected = (12, 6, 2014)
+        actual = parse_date("Date: 12/06/2014 B")
+        self.assertEqual(expected, actual)
+
+    def test_parse_date_three_digit_day(self) -> None:
+        # only the last two digits before '/' are the day
+        expected = (23, 6, 2014)
+        actual = parse_date("123/06/2014")
+        self.assertEqual(expected, actual)
+
+    def test_parse_date_no_date(self) -> None:
+        for _str in ["Lat pulldown/chinups: 5x40", "12/06", "12//06/2014", "Squat: 70x5+5+9", ""]:
+            self.assertIsNone(parse_date(_str))
+
+    def test_parse_date_future_year(self) -> None:
+        actual = parse_date("12/06/2999")
+        self.assertIsNone(actual)
+
     def test_split_content_empty_file(self) -> None:
         expected = []
         actual = ReadFile("../input/test_input/empty_file.txt").split_content()
@@ -59,6 +94,73 @@ class TestReadFile(unittest.TestCase):
         actual = ReadFile("../input/test_input/just_redundant_content.txt").split_content()
         self.assertEqual(expected, actual)
 
+    def test_iter_workouts_is_lazy(self) -> None:
+        workouts = ReadFile("../input/test_input/workouts_and_redundant_content.txt").iter_workouts()
+        expected = [
+            "17/09/22 B",
+            "Squat: 70x5+5+9",
+            "Bench: 70x5+6+12",
+            "Sitting low row: 59x5+5+11"
+        ]
+        actual = next(workouts)
+        self.assertEqual(expected, actual)
+
+    def test_iter_workouts_same_as_split_content(self) -> None:
+        for filename in ["empty_file.txt", "single_workout.txt", "workouts_and_redundant_content.txt",
+                         "just_redundant_content.txt"]:
+            content = ReadFile("../input/test_input/" + filename)
+            expected = content.split_content()
+            actual = list(content.iter_workouts())
+            self.assertEqual(expected, actual)
+
+    def test_iter_workouts_last_line_of_file(self) -> None:
+        expected = [["17/09/22 B", "Squat: 70x5+5+9"]]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "no_trailing_new_line.txt"
+            path.write_text("Workout\n\n17/09/22 B\nSquat: 70x5+5+9")
+            actual = list(ReadFile(str(path)).iter_workouts())
+        self.assertEqual(expected, actual)
+
+    def test_workout_splitter_fed_line_by_line(self) -> None:
+        splitter = WorkoutSplitter()
+        workouts = [splitter.feed(line) for line in ["Workout", "17/09/22 B", "Squat: 70x5+5+9", "", "19/09/22 A"]]
+        self.assertEqual([None, None, None, ["17/09/22 B", "Squat: 70x5+5+9"], None], workouts)
+        # a date line alone at the end is not a workout
+        self.assertIsNone(splitter.finish())
+
+    def test_chunk_boundaries_cut_after_empty_lines(self) -> None:
+        content = b"Workout\n\n12/09/22 B\nSquat: 5x40\n  \r\n14/09/22 A\nDeadlift: 5x70\n\n17/09/22 B\nSquat: 5x50"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "notebook.txt"
+            path.write_bytes(content)
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                ranges = chunk_boundaries(data, 10)
+        self.assertEqual(0, ranges[0][0])
+        self.assertEqual(len(content), ranges[-1][1])
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertIn(content[:end].rsplit(b'\n', 2)[1], [b'', b'  \r'])
+        # the first empty line comes before the first cut is looked for
+        self.assertEqual(3, len(ranges))
+
+    def test_iter_workouts_parallel_same_as_iter_workouts(self) -> None:
+        for filename in ["empty_file.txt", "single_workout.txt", "workouts_and_redundant_content.txt",
+                         "just_redundant_content.txt"]:
+            content = ReadFile("../input/test_input/" + filename)
+            expected = list(content.iter_workouts())
+            for no_of_chunks in [1, 2, 5, 100]:
+                actual = list(content.iter_workouts_parallel(2, no_of_chunks=no_of_chunks))
+                self.assertEqual(expected, actual)
+
+    def test_iter_workouts_parallel_windows_line_endings(self) -> None:
+        expected = [["12/09/22 B", "Squat: 5x40"], ["17/09/22 B", "Squat: 5x50"]]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "notebook.txt"
+            path.write_bytes(
+                b"Workout\r\n\r\n12/09/22 B\r\nSquat: 5x40\r\n14/09/22 A\r\n\r\n17/09/22 B\r\nSquat: 5x50\r\n")
+            self.assertEqual(expected, ReadFile(str(path)).split_content())
+            self.assertEqual(expected, ReadFile(str(path)).split_content(jobs=2))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,67 @@
+import tempfile
+import unittest
+from pathlib import Path
+from review_queue import ReviewQueue
+
+
+class TestReviewQueue(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "review_queue_json.json"
+        self.workout_1 = ["12/09/22 B", "warmup:", "Zercher squat: 5x40"]
+        self.workout_2 = ["13/09/22 B", "Zercher squat: 5x50"]
+        with ReviewQueue(self.path) as review_queue:
+            review_queue.add_section("warmup:")
+            review_queue.add_alias("zercher squat")
+            review_queue.add_workout("2022091201.json", self.workout_1)
+            review_queue.add_alias("zercher squat")
+            review_queue.add_workout("2022091301.json", self.workout_2)
+            review_queue.add_workout("2022091401.json", ["14/09/22 A", "Squat: 70x5"])
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_saved_items(self) -> None:
+        review_queue = ReviewQueue(self.path)
+        self.assertEqual({"zercher squat": ["2022091201.json", "2022091301.json"]}, review_queue.aliases)
+        self.assertEqual({"warmup:": ["2022091201.json"]}, review_queue.sections)
+        self.assertEqual(2, review_queue.no_of_items())
+
+    def test_only_workouts_with_items_saved(self) -> None:
+        expected = {"2022091201.json": self.workout_1, "2022091301.json": self.workout_2}
+        actual = ReviewQueue(self.path).workouts
+        self.assertEqual(expected, actual)
+
+    def test_decide_section(self) -> None:
+        review_queue = ReviewQueue(self.path)
+        affected_filenames = review_queue.decide_section("warmup:", "warmup")
+        self.assertEqual(["2022091201.json"], affected_filenames)
+        self.assertTrue(review_queue.is_decided("warmup:"))
+        self.assertEqual("warmup", review_queue.section_name("warmup:"))
+        self.assertEqual({}, review_queue.sections)
+
+    def test_remove_resolved_workouts(self) -> None:
+        review_queue = ReviewQueue(self.path)
+        review_queue.decide_alias("zercher squat")
+        review_queue.remove_resolved_workouts()
+        expected = {"2022091201.json": self.workout_1}
+        actual = review_queue.workouts
+        self.assertEqual(expected, actual)
+
+    def test_saved_by_another_process(self) -> None:
+        review_queue = ReviewQueue(self.path)
+        # the other process resolves an alias while this one queues a new one
+        with ReviewQueue(self.path) as other_review_queue:
+            other_review_queue.decide_alias("zercher squat")
+            other_review_queue.remove_resolved_workouts()
+        review_queue.add_alias("dead lift")
+        review_queue.add_workout("2022091501.json", ["15/09/22 A", "Dead lift: 5x70"])
+        review_queue.save()
+        review_queue = ReviewQueue(self.path)
+        self.assertEqual({"dead lift": ["2022091501.json"]}, review_queue.aliases)
+        self.assertEqual({"warmup:": ["2022091201.json"]}, review_queue.sections)
+        self.assertEqual(["2022091201.json", "2022091501.json"], [*review_queue.workouts])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import pickle
+import unittest
+from set_array import SetArray
+
+
+class TestSetArray(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sets_list = [(5, 40.0), (5, 60.0), (2, 90.0)]
+
+    def test_same_as_list(self) -> None:
+        sets_array = SetArray(self.sets_list)
+        self.assertEqual(self.sets_list, sets_array)
+        self.assertEqual(self.sets_list, list(sets_array))
+        self.assertEqual((5, 60.0), sets_array[1])
+        self.assertEqual(3, len(sets_array))
+
+    def test_append_and_extend(self) -> None:
+        sets_array = SetArray()
+        self.assertFalse(sets_array)
+        sets_array.append((5, 40.0))
+        sets_array += SetArray([(5, 60.0)])
+        sets_array += [(2, 90.0)]
+        self.assertEqual(self.sets_list, sets_array)
+
+    def test_from_columns(self) -> None:
+        sets_array = SetArray.from_columns([5, 5, 2], [40.0, 60.0, 90])
+        self.assertEqual(self.sets_list, sets_array)
+        self.assertIsInstance(sets_array[2][1], float)
+
+    def test_copy_not_shared(self) -> None:
+        sets_array = SetArray(self.sets_list)
+        sets_array_copy = sets_array.copy()
+        sets_array_copy.append((1, 100.0))
+        self.assertEqual(self.sets_list, sets_array)
+
+    def test_weights_not_rounded(self) -> None:
+        expected = [(5, 81.6)]
+        actual = SetArray(expected).to_list()
+        self.assertEqual(expected, actual)
+
+    def test_pickle(self) -> None:
+        # sets are sent back from worker processes in parallel mode
+        sets_array = SetArray(self.sets_list)
+        self.assertEqual(sets_array, pickle.loads(pickle.dumps(sets_array)))
+
+
+if __name__ == "__main__":
+    unittest.main()
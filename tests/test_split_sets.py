@@ -1,5 +1,5 @@
 import unittest
-from split_sets import SplitSets
+from split_sets import SplitSets, split_sets, split_sets_cache_info, _normalize_sets
 
 
 class TestSplitSetsVarReps(unittest.TestCase):
@@ -134,6 +134,17 @@ class TestSplitSetsVarBoth(unittest.TestCase):
         self.assertEqual(expected, actual)
 
 
+class TestSplitSetsLargeReps(unittest.TestCase):
+    def test_large_reps(self) -> None:
+        # numbers from OCR junk
+        self.assertEqual([(55555555555, 70.0)], SplitSets("70x55555555555").get_list())
+
+    def test_reps_out_of_range(self) -> None:
+        # too big for the reps array, the same as a string that cannot be split
+        self.assertIsNone(SplitSets("70x" + "9" * 30).get_list())
+        self.assertIsNone(SplitSets("5x40,60,70," + "9" * 30 + "x90").get_list())
+
+
 class TestSplitSetsWhichVaries(unittest.TestCase):
     def test_var_reps(self) -> None:
         input_sets_list = [
@@ -188,5 +199,37 @@ class TestSplitSetsWhichVaries(unittest.TestCase):
             self.assertIsNone(actual)
 
 
+class TestSplitSetsCached(unittest.TestCase):
+    def test_same_as_get_list(self) -> None:
+        input_sets_list = ["72x5+5+12", "5x40,60,70,80", "5x40,60,70,80,2x90", "5+5+8", "2x20x5+5", "72x"]
+        for input_sets in input_sets_list:
+            expected = SplitSets(input_sets).get_list()
+            actual = split_sets(input_sets)
+            self.assertEqual(expected, actual)
+
+    def test_cache_hit(self) -> None:
+        split_sets("8x60+8x71+6x71")
+        hits_before = split_sets_cache_info().hits
+        split_sets("8x60+8x71+6x71")
+        self.assertEqual(hits_before + 1, split_sets_cache_info().hits)
+
+    def test_cached_result_not_shared(self) -> None:
+        sets_list = split_sets("72x5+5+13")
+        sets_list.append((1, 1.0))
+        expected = [(5, 72.0), (5, 72.0), (13, 72.0)]
+        actual = split_sets("72x5+5+13")
+        self.assertEqual(expected, actual)
+
+    def test_normalize_sets_body_weight(self) -> None:
+        expected = ("0.0x5+5+8", "var_reps")
+        actual = _normalize_sets("5+5+8")
+        self.assertEqual(expected, actual)
+
+    def test_normalize_sets_product_weight(self) -> None:
+        expected = ("20+20x5+5", "var_reps")
+        actual = _normalize_sets("2x20x5+5")
+        self.assertEqual(expected, actual)
+
+
 if __name__ == "__main__":
     unittest.main()
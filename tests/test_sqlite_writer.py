@@ -0,0 +1,89 @@
+import json
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from set_array import SetArray
+from sqlite_writer import SQLiteWriter, load_workout, query_sets
+from workout_writer import json_default
+
+
+class TestSQLiteWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "workouts.sqlite3"
+        self.workout_dict_1 = {
+            "date": date(2022, 9, 12),
+            "exercises": {
+                "main": {"squat": SetArray([(5, 40.0), (5, 60.0)]), "bench press": SetArray([(5, 40.0)])},
+                "extra": {"triceps pushdown (rope)": SetArray([(5, 16.3)]), "calves (leg press machine)": SetArray()},
+                "empty": {}
+            }
+        }
+        self.workout_dict_2 = {
+            "date": date(2022, 9, 14),
+            "exercises": {
+                "main": {"squat": SetArray([(5, 70.0)]), "deadlift": SetArray([(10, 50.0)])}
+            }
+        }
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def _count(self, table: str) -> int:
+        connection = sqlite3.connect(self.path)
+        try:
+            return connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        finally:
+            connection.close()
+
+    def test_load_workout_same_as_json_file(self) -> None:
+        with SQLiteWriter(self.path) as writer:
+            writer.write(self.workout_dict_1)
+            writer.write(self.workout_dict_2)
+        expected = json.loads(json.dumps(self.workout_dict_1, default=json_default))
+        self.assertEqual(expected, load_workout("2022091201", self.path))
+
+    def test_names_stored_once(self) -> None:
+        with SQLiteWriter(self.path) as writer:
+            writer.write(self.workout_dict_1)
+            writer.write(self.workout_dict_2)
+        self.assertEqual(2, self._count("workouts"))
+        self.assertEqual(3, self._count("sections"))
+        self.assertEqual(5, self._count("exercises"))
+        self.assertEqual(6, self._count("sets"))
+
+    def test_append_names_workouts_like_json_files(self) -> None:
+        with SQLiteWriter(self.path) as writer:
+            writer.write(self.workout_dict_1)
+        with SQLiteWriter(self.path) as writer:
+            actual = writer.write(self.workout_dict_1)
+        self.assertEqual("2022091202.json", actual)
+        self.assertEqual(2, self._count("workouts"))
+
+    def test_rewritten_workout_replaces_sets(self) -> None:
+        with SQLiteWriter(self.path) as writer:
+            writer.write(self.workout_dict_1)
+        with SQLiteWriter(self.path) as writer:
+            writer.write(self.workout_dict_2, filename="2022091201.json")
+        self.assertEqual(1, self._count("workouts"))
+        self.assertEqual(2, self._count("sets"))
+        self.assertEqual("2022-09-14", load_workout("2022091201", self.path)["date"])
+
+    def test_query_sets(self) -> None:
+        with SQLiteWriter(self.path, batch_size=1) as writer:
+            writer.write(self.workout_dict_2)
+            writer.write(self.workout_dict_1)
+        expected = [(date(2022, 9, 12), [[5, 40.0], [5, 60.0]]), (date(2022, 9, 14), [[5, 70.0]])]
+        self.assertEqual(expected, query_sets("squat", path=self.path))
+        self.assertEqual(expected[1:], query_sets("squat", date(2022, 9, 13), path=self.path))
+        self.assertEqual([], query_sets("deadlift", end=date(2022, 9, 13), path=self.path))
+
+    def test_wal_mode(self) -> None:
+        with SQLiteWriter(self.path) as writer:
+            self.assertEqual("wal", writer.connection.execute("PRAGMA journal_mode").fetchone()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from set_array import SetArray
+from workout_codec import dumps_workout, json_default, load_workout, loads_workout
+
+
+class TestWorkoutCodec(unittest.TestCase):
+    def setUp(self) -> None:
+        self.workout_dict = {
+            "date": date(2022, 9, 12),
+            "exercises": {
+                "main": {
+                    "squat": SetArray([(5, 40.0), (5, 60.0), (3, 72.5)]),
+                    "bench press": SetArray([(8, 1e-05), (2, 1e+16)]),
+                    "plank": SetArray()
+                },
+                "Pożegnanie \"z\" nogami\t\\": {
+                    "calves (leg press machine)": SetArray([(20, 0.0)])
+                },
+                "cool down": {}
+            }
+        }
+
+    def test_same_as_json_dumps(self) -> None:
+        self.assertEqual(json.dumps(self.workout_dict, default=json_default), dumps_workout(self.workout_dict))
+
+    def test_no_date_and_no_exercises(self) -> None:
+        for workout_dict in [{"date": None, "exercises": {}}, {"date": None, "exercises": {"main": {}}}]:
+            self.assertEqual(json.dumps(workout_dict, default=json_default), dumps_workout(workout_dict))
+
+    def test_nan_and_infinity(self) -> None:
+        self.workout_dict["exercises"]["main"]["squat"].append((1, float('nan')))
+        self.workout_dict["exercises"]["main"]["bench press"].append((1, float('inf')))
+        self.assertEqual(json.dumps(self.workout_dict, default=json_default), dumps_workout(self.workout_dict))
+
+    def test_other_shapes_left_to_json(self) -> None:
+        # lists of tuples and keys in another order
+        workout_dict = {"exercises": {"main": {"squat": [(5, 40.0)]}}, "date": "2022-09-12"}
+        self.assertEqual(json.dumps(workout_dict, default=json_default), dumps_workout(workout_dict))
+        workout_dict = {"date": "2022-09-12", "exercises": {"main": {"squat": [(5, 40.0)]}}}
+        self.assertEqual(json.dumps(workout_dict, default=json_default), dumps_workout(workout_dict))
+
+    def test_typed_round_trip(self) -> None:
+        workout_dict = loads_workout(dumps_workout(self.workout_dict))
+        self.assertEqual(self.workout_dict, workout_dict)
+        self.assertIsInstance(workout_dict["date"], date)
+        squat = workout_dict["exercises"]["main"]["squat"]
+        self.assertIsInstance(squat, SetArray)
+        self.assertEqual((3, 72.5), squat[2])
+        self.assertIsInstance(squat[2][0], int)
+        self.assertIsInstance(squat[2][1], float)
+        self.assertEqual(SetArray(), workout_dict["exercises"]["main"]["plank"])
+        self.assertEqual({}, workout_dict["exercises"]["cool down"])
+
+    def test_load_workout_without_date(self) -> None:
+        self.workout_dict["date"] = None
+        with tempfile.TemporaryDirectory() as output_dir:
+            path = os.path.join(output_dir, "2022091201.json")
+            with open(path, 'w') as f:
+                json.dump(self.workout_dict, f, default=json_default)
+            self.assertEqual(self.workout_dict, load_workout(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,10 +10,15 @@ class TestWorkoutDictBuilder(unittest.TestCase):
         self.output_dir_path = Path(__file__).resolve().parent.parent / "output/"
         self.files_to_be_removed = []
         self.workout = WorkoutDictBuilder()
+        # saving a workout creates the index of the output directory if there was none
+        self.index_path = self.output_dir_path / "workouts" / ".index.json"
+        self.index_existed = self.index_path.exists()
 
     def tearDown(self) -> None:
         for path in self.files_to_be_removed:
             os.remove(path)
+        if not self.index_existed and self.index_path.exists():
+            os.remove(self.index_path)
 
     def test_init_workout_dict(self) -> None:
         expected = {
@@ -85,6 +90,12 @@ class TestWorkoutDictBuilder(unittest.TestCase):
         actual = self.workout.workout_dict
         self.assertEqual(expected, actual)
 
+    def test_add_date_with_text_before(self) -> None:
+        self.workout.add_date("Date: 1/2/22 B")
+        expected = date(2022, 2, 1)
+        actual = self.workout.workout_dict["date"]
+        self.assertEqual(expected, actual)
+
     def test_add_section_just_section_name(self) -> None:
         test_input = "extras"
         self.workout.add_section(test_input)
@@ -367,7 +378,10 @@ class TestWorkoutDictBuilder(unittest.TestCase):
         workout_dict_2.save_dict()  # save first workout as 2022113101.json
         self.workout.save_dict()  # save the third workout without given date 2022120101.json
         path = self.output_dir_path / "workouts" / "2022110101.json"  # generate path to the file
-        self.files_to_be_removed.append(path)  # add the path to to-remove list
+        # add paths of all three workouts to to-remove list
+        self.files_to_be_removed.append(self.output_dir_path / "workouts" / "2022102901.json")
+        self.files_to_be_removed.append(self.output_dir_path / "workouts" / "2022103101.json")
+        self.files_to_be_removed.append(path)
         path_obj = Path(path)  # create path object
         self.assertTrue(path_obj.is_file())  # verify if the file exists
 
@@ -0,0 +1,68 @@
+import json
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from workout_index import WorkoutIndex, query_sets, index_path
+
+
+class TestWorkoutIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_dir_path = Path(self.tmp_dir.name)
+        self.workout_index = WorkoutIndex(index_path(self.output_dir_path))
+        self.workout_index.add("2022091401", ["deadlift", "squat"])
+        self.workout_index.add("2022091201", ["squat", "bench press"])
+        self.workout_index.add("2022091202", ["squat"])
+        self.workout_index.add("2022092001", ["bench press"])
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_keys_sorted(self) -> None:
+        expected = ["2022091201", "2022091202", "2022091401", "2022092001"]
+        self.assertEqual(expected, self.workout_index.keys)
+
+    def test_keys_between(self) -> None:
+        expected = ["2022091201", "2022091202", "2022091401"]
+        actual = self.workout_index.keys_between(date(2022, 9, 12), date(2022, 9, 14))
+        self.assertEqual(expected, actual)
+
+    def test_keys_between_open_ended(self) -> None:
+        self.assertEqual(["2022091401", "2022092001"], self.workout_index.keys_between(date(2022, 9, 13)))
+        self.assertEqual(["2022091201", "2022091202"], self.workout_index.keys_between(end=date(2022, 9, 13)))
+
+    def test_workouts_with(self) -> None:
+        expected = ["2022091202", "2022091401"]
+        actual = self.workout_index.workouts_with("squat", date(2022, 9, 12), date(2022, 9, 14))[1:]
+        self.assertEqual(expected, actual)
+        self.assertEqual([], self.workout_index.workouts_with("lunge"))
+
+    def test_add_replaces_exercises(self) -> None:
+        self.workout_index.add("2022091401", ["deadlift"])
+        self.assertEqual(["2022091201", "2022091202"], self.workout_index.workouts_with("squat"))
+
+    def test_remove(self) -> None:
+        self.workout_index.remove("2022091401")
+        self.assertEqual(["2022091201", "2022091202", "2022092001"], self.workout_index.keys)
+        self.assertNotIn("deadlift", self.workout_index.exercises)
+
+    def test_save_and_load(self) -> None:
+        self.workout_index.save()
+        actual = WorkoutIndex(index_path(self.output_dir_path))
+        self.assertEqual(self.workout_index.keys, actual.keys)
+        self.assertEqual(self.workout_index.exercises, actual.exercises)
+        self.assertFalse(actual.dirty)
+
+    def test_query_sets(self) -> None:
+        self.workout_index.save()
+        for key, sets in [("2022091201", [[5, 40.0]]), ("2022091202", [[5, 45.0]])]:
+            with open(self.output_dir_path / (key + '.json'), 'w') as f:
+                json.dump({"date": None, "exercises": {"main": {}, "extra": {"squat": sets}}}, f)
+        expected = [(date(2022, 9, 12), [[5, 40.0]]), (date(2022, 9, 12), [[5, 45.0]])]
+        actual = query_sets("squat", date(2022, 9, 12), date(2022, 9, 12), output_dir=self.output_dir_path)
+        self.assertEqual(expected, actual)
+
+
+if __name__ == "__main__":
+    unittest.main()
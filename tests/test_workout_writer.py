@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from workout_writer import WorkoutWriter
+from workout_index import WorkoutIndex
+from set_array import SetArray
+
+
+class TestWorkoutWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_dir_path = Path(self.tmp_dir.name)
+        for filename in ["2022091201.json", "2022091202.json", "2022091401.json", "notes.txt"]:
+            (self.output_dir_path / filename).touch()
+        self.workout_dict = {"date": date(2022, 9, 12), "exercises": {"main": {"squat": [(5, 40.0)]}}}
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_scan_output_dir(self) -> None:
+        expected = {"20220912": 2, "20220914": 1}
+        actual = WorkoutWriter(self.output_dir_path).latest_numbers
+        self.assertEqual(expected, actual)
+
+    def test_next_filename_date_already_exists(self) -> None:
+        expected = "2022091203.json"
+        actual = WorkoutWriter(self.output_dir_path).next_filename(date(2022, 9, 12))
+        self.assertEqual(expected, actual)
+
+    def test_next_filename_new_date(self) -> None:
+        expected = "2022091701.json"
+        actual = WorkoutWriter(self.output_dir_path).next_filename(date(2022, 9, 17))
+        self.assertEqual(expected, actual)
+
+    def test_next_filename_no_date(self) -> None:
+        expected = "2022091501.json"
+        actual = WorkoutWriter(self.output_dir_path).next_filename(None)
+        self.assertEqual(expected, actual)
+
+    def test_next_filename_no_date_empty_dir(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(ValueError):
+                WorkoutWriter(tmp_dir).next_filename(None)
+
+    def test_write_same_date_twice(self) -> None:
+        with WorkoutWriter(self.output_dir_path) as writer:
+            filename_1 = writer.write(self.workout_dict)
+            filename_2 = writer.write(self.workout_dict)
+        self.assertEqual(["2022091203.json", "2022091204.json"], [filename_1, filename_2])
+
+    def test_write_in_batches(self) -> None:
+        writer = WorkoutWriter(self.output_dir_path, batch_size=2)
+        writer.write(self.workout_dict)
+        self.assertFalse((self.output_dir_path / "2022091203.json").is_file())
+        writer.write(self.workout_dict)
+        self.assertTrue((self.output_dir_path / "2022091203.json").is_file())
+        self.assertTrue((self.output_dir_path / "2022091204.json").is_file())
+
+    def test_close_writes_pending_workouts(self) -> None:
+        with WorkoutWriter(self.output_dir_path, fsync=True) as writer:
+            writer.write(self.workout_dict)
+        expected = {"date": "2022-09-12", "exercises": {"main": {"squat": [[5, 40.0]]}}}
+        with open(self.output_dir_path / "2022091203.json", 'r') as f:
+            actual = json.load(f)
+        self.assertEqual(expected, actual)
+
+    def test_custom_filename(self) -> None:
+        with WorkoutWriter(self.output_dir_path) as writer:
+            writer.write(self.workout_dict, filename="some_custom_name.json")
+        self.assertTrue(os.path.isfile(self.output_dir_path / "some_custom_name.json"))
+
+    def test_write_set_array(self) -> None:
+        workout_dict = {"date": date(2022, 9, 12), "exercises": {"main": {"squat": SetArray([(5, 40.0), (3, 42.5)])}}}
+        with WorkoutWriter(self.output_dir_path) as writer:
+            filename = writer.write(workout_dict)
+        expected = json.dumps({"date": "2022-09-12", "exercises": {"main": {"squat": [[5, 40.0], [3, 42.5]]}}})
+        with open(self.output_dir_path / filename, 'r') as f:
+            actual = f.read()
+        self.assertEqual(expected, actual)
+
+    def test_index_updated_on_write(self) -> None:
+        with WorkoutWriter(self.output_dir_path) as writer:
+            writer.write(self.workout_dict)
+            writer.write({"date": date(2022, 9, 20), "exercises": {"main": {}, "extra": {"squat": [(3, 50.0)]}}})
+        workout_index = WorkoutIndex(self.output_dir_path / ".index.json")
+        self.assertEqual(["2022091201", "2022091202", "2022091203", "2022091401", "2022092001"], workout_index.keys)
+        self.assertEqual(["2022091203", "2022092001"], workout_index.workouts_with("squat"))
+
+    def test_index_follows_output_dir(self) -> None:
+        with WorkoutWriter(self.output_dir_path) as writer:
+            writer.write(self.workout_dict)
+        os.remove(self.output_dir_path / "2022091401.json")
+        with open(self.output_dir_path / "2022092001.json", 'w') as f:
+            json.dump({"date": "2022-09-20", "exercises": {"main": {"deadlift": [[5, 100.0]]}}}, f)
+        with WorkoutWriter(self.output_dir_path) as writer:
+            actual = writer.workout_index
+        self.assertEqual(["2022091201", "2022091202", "2022091203", "2022092001"], actual.keys)
+        self.assertEqual(["2022092001"], actual.workouts_with("deadlift"))
+
+
+if __name__ == "__main__":
+    unittest.main()